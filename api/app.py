@@ -1,11 +1,190 @@
-from flask import Flask, jsonify, request
+import atexit
+import hmac
+import os
+import time
+from urllib.parse import quote
+
+from flask import Flask, Response, g, jsonify, request
+from db import instrumentation
+from services.metrics import CONTENT_TYPE, RequestMetrics
 from services.service import DictionaryService
-from db.repository import Repository
+from services.traffic import TrafficRecorder
+from services.write_behind import QueueFull, WriteBehindQueue
+from services.encoded import encode_json
+from services.bloom import LemmaFilter
+from services.cache import CompactingCache, LRUCache
+from db.factory import create_repository
+
+def build_service(config):
+    repo = config.get("REPOSITORY") or create_repository(
+        config.get("REPOSITORY_BACKEND"),
+        **config.get("REPOSITORY_OPTIONS", {}),
+    )
+    cache = LRUCache(
+        max_size=int(os.getenv("ENTRY_CACHE_SIZE", "10000")),
+        ttl=float(os.getenv("ENTRY_CACHE_TTL", "300")),
+        negative_ttl=float(os.getenv("ENTRY_CACHE_NEGATIVE_TTL", "30")),
+    )
+    if os.getenv("ENTRY_CACHE_COMPACT", "0") == "1":
+        cache = CompactingCache(cache)
+    service = DictionaryService(repo, cache=cache, lemma_filter=lemma_filter(config))
+    # Both are read by every lookup; scan for them now rather than in the
+    # first request.
+    service.build_variant_index()
+    if service.lemma_filter is not None:
+        service.rebuild_lemma_filter()
+    return service
+
+def setting(config, name, default=None):
+    """App config key ``name``, falling back to the environment variable."""
+    return config.get(name, os.getenv(name, default))
+
+def flag(config, name):
+    return str(setting(config, name, "0")) in ("1", "True", "true")
+
+def lemma_filter(config):
+    """A ``LemmaFilter`` when ``LEMMA_FILTER`` is on; the app builds it at startup."""
+    if not flag(config, "LEMMA_FILTER"):
+        return None
+    return LemmaFilter(
+        fp_rate=float(setting(config, "LEMMA_FILTER_FP_RATE", "0.01")),
+        rebuild_interval=float(setting(config, "LEMMA_FILTER_REBUILD_SECONDS", "300")),
+        check_interval=float(setting(config, "LEMMA_FILTER_CHECK_SECONDS", "5")),
+    )
+
+def configure_metrics(config):
+    """The app's ``RequestMetrics``, or None when metrics are disabled.
+
+    ``METRICS_ENABLED=0`` (environment) also stops the repositories from
+    wrapping cursors; the config key only turns off the app's hooks.
+    """
+    if config.get("SLOW_QUERY_MS") is not None:
+        instrumentation.set_slow_query_ms(float(config["SLOW_QUERY_MS"]))
+    if not config.get("METRICS_ENABLED", instrumentation.enabled):
+        return None
+    return RequestMetrics()
+
+def traffic_recorder(config):
+    """A ``TrafficRecorder`` appending to ``TRAFFIC_LOG``, if one is set."""
+    path = config.get("TRAFFIC_LOG") or os.getenv("TRAFFIC_LOG")
+    return TrafficRecorder(path) if path else None
+
+def write_behind_queue(config, service):
+    """A ``WriteBehindQueue`` for ``/api/v1/add`` when ``WRITE_BEHIND`` is on."""
+    if not flag(config, "WRITE_BEHIND"):
+        return None
+    return WriteBehindQueue(
+        service,
+        max_size=int(setting(config, "WRITE_BEHIND_QUEUE_SIZE", "10000")),
+        batch_size=int(setting(config, "WRITE_BEHIND_BATCH", "200")),
+        spill_path=setting(config, "WRITE_BEHIND_SPILL") or None,
+        fsync=flag(config, "WRITE_BEHIND_FSYNC"),
+    )
 
-def create_app():
+def resolved_lemma_header(encoded):
+    """``X-Resolved-Lemma`` for an English entry: the canonical lemma a
+    query or variant resolved to, percent-encoded beyond ASCII."""
+    return quote(encoded.term, safe=" '-") if encoded.term else None
+
+def lesson_filters(args):
+    """``get_english_lesson_encoded`` keyword arguments from query args."""
+    filters = {name: args.get(name) for name in ("topic", "pos", "difficulty", "mode")}
+    for name, default in (("seed", 0), ("page", 1), ("per_page", 10)):
+        try:
+            filters[name] = int(args.get(name, default))
+        except ValueError:
+            raise ValueError(f"{name} must be an integer")
+    return filters
+
+def metrics_gauges(service, writes=None):
+    gauges = {"cache": service.cache.stats()}
+    pool_stats = getattr(service.repo, "pool_stats", None)
+    if pool_stats:
+        gauges["pool"] = pool_stats()
+    if service.lemma_filter is not None:
+        gauges["lemma_filter"] = service.lemma_filter.stats()
+    if writes:
+        gauges["write_behind"] = writes.stats()
+    return gauges
+
+def metrics_histograms(writes=None):
+    if not writes:
+        return None
+    return {
+        "write_behind_commit_seconds": writes.commit_seconds,
+        "write_behind_delay_seconds": writes.delay_seconds,
+    }
+
+def create_app(config=None):
     app = Flask(__name__)
-    repo = Repository()
-    service = DictionaryService(repo)
+    app.config.update(config or {})
+    service = build_service(app.config)
+    max_age = int(app.config.get("LOOKUP_MAX_AGE", os.getenv("LOOKUP_MAX_AGE", "60")))
+    metrics = configure_metrics(app.config)
+    writes = write_behind_queue(app.config, service)
+    if writes:
+        app.extensions["write_behind"] = writes
+        atexit.register(writes.close)
+
+    if metrics:
+        @app.before_request
+        def start_metrics():
+            g.metrics_started = time.perf_counter()
+            g.query_stats = instrumentation.QueryStats()
+            g.query_stats_token = instrumentation.bind(g.query_stats)
+
+        @app.after_request
+        def record_metrics(response):
+            started = g.pop("metrics_started", None)
+            if started is not None:
+                route = request.url_rule.rule if request.url_rule else "unmatched"
+                metrics.observe(
+                    request.method, route, response.status_code,
+                    time.perf_counter() - started, g.get("query_stats"),
+                )
+            return response
+
+        @app.teardown_request
+        def stop_metrics(exc):
+            token = g.pop("query_stats_token", None)
+            if token is not None:
+                instrumentation.unbind(token)
+
+        @app.route("/api/v1/metrics", methods=["GET"])
+        def metrics_endpoint():
+            return app.response_class(
+                metrics.render(metrics_gauges(service, writes), metrics_histograms(writes)),
+                content_type=CONTENT_TYPE,
+            )
+
+    recorder = traffic_recorder(app.config)
+    if recorder:
+        @app.before_request
+        def start_recording():
+            g.traffic_started = (time.time(), time.perf_counter())
+
+        @app.after_request
+        def record_traffic(response):
+            started = g.pop("traffic_started", None)
+            if started is not None:
+                recorder.record(
+                    request.method, request.path, request.query_string.decode("latin-1"),
+                    request.get_data(cache=True), response.status_code,
+                    time.perf_counter() - started[1], started=started[0],
+                )
+            return response
+
+    def encoded_response(encoded):
+        # Strong ETag over the exact bytes; make_conditional answers a
+        # matching If-None-Match with an empty 304.
+        resp = app.response_class(encoded.body, mimetype="application/json")
+        resp.set_etag(encoded.etag)
+        resp.cache_control.public = True
+        resp.cache_control.max_age = max_age
+        resolved = resolved_lemma_header(encoded)
+        if resolved:
+            resp.headers["X-Resolved-Lemma"] = resolved
+        return resp.make_conditional(request)
 
     @app.route("/api/v1/health", methods=["GET"])
     def health_check():
@@ -14,17 +193,94 @@ def create_app():
     @app.route("/api/v1/lookup", methods=["GET"])
     def lookup():
         english = request.args.get("english")
-        if not english:
-            return jsonify({"error": "missing ?english=..."})
-        entry = service.lookup_english_as_dict(english)
-        if entry:
-            return jsonify(entry)
-        else:
+        spanish = request.args.get("spanish")
+        if spanish and not english:
+            entry = service.lookup_spanish_as_dict(spanish)
+            if entry:
+                return encoded_response(encode_json(entry))
             return jsonify({"error": "not found"}), 404
+        if not english:
+            return jsonify({"error": "missing ?english=... or ?spanish=..."})
+        encoded = service.lookup_english_encoded(english)
+        if encoded:
+            return encoded_response(encoded)
+        if request.args.get("fuzzy", "").lower() in ("1", "true", "yes"):
+            max_distance = request.args.get("max_distance", 2, type=int)
+            candidates = service.lookup_fuzzy(english, max_distance=max_distance)
+            if candidates:
+                return jsonify({"query": english, "candidates": candidates})
+        return jsonify({"error": "not found"}), 404
+
+    @app.route("/api/v1/lookup/batch", methods=["POST"])
+    def lookup_batch():
+        data = request.get_json(silent=True) or {}
+        lemmas = data.get("english")
+        if not isinstance(lemmas, list) or not all(isinstance(l, str) for l in lemmas):
+            return jsonify({"error": "expected {\"english\": [...]}"}), 400
+        try:
+            return jsonify(service.lookup_many_as_dict(lemmas))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    @app.route("/api/v1/suggest", methods=["GET"])
+    def suggest():
+        prefix = request.args.get("prefix", "")
+        if not prefix.strip():
+            return jsonify({"error": "missing ?prefix=..."}), 400
+        limit = request.args.get("limit", 10, type=int)
+        return jsonify({"prefix": prefix, "suggestions": service.suggest(prefix, limit)})
+
+    @app.route("/api/v1/search", methods=["GET"])
+    def search():
+        q = request.args.get("q", "")
+        if not q.strip():
+            return jsonify({"error": "missing ?q=..."}), 400
+        try:
+            return jsonify(service.search(
+                q,
+                page=request.args.get("page", 1, type=int),
+                per_page=request.args.get("per_page", 10, type=int),
+                language=request.args.get("language"),
+            ))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    @app.route("/api/v1/terms", methods=["GET"])
+    def list_terms():
+        try:
+            return jsonify(service.list_terms_page(
+                language=request.args.get("language", "en"),
+                after=request.args.get("after"),
+                limit=request.args.get("limit", 100, type=int),
+            ))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    @app.route("/api/v1/export", methods=["GET"])
+    def export():
+        return Response(service.export_ndjson(), mimetype="application/x-ndjson")
 
     @app.route("/api/v1/add", methods=["POST"])
     def add():
         data = request.get_json()
+        if writes:
+            try:
+                return jsonify(writes.submit(data)), 202
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            except QueueFull as e:
+                return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
+        if isinstance(data, dict) and "meanings" in data:
+            if not all(field in data for field in ("lemma", "pos")):
+                return jsonify({"error": "invalid payload"}), 400
+            try:
+                return jsonify(service.add_full_entry_as_dict(
+                    lemma=data["lemma"], pos=data["pos"], meanings=data["meanings"]
+                ))
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            except Exception as e:
+                return jsonify({"error": str(e)}), 500
         required_fields = ["lemma", "pos", "meaning_desc", "spanish_term", "gender"]
         if not all(field in data for field in required_fields):
             return jsonify({"error": "invalid payload"}), 400
@@ -41,11 +297,38 @@ def create_app():
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
+    @app.route("/api/v1/add/status", methods=["GET"])
+    def add_status():
+        if not writes:
+            return jsonify({"error": "write-behind mode is off"}), 404
+        status = writes.status(request.args.get("id", ""))
+        if status is None:
+            return jsonify({"error": "unknown id"}), 404
+        return jsonify(status)
+
+    @app.route("/api/v1/admin/delete", methods=["POST"])
+    def admin_delete():
+        # Disabled unless ADMIN_TOKEN is set; callers send it as a bearer token.
+        token = app.config.get("ADMIN_TOKEN") or os.getenv("ADMIN_TOKEN")
+        if not token:
+            return jsonify({"error": "admin endpoints are disabled"}), 403
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return jsonify({"error": "unauthorized"}), 401
+        data = request.get_json(silent=True) or {}
+        lemmas = data.get("english")
+        if not isinstance(lemmas, list) or not all(isinstance(l, str) for l in lemmas):
+            return jsonify({"error": "expected {\"english\": [...]}"}), 400
+        try:
+            return jsonify(service.delete_entries(lemmas))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
     @app.route("/api/v1/english-lesson", methods=["GET"])
     def get_english_lesson():
         try:
-            lesson = service.get_english_lesson()
-            return jsonify(lesson)
+            return encoded_response(service.get_english_lesson_encoded(**lesson_filters(request.args)))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             print("Error:", e)
             return jsonify({"error": "server error"}), 500
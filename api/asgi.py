@@ -0,0 +1,300 @@
+"""ASGI entry point serving the read/write hot paths without blocking.
+
+Run with any ASGI server, e.g.::
+
+    uvicorn --factory api.asgi:create_asgi_app --port 8000
+
+Repository calls run on ``AsyncDictionaryService``'s bounded thread pool,
+so the event loop keeps accepting connections while queries are in
+flight. When that pool and its queue are full, or the DB connection pool
+times out, requests get ``503`` with ``Retry-After`` instead of queueing
+without bound.
+"""
+import json
+import logging
+import os
+import time
+from urllib.parse import parse_qs
+
+from api.app import (
+    build_service, configure_metrics, lesson_filters, metrics_gauges, metrics_histograms,
+    resolved_lemma_header, traffic_recorder, write_behind_queue,
+)
+from db import instrumentation
+from services.async_service import AsyncDictionaryService, Overloaded
+from services.encoded import EncodedJson, encode_json
+from services.metrics import CONTENT_TYPE
+from services.write_behind import QueueFull
+
+MAX_BODY_BYTES = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def _int_arg(args, name, default):
+    try:
+        return int(args.get(name, default))
+    except ValueError:
+        return default
+
+
+async def _read_body(receive):
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+def _if_none_match(scope):
+    for name, value in scope.get("headers", ()):
+        if name == b"if-none-match":
+            tags = value.decode("latin-1").split(",")
+            return {tag.strip().removeprefix("W/").strip('"') for tag in tags}
+    return set()
+
+
+async def _send_encoded(send, scope, encoded, max_age):
+    headers = [
+        (b"etag", f'"{encoded.etag}"'.encode()),
+        (b"cache-control", f"public, max-age={max_age}".encode()),
+    ]
+    resolved = resolved_lemma_header(encoded)
+    if resolved:
+        headers.append((b"x-resolved-lemma", resolved.encode()))
+    matches = _if_none_match(scope)
+    if encoded.etag in matches or "*" in matches:
+        await send({"type": "http.response.start", "status": 304, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+        return
+    await _send_bytes(send, 200, encoded.body, headers)
+
+
+async def _send_json(send, status, body, headers=()):
+    await _send_bytes(send, status, json.dumps(body).encode("utf-8"), headers)
+
+
+async def _send_stream(send, chunks, content_type):
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", content_type)],
+    })
+    async for chunk in chunks:
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _send_bytes(send, status, payload, headers=(), content_type=b"application/json"):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type),
+            (b"content-length", str(len(payload)).encode()),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+def create_asgi_app(config=None):
+    config = dict(config or {})
+    service = AsyncDictionaryService(
+        build_service(config),
+        max_workers=config.get("ASYNC_WORKERS") or int(os.getenv("ASYNC_WORKERS", "0")) or None,
+        max_pending=config.get("ASYNC_MAX_PENDING") or int(os.getenv("ASYNC_MAX_PENDING", "256")),
+    )
+    max_age = int(config.get("LOOKUP_MAX_AGE", os.getenv("LOOKUP_MAX_AGE", "60")))
+    metrics = configure_metrics(config)
+    recorder = traffic_recorder(config)
+    writes = write_behind_queue(config, service.service)
+
+    async def health_check(args, body):
+        return 200, {"status": "ok"}
+
+    async def lookup(args, body):
+        english = args.get("english")
+        spanish = args.get("spanish")
+        if spanish and not english:
+            entry = await service.lookup_spanish_as_dict(spanish)
+            if entry:
+                return 200, encode_json(entry)
+            return 404, {"error": "not found"}
+        if not english:
+            return 200, {"error": "missing ?english=... or ?spanish=..."}
+        encoded = await service.lookup_english_encoded(english)
+        if encoded:
+            return 200, encoded
+        if args.get("fuzzy", "").lower() in ("1", "true", "yes"):
+            candidates = await service.lookup_fuzzy(
+                english, max_distance=_int_arg(args, "max_distance", 2)
+            )
+            if candidates:
+                return 200, {"query": english, "candidates": candidates}
+        return 404, {"error": "not found"}
+
+    async def list_terms(args, body):
+        return 200, await service.list_terms_page(
+            args.get("language", "en"), args.get("after"), _int_arg(args, "limit", 100)
+        )
+
+    async def export(args, body):
+        return 200, service.export_ndjson()
+
+    async def add(args, body):
+        try:
+            data = json.loads(body or b"null")
+        except ValueError:
+            data = None
+        if writes:
+            return 202, await service.submit_write(writes, data)
+        if isinstance(data, dict) and "meanings" in data:
+            if not all(field in data for field in ("lemma", "pos")):
+                return 400, {"error": "invalid payload"}
+            try:
+                return 200, await service.add_full_entry_as_dict(
+                    data["lemma"], data["pos"], data["meanings"]
+                )
+            except (Overloaded, ValueError):
+                raise
+            except Exception as e:
+                return 500, {"error": str(e)}
+        required_fields = ["lemma", "pos", "meaning_desc", "spanish_term", "gender"]
+        if not isinstance(data, dict) or not all(field in data for field in required_fields):
+            return 400, {"error": "invalid payload"}
+        try:
+            entry = await service.add_entry_as_dict(
+                lemma=data["lemma"],
+                pos=data["pos"],
+                meaning_desc=data["meaning_desc"],
+                spanish_term=data["spanish_term"],
+                gender=data["gender"],
+                examples=data.get("examples", []),
+            )
+            return 200, entry
+        except Overloaded:
+            raise
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+    async def add_status(args, body):
+        status = writes.status(args.get("id", "")) if writes else None
+        if status is None:
+            return 404, {"error": "unknown id"}
+        return 200, status
+
+    async def get_english_lesson(args, body):
+        try:
+            return 200, await service.get_english_lesson_encoded(**lesson_filters(args))
+        except (Overloaded, ValueError):
+            raise
+        except Exception:
+            logger.exception("english lesson failed")
+            return 500, {"error": "server error"}
+
+    routes = {
+        "/api/v1/health": ("GET", health_check),
+        "/api/v1/lookup": ("GET", lookup),
+        "/api/v1/terms": ("GET", list_terms),
+        "/api/v1/export": ("GET", export),
+        "/api/v1/add": ("POST", add),
+        "/api/v1/add/status": ("GET", add_status),
+        "/api/v1/english-lesson": ("GET", get_english_lesson),
+    }
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    if writes:
+                        writes.close()
+                    service.close()
+                    if recorder:
+                        recorder.close()
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+        if scope["path"] == "/api/v1/metrics" and metrics and scope["method"] == "GET":
+            gauges = {**metrics_gauges(service.service, writes), "async": service.stats()}
+            return await _send_bytes(
+                send, 200, metrics.render(gauges, metrics_histograms(writes)).encode("utf-8"),
+                content_type=CONTENT_TYPE.encode(),
+            )
+        if metrics is None and recorder is None:
+            return await dispatch(scope, receive, send)
+
+        statuses, chunks = [], []
+
+        async def recording_receive():
+            message = await receive()
+            if recorder:
+                chunks.append(message.get("body", b""))
+            return message
+
+        async def recording_send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+            await send(message)
+
+        arrived, started = time.time(), time.perf_counter()
+        stats = instrumentation.QueryStats()
+        token = instrumentation.bind(stats) if metrics else None
+        try:
+            await dispatch(scope, recording_receive, recording_send)
+        finally:
+            if token is not None:
+                instrumentation.unbind(token)
+            elapsed = time.perf_counter() - started
+            status = statuses[0] if statuses else 500
+            if metrics:
+                route = scope["path"] if scope["path"] in routes else "unmatched"
+                metrics.observe(scope["method"], route, status, elapsed, stats)
+            if recorder:
+                recorder.record(
+                    scope["method"], scope["path"],
+                    scope.get("query_string", b"").decode("latin-1"),
+                    b"".join(chunks), status, elapsed, started=arrived,
+                )
+
+    async def dispatch(scope, receive, send):
+        route = routes.get(scope["path"])
+        if route is None:
+            return await _send_json(send, 404, {"error": "not found"})
+        method, handler = route
+        if scope["method"] != method:
+            return await _send_json(send, 405, {"error": "method not allowed"})
+
+        body = b""
+        if method == "POST":
+            body = await _read_body(receive)
+            if body is None:
+                return await _send_json(send, 413, {"error": "payload too large"})
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        args = {name: values[0] for name, values in query.items()}
+        try:
+            status, result = await handler(args, body)
+        except (Overloaded, QueueFull):
+            return await _send_json(
+                send, 503, {"error": "server busy, retry later"}, [(b"retry-after", b"1")]
+            )
+        except ValueError as e:
+            return await _send_json(send, 400, {"error": str(e)})
+        if isinstance(result, EncodedJson):
+            return await _send_encoded(send, scope, result, max_age)
+        if hasattr(result, "__aiter__"):
+            return await _send_stream(send, result, b"application/x-ndjson")
+        await _send_json(send, status, result)
+
+    app.service = service
+    app.writes = writes
+    return app
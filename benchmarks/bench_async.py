@@ -0,0 +1,152 @@
+"""Load comparison of the Flask app against the ASGI app in one process.
+
+The repository is the in-memory backend with a simulated round trip of
+``--db-ms`` held under a ``--pool-size`` semaphore, standing in for
+network I/O on a bounded MySQL pool. The entry cache is disabled so every
+lookup reaches the "database".
+
+Sync mode serves ``--clients`` concurrent clients with ``--threads``
+worker threads, like one gunicorn process. Async mode serves them from a
+single event loop through ``AsyncDictionaryService``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stats import percentile
+from db.memory_repository import InMemoryRepository
+from models import EnglishTerm, Meaning, SpanishTerm, Gender, PartOfSpeech
+
+
+class SlowRepository(InMemoryRepository):
+    def __init__(self, db_ms: float, pool_size: int) -> None:
+        super().__init__()
+        self.delay = db_ms / 1000
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def load_english_term(self, lemma):
+        with self._slots:
+            time.sleep(self.delay)
+            return super().load_english_term(lemma)
+
+
+def _seed(repo: InMemoryRepository, n_terms: int):
+    entries = []
+    for i in range(n_terms):
+        et = EnglishTerm(term=f"term{i}", pos=PartOfSpeech.NOUN)
+        m = Meaning(description=f"meaning {i}", english_term=et)
+        SpanishTerm(term=f"termino{i}", gender=Gender.MASCULINE, meaning=m)
+        entries.append(et)
+    repo.persist_entries(entries)
+    return [et.term for et in entries]
+
+
+def _report(label, elapsed, latencies, statuses, threads):
+    ok = statuses.count(200)
+    print(
+        f"{label:>5}: {ok / elapsed:8.0f} ok/s  "
+        f"p50={percentile(latencies, 50):7.1f}ms  p99={percentile(latencies, 99):7.1f}ms  "
+        f"ok={ok} rejected={statuses.count(503)} server threads={threads}"
+    )
+
+
+def run_sync(repo, lemmas, args):
+    from api.app import create_app
+
+    app = create_app({"REPOSITORY": repo})
+    workers = threading.BoundedSemaphore(args.threads)
+    latencies, statuses = [], []
+
+    def client(offset):
+        http = app.test_client()
+        for i in range(args.requests):
+            lemma = lemmas[(offset + i) % len(lemmas)]
+            t0 = time.perf_counter()
+            with workers:
+                status = http.get(f"/api/v1/lookup?english={lemma}").status_code
+            latencies.append((time.perf_counter() - t0) * 1000)
+            statuses.append(status)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as clients:
+        list(clients.map(client, range(args.clients)))
+    _report("sync", time.perf_counter() - started, latencies, statuses, args.threads)
+
+
+def run_async(repo, lemmas, args):
+    from api.asgi import create_asgi_app
+
+    app = create_asgi_app({
+        "REPOSITORY": repo,
+        "ASYNC_WORKERS": args.pool_size,
+        "ASYNC_MAX_PENDING": args.max_pending,
+    })
+    latencies, statuses = [], []
+
+    async def request(lemma):
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/lookup",
+            "query_string": f"english={lemma}".encode(),
+        }
+        await app(scope, receive, send)
+        json.loads(sent[1]["body"])
+        return sent[0]["status"]
+
+    async def client(offset):
+        for i in range(args.requests):
+            t0 = time.perf_counter()
+            statuses.append(await request(lemmas[(offset + i) % len(lemmas)]))
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    async def main():
+        await asyncio.gather(*(client(c) for c in range(args.clients)))
+
+    started = time.perf_counter()
+    asyncio.run(main())
+    # The event loop plus the bridge's I/O threads.
+    threads = 1 + app.service.max_workers
+    _report("async", time.perf_counter() - started, latencies, statuses, threads)
+    app.service.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Sync (Flask) vs async (ASGI) lookup throughput")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=25, help="requests per client")
+    parser.add_argument("--threads", type=int, default=8, help="sync worker threads")
+    parser.add_argument("--pool-size", type=int, default=32)
+    parser.add_argument("--max-pending", type=int, default=256)
+    parser.add_argument("--db-ms", type=float, default=5.0)
+    parser.add_argument("--terms", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    os.environ["ENTRY_CACHE_TTL"] = "0"
+    os.environ["ENTRY_CACHE_NEGATIVE_TTL"] = "0"
+    repo = SlowRepository(args.db_ms, args.pool_size)
+    lemmas = _seed(repo, args.terms)
+    print(
+        f"{args.clients} clients x {args.requests} lookups, db={args.db_ms}ms, "
+        f"pool={args.pool_size}, sync threads={args.threads}"
+    )
+    run_sync(repo, lemmas, args)
+    run_async(repo, lemmas, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Storage size and lookup latency with CHAR(36) vs BINARY(16) ids.
+
+Loads the same generated dictionary into two databases, one per id
+format, and reports table plus index size and ``load_english_term``
+latency for each.
+
+``--backend mysql`` creates ``<MYSQL_DATABASE>_char`` and
+``<MYSQL_DATABASE>_bin`` from ``data/init.sql``, converting the second one
+with ``tools.migrate_binary_ids``, and reads sizes from
+``information_schema``. ``--backend sqlite`` (default) needs no server and
+reports file size; SQLite stores the 16-byte ids as BLOBs.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+
+from benchmarks.stats import percentile
+from models import EnglishTerm, Meaning, SpanishTerm, Example, PartOfSpeech, Gender
+
+
+def _entries(n: int, seed: int):
+    rng = random.Random(seed)
+    for i in range(n):
+        et = EnglishTerm(term=f"term{i:07d}", pos=PartOfSpeech.NOUN)
+        for j in range(rng.randint(1, 3)):
+            m = Meaning(description=f"Meaning {j} of term {i}", english_term=et)
+            SpanishTerm(term=f"término{i:07d}-{j}", gender=Gender.MASCULINE, meaning=m)
+            Example(language="en", text=f"An example for term {i}.", meaning=m)
+            Example(language="es", text=f"Un ejemplo para el término {i}.", meaning=m)
+        yield et
+
+
+def _load(repo, n: int, seed: int, chunk: int = 1000) -> float:
+    started = time.perf_counter()
+    batch = []
+    for et in _entries(n, seed):
+        batch.append(et)
+        if len(batch) == chunk:
+            repo.persist_entries(batch)
+            batch = []
+    if batch:
+        repo.persist_entries(batch)
+    return time.perf_counter() - started
+
+
+def _latency(repo, n: int, lookups: int, seed: int):
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(lookups):
+        lemma = f"term{rng.randrange(n):07d}"
+        t0 = time.perf_counter()
+        repo.load_english_term(lemma)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return percentile(samples, 50), percentile(samples, 99)
+
+
+def _sqlite_repos(workdir: str):
+    from db.sqlite_repository import SqliteRepository
+
+    for label, binary in (("CHAR(36)", False), ("BINARY(16)", True)):
+        path = os.path.join(workdir, f"bench-{'bin' if binary else 'char'}.sqlite3")
+        repo = SqliteRepository(path, binary_ids=binary)
+
+        def size(repo=repo, path=path) -> int:
+            with repo.pool.connection() as cn:
+                cn.execute("VACUUM")
+            return os.path.getsize(path)
+
+        yield label, repo, size
+
+
+def _mysql_repos():
+    from db.mysql_repository import MysqlRepository
+    from tools import migrate_binary_ids
+
+    with open(os.path.join("data", "init.sql"), encoding="utf-8-sig") as f:
+        ddl = [
+            s.strip() for s in f.read().split(";")
+            if re.match(r"\s*CREATE TABLE", s)
+        ]
+    base = os.getenv("MYSQL_DATABASE", "medical")
+    for label, binary in (("CHAR(36)", False), ("BINARY(16)", True)):
+        name = f"{base}_{'bin' if binary else 'char'}"
+        admin = MysqlRepository()
+        with admin.pool.connection() as cn:
+            cur = cn.cursor()
+            cur.execute(f"DROP DATABASE IF EXISTS {name}")
+            cur.execute(f"CREATE DATABASE {name} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+            cur.close()
+        admin.close()
+        repo = MysqlRepository(database=name, binary_ids=False)
+        with repo._cursor(commit=True) as cur:
+            for stmt in ddl:
+                cur.execute(stmt)
+        if binary:
+            migrate_binary_ids.run_copy(repo, 5000, 0)
+            migrate_binary_ids.run_cutover(repo)
+            migrate_binary_ids.run_cleanup(repo)
+            repo.close()
+            repo = MysqlRepository(database=name, binary_ids=True)
+
+        def size(repo=repo, name=name) -> int:
+            with repo._cursor(commit=True) as cur:
+                for table in migrate_binary_ids.TABLES:
+                    cur.execute(f"ANALYZE TABLE {table}")
+                    cur.fetchall()
+                cur.execute(
+                    "SELECT SUM(data_length + index_length) FROM information_schema.TABLES "
+                    "WHERE table_schema = %s",
+                    (name,),
+                )
+                return int(cur.fetchone()[0])
+
+        yield label, repo, size
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="CHAR(36) vs BINARY(16) id storage")
+    parser.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        repos = _mysql_repos() if args.backend == "mysql" else _sqlite_repos(workdir)
+        for label, repo, size in repos:
+            load_s = _load(repo, args.entries, args.seed)
+            total = size()
+            p50, p99 = _latency(repo, args.entries, args.lookups, args.seed)
+            print(
+                f"{label:>10}: {total / 2**20:8.1f} MB  load {load_s:6.1f}s  "
+                f"lookup p50={p50:.3f}ms p99={p99:.3f}ms"
+            )
+            repo.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+
+from services.fuzzy import FuzzyIndex, edit_distance
+from .stats import percentile
+
+
+def _typo(rng: random.Random, word: str) -> str:
+    i = rng.randrange(len(word))
+    op = rng.choice(("drop", "swap", "replace"))
+    if op == "drop":
+        return word[:i] + word[i + 1:]
+    if op == "swap" and i + 1 < len(word):
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+
+
+def _measure(fn, queries):
+    samples = []
+    for q in queries:
+        t0 = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return percentile(samples, 50), percentile(samples, 99)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="FuzzyIndex latency as the dictionary grows")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--scan-queries", type=int, default=5,
+                        help="queries for the full-scan baseline (0 to skip)")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args(argv)
+
+    print(f"{'terms':>9} {'index p50':>10} {'index p99':>10} {'scan p50':>10}")
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        terms = list({
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 14)))
+            for _ in range(size)
+        })
+        index = FuzzyIndex(max_distance=2)
+        index.build(("en", t) for t in terms)
+        queries = [_typo(rng, rng.choice(terms)) for _ in range(args.queries)]
+        p50, p99 = _measure(lambda q: index.search(q), queries)
+
+        scan = "-"
+        if args.scan_queries:
+            scan_p50, _ = _measure(
+                lambda q: [t for t in terms if edit_distance(q, t, 2) <= 2],
+                queries[: args.scan_queries],
+            )
+            scan = f"{scan_p50:.2f}ms"
+        print(f"{len(terms):>9,} {p50:>8.3f}ms {p99:>8.3f}ms {scan:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Memory footprint of the entry model variants.
+
+Builds the same N entries (one meaning, one Spanish term, two examples
+each) as the original ``@dataclass`` model, the slotted model in
+``models.models`` and the frozen ``models.compact`` tree, and reports
+what each allocated according to ``tracemalloc``. Text is created before
+measuring and shared by all variants, so the numbers are the model's own
+overhead: objects, ids, lists and back-references.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from typing import List
+from uuid import UUID, uuid4
+
+from models import EnglishTerm, Meaning, SpanishTerm, Example, PartOfSpeech, Gender
+from models.compact import compact
+
+
+# The model as it was before slots, kept here as the baseline.
+@dataclass
+class LegacyEnglishTerm:
+    term: str
+    pos: PartOfSpeech
+    term_id: UUID = field(default_factory=uuid4)
+    meanings: List["LegacyMeaning"] = field(default_factory=list)
+
+
+@dataclass
+class LegacyMeaning:
+    description: str
+    english_term: LegacyEnglishTerm
+    meaning_id: UUID = field(default_factory=uuid4)
+    spanish_terms: list = field(default_factory=list)
+    examples: list = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.english_term.meanings.append(self)
+
+
+@dataclass
+class LegacySpanishTerm:
+    term: str
+    gender: Gender
+    meaning: LegacyMeaning
+    term_id: UUID = field(default_factory=uuid4)
+
+    def __post_init__(self) -> None:
+        self.meaning.spanish_terms.append(self)
+
+
+@dataclass
+class LegacyExample:
+    language: str
+    text: str
+    meaning: LegacyMeaning
+    example_id: UUID = field(default_factory=uuid4)
+
+    def __post_init__(self) -> None:
+        self.meaning.examples.append(self)
+
+
+def _rows(n: int):
+    return [
+        (f"term{i}", f"Meaning of term {i}", f"término{i}", f"Term {i} example.", f"Ejemplo {i}.")
+        for i in range(n)
+    ]
+
+
+def build_legacy(rows):
+    out = []
+    for lemma, desc, es, ex_en, ex_es in rows:
+        et = LegacyEnglishTerm(term=lemma, pos=PartOfSpeech.NOUN)
+        m = LegacyMeaning(description=desc, english_term=et)
+        LegacySpanishTerm(term=es, gender=Gender.MASCULINE, meaning=m)
+        LegacyExample(language="en", text=ex_en, meaning=m)
+        LegacyExample(language="es", text=ex_es, meaning=m)
+        out.append(et)
+    return out
+
+
+def build_slotted(rows):
+    out = []
+    for lemma, desc, es, ex_en, ex_es in rows:
+        et = EnglishTerm(term=lemma, pos=PartOfSpeech.NOUN)
+        m = Meaning(description=desc, english_term=et)
+        SpanishTerm(term=es, gender=Gender.MASCULINE, meaning=m)
+        Example(language="en", text=ex_en, meaning=m)
+        Example(language="es", text=ex_es, meaning=m)
+        out.append(et)
+    return out
+
+
+def build_compact(rows):
+    # Built one entry at a time so the transient full graphs are not counted.
+    return [compact(et) for row in rows for et in build_slotted([row])]
+
+
+def measure(builder, rows) -> int:
+    gc.collect()
+    tracemalloc.start()
+    entries = builder(rows)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entries
+    return size
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Memory per entry for each model variant")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    args = parser.parse_args(argv)
+
+    uuid.uuid4()  # import-time allocations out of the measurement
+    variants = [("dataclass", build_legacy), ("slotted", build_slotted), ("compact", build_compact)]
+    print(f"{'entries':>9} " + " ".join(f"{name:>22}" for name, _ in variants))
+    for n in (int(s) for s in args.sizes.split(",")):
+        rows = _rows(n)
+        cells = []
+        for _, builder in variants:
+            size = measure(builder, rows)
+            cells.append(f"{size / 2**20:9.1f} MB {size / n:6.0f} B/e")
+        print(f"{n:>9} " + " ".join(f"{c:>22}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
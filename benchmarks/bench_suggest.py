@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+
+from benchmarks.stats import percentile
+from services.suggest import PrefixIndex
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Latency of PrefixIndex.suggest")
+    parser.add_argument("--terms", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    terms = {
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 14)))
+        for _ in range(args.terms)
+    }
+    started = time.perf_counter()
+    index = PrefixIndex()
+    index.build(("en", t) for t in terms)
+    print(f"built {len(index):,} terms in {time.perf_counter() - started:.2f}s")
+
+    pool = list(terms)
+    for _ in range(args.queries):
+        index.record_hit("en", rng.choice(pool))
+
+    prefixes = [rng.choice(pool)[: rng.randint(1, 5)] for _ in range(args.queries)]
+    for label in ("cold", "warm"):
+        samples = []
+        for prefix in prefixes:
+            t0 = time.perf_counter()
+            index.suggest(prefix, 10)
+            samples.append((time.perf_counter() - t0) * 1000)
+        print(
+            f"suggest ({label}): p50={percentile(samples, 50):.3f}ms "
+            f"p95={percentile(samples, 95):.3f}ms p99={percentile(samples, 99):.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compare two ``benchmarks.suite`` result files and flag regressions.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.2
+
+A result regresses when a latency percentile grows, or throughput drops,
+by more than ``--threshold`` (a fraction). Latency changes smaller than
+``--min-ms`` are treated as noise. Exits with status 1 if anything
+regressed, so it can gate CI.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Tuple
+
+LATENCIES = ("p50_ms", "p95_ms", "p99_ms")
+
+Key = Tuple[str, str, int, str]
+
+
+def _index(report: Dict[str, Any]) -> Dict[Key, Dict[str, Any]]:
+    return {
+        (r["backend"], r["path"], r["scale"], r["scenario"]): r for r in report["results"]
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    candidate: Dict[str, Any],
+    threshold: float = 0.20,
+    min_ms: float = 0.05,
+) -> List[Dict[str, Any]]:
+    """One row per metric of every result present in both reports."""
+    old, new = _index(baseline), _index(candidate)
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        a, b = old[key], new[key]
+        for metric in LATENCIES + ("throughput",):
+            before, after = a.get(metric), b.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if metric == "throughput":
+                regressed = change < -threshold
+            else:
+                regressed = change > threshold and after - before > min_ms
+            rows.append({
+                "key": key, "metric": metric, "before": before, "after": after,
+                "change": change, "regressed": regressed,
+            })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Flag regressions between two suite runs.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed relative change")
+    parser.add_argument("--min-ms", type=float, default=0.05, help="ignore smaller latency changes")
+    parser.add_argument("--all", action="store_true", help="print unchanged metrics too")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    rows = compare(baseline, candidate, args.threshold, args.min_ms)
+    regressions = [r for r in rows if r["regressed"]]
+    for r in rows if args.all else regressions:
+        backend, path, scale, scenario = r["key"]
+        print(
+            f"{'REGRESSION' if r['regressed'] else 'ok':>10}  {backend:>8} {path:>7} {scale:>8} "
+            f"{scenario:<12} {r['metric']:<10} {r['before']:>12,.3f} -> {r['after']:>12,.3f} "
+            f"({r['change']:+.1%})"
+        )
+    missing = _index(baseline).keys() - _index(candidate).keys()
+    if missing:
+        print(f"{len(missing)} baseline results have no counterpart in {args.candidate}")
+    print(f"{len(regressions)} regressions in {len(rows)} compared metrics")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
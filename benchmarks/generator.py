@@ -0,0 +1,136 @@
+"""Deterministic synthetic medical dictionaries for benchmarks.
+
+``DictionaryGenerator(n)`` describes a dictionary of ``n`` English entries.
+Entry ``i`` is derived from ``(seed, i)`` alone, so any entry can be
+rebuilt without generating the ones before it. The shape follows the real
+glossaries:
+
+- 1–8 meanings per entry, mostly one or two;
+- 0–5 examples per meaning;
+- about a third of the meanings also link a Spanish term from a small
+  shared pool, so common words like "dolor" link many entries;
+- lookups follow a Zipf distribution over the lemmas (``sampler``).
+"""
+from __future__ import annotations
+
+import bisect
+import itertools
+import random
+from typing import Any, Dict, Iterator, List, Optional
+
+from models import EnglishTerm, Meaning, SpanishTerm, Example, PartOfSpeech, Gender
+
+_ROOTS = [
+    ("cardi", "cardi"), ("gastr", "gastr"), ("neur", "neur"), ("derm", "derm"),
+    ("hepat", "hepat"), ("oste", "oste"), ("nephr", "nefr"), ("arthr", "artr"),
+    ("my", "mi"), ("encephal", "encefal"), ("col", "col"), ("rhin", "rin"),
+    ("ot", "ot"), ("ophthalm", "oftalm"), ("hem", "hem"), ("lymph", "linf"),
+    ("pneum", "neum"), ("cyst", "cist"), ("angi", "angi"), ("chondr", "condr"),
+    ("laryng", "laring"), ("pharyng", "faring"), ("thromb", "tromb"), ("aden", "aden"),
+]
+_SUFFIXES = [
+    ("itis", "itis"), ("algia", "algia"), ("ectomy", "ectomía"), ("osis", "osis"),
+    ("oma", "oma"), ("pathy", "patía"), ("plasty", "plastia"), ("scopy", "scopia"),
+    ("emia", "emia"), ("megaly", "megalia"), ("otomy", "otomía"), ("rrhagia", "rragia"),
+]
+_WORDS = (
+    "acute chronic pain swelling inflammation of the tissue caused by infection "
+    "injury surgical removal procedure abnormal growth in blood vessel organ "
+    "enlargement bleeding disease affecting joint muscle skin nerve bone lung"
+).split()
+_SHARED_SPANISH = [
+    ("dolor", "m"), ("fiebre", "f"), ("inflamación", "f"), ("herida", "f"), ("lesión", "f"),
+    ("infección", "f"), ("tos", "f"), ("hinchazón", "f"), ("sangrado", "m"), ("mareo", "m"),
+    ("náusea", "f"), ("fatiga", "f"), ("picazón", "f"), ("ardor", "m"),
+]
+_MEANING_WEIGHTS = [40, 25, 14, 8, 5, 4, 2, 2]
+_EXAMPLE_WEIGHTS = [15, 25, 25, 15, 12, 8]
+_POS = [PartOfSpeech.NOUN] * 6 + [PartOfSpeech.ADJ, PartOfSpeech.VERB]
+
+
+class ZipfSampler:
+    """Draws ``range(n)`` indexes with probability proportional to
+    ``1 / rank**s``; ranks are shuffled so popularity is not alphabetical."""
+
+    def __init__(self, n: int, s: float = 1.07, seed: int = 7) -> None:
+        self._rng = random.Random(seed)
+        self._cumulative = list(itertools.accumulate(1.0 / (k ** s) for k in range(1, n + 1)))
+        self._by_rank = list(range(n))
+        random.Random(seed + 1).shuffle(self._by_rank)
+
+    def __call__(self) -> int:
+        rank = bisect.bisect_left(self._cumulative, self._rng.random() * self._cumulative[-1])
+        return self._by_rank[min(rank, len(self._by_rank) - 1)]
+
+    def sample(self, k: int) -> List[int]:
+        return [self() for _ in range(k)]
+
+
+class DictionaryGenerator:
+    def __init__(self, n_terms: int, seed: int = 7) -> None:
+        self.n_terms = n_terms
+        self.seed = seed
+
+    def _rng(self, i: int) -> random.Random:
+        return random.Random(self.seed * 1_000_003 + i)
+
+    @staticmethod
+    def lemma(i: int) -> str:
+        root, _ = _ROOTS[i % len(_ROOTS)]
+        suffix, _ = _SUFFIXES[(i // len(_ROOTS)) % len(_SUFFIXES)]
+        variant = i // (len(_ROOTS) * len(_SUFFIXES))
+        return f"{root}{suffix}" if variant == 0 else f"{root}{suffix} type {variant}"
+
+    @staticmethod
+    def _spanish(i: int, j: int) -> str:
+        _, root = _ROOTS[i % len(_ROOTS)]
+        _, suffix = _SUFFIXES[(i // len(_ROOTS)) % len(_SUFFIXES)]
+        return f"{root}{suffix} {i}-{j}"
+
+    def _meanings(self, i: int) -> List[Dict[str, Any]]:
+        rng = self._rng(i)
+        meanings = []
+        for j in range(rng.choices(range(1, 9), _MEANING_WEIGHTS)[0]):
+            spanish = [{"term": self._spanish(i, j), "gender": rng.choice("mf")}]
+            if rng.random() < 0.35:
+                term, gender = rng.choice(_SHARED_SPANISH)
+                spanish.append({"term": term, "gender": gender})
+            words = " ".join(rng.choices(_WORDS, k=rng.randint(5, 12)))
+            meanings.append({
+                "description": f"{words.capitalize()} ({j + 1}).",
+                "spanish_terms": spanish,
+                "examples": [
+                    [lang, f"{' '.join(rng.choices(_WORDS, k=rng.randint(4, 10)))} {self.lemma(i)} {k}."]
+                    for k, lang in enumerate(
+                        rng.choice(["en", "es"])
+                        for _ in range(rng.choices(range(6), _EXAMPLE_WEIGHTS)[0])
+                    )
+                ],
+            })
+        return meanings
+
+    def payload(self, i: int) -> Dict[str, Any]:
+        """Entry ``i`` as an ``/api/v1/add`` body with a ``meanings`` list."""
+        return {
+            "lemma": self.lemma(i),
+            "pos": self._rng(i).choice(_POS).value,
+            "meanings": self._meanings(i),
+        }
+
+    def entry(self, i: int) -> EnglishTerm:
+        data = self.payload(i)
+        et = EnglishTerm(term=data["lemma"], pos=PartOfSpeech(data["pos"]))
+        for item in data["meanings"]:
+            m = Meaning(description=item["description"], english_term=et)
+            for st in item["spanish_terms"]:
+                SpanishTerm(term=st["term"], gender=Gender(st["gender"]), meaning=m)
+            for language, text in item["examples"]:
+                Example(language=language, text=text, meaning=m)
+        return et
+
+    def entries(self, start: int = 0, stop: Optional[int] = None) -> Iterator[EnglishTerm]:
+        for i in range(start, self.n_terms if stop is None else stop):
+            yield self.entry(i)
+
+    def sampler(self, seed: Optional[int] = None) -> ZipfSampler:
+        return ZipfSampler(self.n_terms, seed=self.seed if seed is None else seed)
@@ -0,0 +1,10 @@
+"""Helpers shared by the benchmarks and the replay tool."""
+from __future__ import annotations
+
+from typing import Sequence
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples``, which must not be empty."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
@@ -0,0 +1,266 @@
+"""Benchmark suite over every repository backend, direct and through Flask.
+
+    python -m benchmarks.suite --scales 10000,100000 --out results.json
+    python -m benchmarks.compare baseline.json results.json
+
+For each backend and scale the generated dictionary is bulk-imported
+(timed as ``bulk_import``), then each scenario runs once per path:
+``service`` calls ``DictionaryService`` directly, ``flask`` goes through
+the app's test client, including routing and JSON encoding.
+
+- ``cold_lookup``: distinct lemmas, so every lookup misses the entry cache;
+- ``warm_lookup``: Zipf-distributed lemmas after one warm-up pass;
+- ``batch_lookup``: 50 Zipf-distributed lemmas per call;
+- ``add``: new entries with several meanings each;
+- ``delete``: the added entries, one call per lemma;
+- ``bulk_delete``: existing entries, 100 lemmas per call.
+
+The snapshot backend is read-only and runs the lookup scenarios only.
+MySQL uses a scratch database (``--mysql-database``) that is dropped and
+recreated, and is skipped when no server answers.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Sequence
+from urllib.parse import quote
+
+from benchmarks.generator import DictionaryGenerator, ZipfSampler
+from benchmarks.stats import percentile
+from services.cache import LRUCache
+from services.service import DictionaryService
+
+BACKENDS = ("memory", "sqlite", "snapshot", "mysql")
+PATHS = ("service", "flask")
+IMPORT_CHUNK = 1000
+BATCH_SIZE = 50
+BULK_DELETE_SIZE = 100
+
+
+def summarize(samples_ms: Sequence[float], ops: int, seconds: float) -> Dict[str, Any]:
+    return {
+        "ops": ops,
+        "seconds": round(seconds, 4),
+        "throughput": round(ops / seconds, 1) if seconds else None,
+        "p50_ms": round(percentile(samples_ms, 50), 4),
+        "p95_ms": round(percentile(samples_ms, 95), 4),
+        "p99_ms": round(percentile(samples_ms, 99), 4),
+    }
+
+
+def timed(fn: Callable[[Any], Any], items: Sequence[Any], ops_per_item: int = 1) -> Dict[str, Any]:
+    samples = []
+    started = time.perf_counter()
+    for item in items:
+        t0 = time.perf_counter()
+        fn(item)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return summarize(samples, len(items) * ops_per_item, time.perf_counter() - started)
+
+
+class ServiceTarget:
+    def __init__(self, repo) -> None:
+        self.service = DictionaryService(repo, cache=LRUCache(max_size=10_000))
+
+    def lookup(self, lemma: str) -> None:
+        assert self.service.lookup_english_encoded(lemma) is not None, lemma
+
+    def lookup_many(self, lemmas: List[str]) -> None:
+        self.service.lookup_many(lemmas)
+
+    def add(self, payload: Dict[str, Any]) -> None:
+        self.service.add_full_entry(payload["lemma"], payload["pos"], payload["meanings"])
+
+    def delete(self, lemmas: List[str]) -> None:
+        self.service.delete_entries(lemmas)
+
+
+class FlaskTarget:
+    def __init__(self, repo) -> None:
+        from api.app import create_app
+
+        self.client = create_app({"REPOSITORY": repo, "ADMIN_TOKEN": "bench"}).test_client()
+
+    def _check(self, resp) -> None:
+        assert resp.status_code == 200, (resp.status_code, resp.get_data(as_text=True))
+
+    def lookup(self, lemma: str) -> None:
+        self._check(self.client.get(f"/api/v1/lookup?english={quote(lemma)}"))
+
+    def lookup_many(self, lemmas: List[str]) -> None:
+        self._check(self.client.post("/api/v1/lookup/batch", json={"english": lemmas}))
+
+    def add(self, payload: Dict[str, Any]) -> None:
+        self._check(self.client.post("/api/v1/add", json=payload))
+
+    def delete(self, lemmas: List[str]) -> None:
+        self._check(self.client.post(
+            "/api/v1/admin/delete", json={"english": lemmas},
+            headers={"Authorization": "Bearer bench"},
+        ))
+
+
+def _fresh_mysql(name: str):
+    from db.mysql_repository import MysqlRepository
+
+    with open(os.path.join("data", "init.sql"), encoding="utf-8-sig") as f:
+        ddl = [s.strip() for s in f.read().split(";") if re.match(r"\s*CREATE TABLE", s)]
+    admin = MysqlRepository()
+    try:
+        with admin.pool.connection() as cn:
+            cur = cn.cursor()
+            cur.execute(f"DROP DATABASE IF EXISTS {name}")
+            cur.execute(f"CREATE DATABASE {name} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+            cur.close()
+    finally:
+        admin.close()
+    repo = MysqlRepository(database=name)
+    with repo._cursor(commit=True) as cur:
+        for stmt in ddl:
+            cur.execute(stmt)
+    return repo
+
+
+def load(backend: str, gen: DictionaryGenerator, workdir: str, args):
+    """The repository for ``backend`` holding ``gen``'s dictionary, and the
+    timing of the import (None for snapshots, which are written, not imported)."""
+    if backend == "snapshot":
+        from db.snapshot import SnapshotRepository, write_snapshot
+
+        path = os.path.join(workdir, f"bench-{gen.n_terms}.snapshot")
+        write_snapshot(gen.entries(), path)
+        return SnapshotRepository(path), None
+    if backend == "memory":
+        from db.memory_repository import InMemoryRepository
+        repo = InMemoryRepository()
+    elif backend == "sqlite":
+        from db.sqlite_repository import SqliteRepository
+        repo = SqliteRepository(os.path.join(workdir, f"bench-{gen.n_terms}.sqlite3"))
+    else:
+        repo = _fresh_mysql(args.mysql_database)
+
+    service = DictionaryService(repo)
+    samples = []
+    for start in range(0, gen.n_terms, IMPORT_CHUNK):
+        # Generated outside the timed region: only the write is measured.
+        chunk = list(gen.entries(start, min(start + IMPORT_CHUNK, gen.n_terms)))
+        t0 = time.perf_counter()
+        service.add_entries(chunk)
+        samples.append((time.perf_counter() - t0) * 1000)
+    result = summarize(samples, gen.n_terms, sum(samples) / 1000)
+    result["batch"] = IMPORT_CHUNK
+    return repo, result
+
+
+def run_backend(backend: str, scale: int, args, workdir: str) -> List[Dict[str, Any]]:
+    gen = DictionaryGenerator(scale, seed=args.seed)
+    repo, imported = load(backend, gen, workdir, args)
+    results: List[Dict[str, Any]] = []
+
+    def record(path: str, scenario: str, result: Dict[str, Any]) -> None:
+        result = {"backend": backend, "path": path, "scale": scale, "scenario": scenario, **result}
+        results.append(result)
+        print(
+            f"{backend:>8} {path:>7} {scale:>8} {scenario:<12} "
+            f"p50={result['p50_ms']:8.3f}ms p95={result['p95_ms']:8.3f}ms "
+            f"p99={result['p99_ms']:8.3f}ms {result['throughput'] or 0:>10,.0f} ops/s",
+            flush=True,
+        )
+
+    if imported:
+        record("service", "bulk_import", imported)
+
+    # The tail of the dictionary is kept for bulk_delete; lookups stay below it.
+    readable = scale if backend == "snapshot" else scale - len(args.paths) * args.write_ops
+    if readable <= 0:
+        raise ValueError(f"scale {scale} is too small for --write-ops {args.write_ops}")
+    rng = random.Random(args.seed)
+    cold = [gen.lemma(i) for i in rng.sample(range(readable), min(args.ops, readable))]
+    zipf = [gen.lemma(i) for i in ZipfSampler(readable, seed=args.seed).sample(args.ops)]
+    batches = [zipf[i:i + BATCH_SIZE] for i in range(0, len(zipf), BATCH_SIZE)]
+    targets = {"service": ServiceTarget, "flask": FlaskTarget}
+
+    for n, path in enumerate(args.paths):
+        target = targets[path](repo)
+        record(path, "cold_lookup", timed(target.lookup, cold))
+        for lemma in zipf:
+            target.lookup(lemma)
+        record(path, "warm_lookup", timed(target.lookup, zipf))
+        record(path, "batch_lookup", timed(target.lookup_many, batches, BATCH_SIZE))
+        if backend == "snapshot":
+            continue
+
+        first_new = scale + n * args.write_ops
+        added = range(first_new, first_new + args.write_ops)
+        record(path, "add", timed(target.add, [gen.payload(i) for i in added]))
+        record(path, "delete", timed(target.delete, [[gen.lemma(i)] for i in added]))
+        # Existing entries from the end of the dictionary, a separate slice per path.
+        stop = scale - n * args.write_ops
+        doomed = [gen.lemma(i) for i in range(max(0, stop - args.write_ops), stop)]
+        chunks = [doomed[i:i + BULK_DELETE_SIZE] for i in range(0, len(doomed), BULK_DELETE_SIZE)]
+        record(path, "bulk_delete", timed(target.delete, chunks, BULK_DELETE_SIZE))
+
+    close = getattr(repo, "close", None)
+    if close:
+        close()
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every scenario on every backend.")
+    parser.add_argument("--backends", default="memory,sqlite,snapshot",
+                        help=f"comma-separated subset of {','.join(BACKENDS)}")
+    parser.add_argument("--paths", default="service,flask", help="service, flask or both")
+    parser.add_argument("--scales", default="10000", help="e.g. 10000,100000,1000000")
+    parser.add_argument("--ops", type=int, default=2000, help="lookups per lookup scenario")
+    parser.add_argument("--write-ops", type=int, default=200, help="entries per write scenario")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--mysql-database", default="dictionary_bench")
+    parser.add_argument("--out", help="also write the results as JSON here; stdout only gets the table")
+    args = parser.parse_args(argv)
+    args.paths = [p for p in args.paths.split(",") if p]
+    backends = [b for b in args.backends.split(",") if b]
+    for name in backends + args.paths:
+        if name not in BACKENDS + PATHS:
+            parser.error(f"unknown backend or path: {name}")
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in (int(s) for s in args.scales.split(",")):
+            for backend in backends:
+                try:
+                    results.extend(run_backend(backend, scale, args, workdir))
+                except ImportError as e:
+                    print(f"skipping {backend}: {e}", file=sys.stderr)
+                except Exception as e:
+                    if backend != "mysql":
+                        raise
+                    print(f"skipping mysql: {e}", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "ops": args.ops,
+            "write_ops": args.write_ops,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,9 +13,11 @@ CREATE TABLE IF NOT EXISTS english_term (
 CREATE TABLE IF NOT EXISTS spanish_term (
   id CHAR(36) NOT NULL,
   term NVARCHAR(100) NOT NULL,
+  term_key NVARCHAR(100) NOT NULL DEFAULT '',
   gender VARCHAR(10) NOT NULL,
   PRIMARY KEY (id),
-  UNIQUE KEY uq_spanish_term (term)
+  UNIQUE KEY uq_spanish_term (term),
+  KEY idx_spanish_term_key (term_key)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 CREATE TABLE IF NOT EXISTS meaning (
@@ -53,6 +55,15 @@ CREATE TABLE IF NOT EXISTS meaning_spanish (
   CONSTRAINT fk_ms_st FOREIGN KEY (spanish_term_id) REFERENCES spanish_term(id)   ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- One row, bumped by every transaction that adds or deletes English lemmas.
+CREATE TABLE IF NOT EXISTS english_term_changes (
+  id TINYINT NOT NULL,
+  changes BIGINT UNSIGNED NOT NULL,
+  PRIMARY KEY (id)
+) ENGINE=InnoDB;
+
+INSERT IGNORE INTO english_term_changes (id, changes) VALUES (1, 0);
+
 SET @en_id = UUID();
 SET @m_id  = UUID();
 SET @es_id = UUID();
@@ -60,8 +71,9 @@ SET @ex1   = UUID();
 SET @ex2   = UUID();
 
 INSERT INTO english_term (id, lemma, pos) VALUES (@en_id, 'lesion', 'noun');
+UPDATE english_term_changes SET changes = changes + 1 WHERE id = 1;
 INSERT INTO meaning (id, description) VALUES (@m_id, 'Pathological change; abnormal tissue');
-INSERT INTO spanish_term (id, term, gender) VALUES (@es_id, 'lesión', 'f');
+INSERT INTO spanish_term (id, term, term_key, gender) VALUES (@es_id, 'lesión', 'lesion', 'f');
 INSERT INTO meaning_english (meaning_id, english_term_id) VALUES (@m_id, @en_id);
 INSERT INTO meaning_spanish (meaning_id, spanish_term_id) VALUES (@m_id, @es_id);
 INSERT INTO example (id, meaning_id, language, text) VALUES
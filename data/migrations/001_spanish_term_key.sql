@@ -0,0 +1,8 @@
+-- Accent- and case-folded copy of spanish_term.term for indexed reverse
+-- lookups. Fill existing rows afterwards with:
+--   python -m tools.backfill_term_keys
+USE medical;
+
+ALTER TABLE spanish_term
+  ADD COLUMN term_key NVARCHAR(100) NOT NULL DEFAULT '' AFTER term,
+  ADD KEY idx_spanish_term_key (term_key);
@@ -0,0 +1,12 @@
+-- Counter of English lemmas added and deleted, read by the lemma filter's
+-- staleness check. The repositories bump it in the same transaction as the
+-- write, so it moves on every change, unlike COUNT(*) and MAX(id).
+USE medical;
+
+CREATE TABLE IF NOT EXISTS english_term_changes (
+  id TINYINT NOT NULL,
+  changes BIGINT UNSIGNED NOT NULL,
+  PRIMARY KEY (id)
+) ENGINE=InnoDB;
+
+INSERT IGNORE INTO english_term_changes (id, changes) VALUES (1, 0);
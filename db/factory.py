@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Optional
+
+from .repository import Repository
+
+BACKENDS = ("mysql", "sqlite", "memory", "snapshot")
+
+
+def create_repository(backend: Optional[str] = None, **options: Any) -> Repository:
+    """Build the repository named by ``backend`` or ``$DICTIONARY_BACKEND``.
+
+    Drivers are imported lazily so a SQLite or in-memory deployment does not
+    need mysql-connector installed.
+    """
+    backend = (backend or os.getenv("DICTIONARY_BACKEND", "mysql")).lower()
+    if backend == "mysql":
+        from .mysql_repository import MysqlRepository
+        return MysqlRepository(**options)
+    if backend == "sqlite":
+        from .sqlite_repository import SqliteRepository
+        return SqliteRepository(**options)
+    if backend == "memory":
+        from .memory_repository import InMemoryRepository
+        return InMemoryRepository(**options)
+    if backend == "snapshot":
+        from .snapshot import SnapshotRepository
+        return SnapshotRepository(**options)
+    raise ValueError(f"unknown repository backend {backend!r}; expected one of {BACKENDS}")
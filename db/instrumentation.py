@@ -0,0 +1,241 @@
+"""Query-level instrumentation for the SQL repositories.
+
+While instrumentation is enabled, ``SqlRepository`` wraps each cursor it
+hands out in ``InstrumentedCursor``. The wrapper counts connections
+checked out, queries executed and rows fetched, and times pool waits and
+queries. These counts go to two places:
+
+- process-wide totals and a query-latency histogram (``totals``);
+- the ``QueryStats`` of the current request, if the caller opened one
+  with ``track()``. The stats live in a ``ContextVar``, so each thread and
+  each asyncio task sees only its own request.
+
+Queries slower than ``SLOW_QUERY_MS`` (default 200) are logged to the
+``db.instrumentation`` logger. ``METRICS_ENABLED=0`` or
+``set_enabled(False)`` turns all of this off. Cursors are then not
+wrapped at all.
+"""
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+enabled = os.getenv("METRICS_ENABLED", "1") != "0"
+slow_query_seconds = float(os.getenv("SLOW_QUERY_MS", "200")) / 1000
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def set_enabled(value: bool) -> None:
+    global enabled
+    enabled = value
+
+
+def set_slow_query_ms(ms: float) -> None:
+    global slow_query_seconds
+    slow_query_seconds = ms / 1000
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(
+        self, buckets: Sequence[float] = LATENCY_BUCKETS, lock: Optional[threading.Lock] = None
+    ) -> None:
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        # Histograms updated together can share a lock; the owner then takes
+        # it once and calls observe_locked for each.
+        self._lock = lock or threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.observe_locked(value)
+
+    def observe_locked(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sum += value
+
+    def snapshot(self) -> Tuple[List[Tuple[float, int]], int, float]:
+        """``([(upper bound, cumulative count), ...], count, sum)``; the last
+        bound is ``inf``."""
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, running = [], 0
+        for bound, n in zip(self.buckets + (float("inf"),), counts):
+            running += n
+            cumulative.append((bound, running))
+        return cumulative, running, total
+
+
+class QueryStats:
+    """Database work done on behalf of one request."""
+
+    __slots__ = (
+        "connections", "queries", "rows",
+        "connect_seconds", "query_seconds", "held_seconds", "serialize_seconds",
+    )
+
+    def __init__(self) -> None:
+        self.connections = self.queries = self.rows = 0
+        self.connect_seconds = self.query_seconds = 0.0
+        self.held_seconds = self.serialize_seconds = 0.0
+
+    @property
+    def hydrate_seconds(self) -> float:
+        # Time a connection was held without a query running: decoding rows
+        # and building the entry graph.
+        return max(0.0, self.held_seconds - self.query_seconds)
+
+
+class _Totals:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.queries = 0
+        self.rows = 0
+        self.slow_queries = 0
+        self.query_seconds = Histogram(lock=self._lock)
+
+    def query(self, seconds: float, slow: bool) -> None:
+        with self._lock:
+            self.queries += 1
+            self.slow_queries += slow
+            self.query_seconds.observe_locked(seconds)
+
+    def add(self, connections: int = 0, queries: int = 0, rows: int = 0, slow: int = 0) -> None:
+        with self._lock:
+            self.connections += connections
+            self.queries += queries
+            self.rows += rows
+            self.slow_queries += slow
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "connections": self.connections,
+                "queries": self.queries,
+                "rows": self.rows,
+                "slow_queries": self.slow_queries,
+            }
+
+
+totals = _Totals()
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def bind(stats: QueryStats) -> Token:
+    """Make ``stats`` the current request's; undo with ``unbind(token)``."""
+    return _current.set(stats)
+
+
+def unbind(token: Token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def track() -> Iterator[QueryStats]:
+    """Collect the queries run inside the block into a fresh ``QueryStats``."""
+    stats = QueryStats()
+    token = bind(stats)
+    try:
+        yield stats
+    finally:
+        unbind(token)
+
+
+def record_checkout(waited: float, held: float) -> None:
+    """One pool checkout: ``waited`` seconds to get the connection, then
+    ``held`` seconds of work on it."""
+    totals.add(connections=1)
+    stats = _current.get()
+    if stats is not None:
+        stats.connections += 1
+        stats.connect_seconds += waited
+        stats.held_seconds += held
+
+
+@contextmanager
+def serializing() -> Iterator[None]:
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serialize_seconds += time.perf_counter() - started
+
+
+def _short_sql(sql: str, limit: int = 300) -> str:
+    sql = " ".join(sql.split())
+    return sql if len(sql) <= limit else sql[:limit] + "..."
+
+
+class InstrumentedCursor:
+    """DB-API cursor proxy that times ``execute`` and counts fetched rows."""
+
+    __slots__ = ("_cur",)
+
+    def __init__(self, cur) -> None:
+        self._cur = cur
+
+    def _timed(self, method, sql: str, params) -> object:
+        started = time.perf_counter()
+        try:
+            return method(sql, params)
+        finally:
+            elapsed = time.perf_counter() - started
+            slow = elapsed >= slow_query_seconds
+            totals.query(elapsed, slow)
+            stats = _current.get()
+            if stats is not None:
+                stats.queries += 1
+                stats.query_seconds += elapsed
+            if slow:
+                logger.warning("slow query (%.1f ms): %s", elapsed * 1000, _short_sql(sql))
+
+    def execute(self, sql: str, params=()):
+        return self._timed(self._cur.execute, sql, params)
+
+    def executemany(self, sql: str, seq_of_params):
+        return self._timed(self._cur.executemany, sql, seq_of_params)
+
+    def _fetched(self, rows, started: float):
+        n = len(rows) if isinstance(rows, list) else int(rows is not None)
+        elapsed = time.perf_counter() - started
+        totals.add(rows=n)
+        stats = _current.get()
+        if stats is not None:
+            stats.rows += n
+            stats.query_seconds += elapsed
+        return rows
+
+    def fetchone(self):
+        started = time.perf_counter()
+        return self._fetched(self._cur.fetchone(), started)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        return self._fetched(self._cur.fetchall(), started)
+
+    def fetchmany(self, *args):
+        started = time.perf_counter()
+        return self._fetched(self._cur.fetchmany(*args), started)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
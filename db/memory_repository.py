@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from .repository import Repository
+from models import (
+    EnglishTerm,
+    Meaning,
+    SpanishTerm,
+    Example,
+    PartOfSpeech,
+    Gender,
+)
+from models.text import description_key, fold
+
+
+class InMemoryRepository(Repository):
+    """Repository kept in indexed dicts, mirroring the tables of init.sql.
+
+    Rows are stored as plain tuples and every load hydrates fresh model
+    objects, so callers can't mutate the stored data through a result.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._english: Dict[str, Tuple[UUID, str, str]] = {}
+        self._english_keys: Dict[UUID, str] = {}
+        self._spanish: Dict[str, Tuple[UUID, str, str]] = {}
+        self._spanish_keys: Dict[UUID, str] = {}
+        self._meanings: Dict[UUID, str] = {}
+        self._examples: Dict[UUID, Dict[UUID, Tuple[str, str]]] = {}
+        self._meaning_english: Dict[UUID, Dict[UUID, None]] = {}
+        self._english_meanings: Dict[UUID, Dict[UUID, None]] = {}
+        self._meaning_spanish: Dict[UUID, Dict[UUID, None]] = {}
+        self._spanish_meanings: Dict[UUID, Dict[UUID, None]] = {}
+        self._spanish_folds: Dict[str, Set[str]] = {}
+        self._sorted_keys: Dict[str, List[str]] = {}
+        self._english_changes = 0
+
+    def bootstrap_if_needed(self) -> None:
+        if self.load_english_term("lesion"):
+            return
+        et = EnglishTerm(term="lesion", pos=PartOfSpeech.NOUN)
+        m = Meaning(description="Pathological change; abnormal tissue", english_term=et)
+        es = SpanishTerm(term="lesión", gender=Gender.FEMININE, meaning=m)
+        ex1 = Example(language="en", text="The MRI showed a brain lesion.", meaning=m)
+        ex2 = Example(language="es", text="La resonancia mostró una lesión cerebral.", meaning=m)
+        self.persist_entry_graph(et, m, es, [ex1, ex2])
+
+    def load_english_term(self, lemma: str) -> Optional[EnglishTerm]:
+        with self._lock:
+            row = self._english.get(lemma.casefold())
+            return self._hydrate(row) if row else None
+
+    def load_english_terms(self, lemmas: Iterable[str]) -> Dict[str, EnglishTerm]:
+        with self._lock:
+            found: Dict[str, EnglishTerm] = {}
+            for lemma in lemmas:
+                row = self._english.get(lemma.casefold())
+                if row and row[1] not in found:
+                    found[row[1]] = self._hydrate(row)
+            return found
+
+    def load_spanish_term(self, term: str) -> List[EnglishTerm]:
+        with self._lock:
+            meanings_by_term: Dict[UUID, Dict[UUID, None]] = {}
+            for key in self._spanish_folds.get(fold(term), ()):
+                sid = self._spanish[key][0]
+                for mid in self._spanish_meanings.get(sid, ()):
+                    for en_id in self._meaning_english.get(mid, ()):
+                        meanings_by_term.setdefault(en_id, {})[mid] = None
+            return [
+                self._hydrate(self._english[self._english_keys[en_id]], mids)
+                for en_id, mids in meanings_by_term.items()
+            ]
+
+    def _hydrate(
+        self, row: Tuple[UUID, str, str], meaning_ids: Optional[Iterable[UUID]] = None
+    ) -> EnglishTerm:
+        et_id, lemma, pos = row
+        et = EnglishTerm(term=lemma, pos=PartOfSpeech(pos), term_id=et_id)
+        if meaning_ids is None:
+            meaning_ids = self._english_meanings.get(et_id, ())
+        for mid in meaning_ids:
+            m = Meaning(description=self._meanings[mid], english_term=et, meaning_id=mid)
+            for sid in self._meaning_spanish.get(mid, ()):
+                _, term, gender = self._spanish[self._spanish_keys[sid]]
+                SpanishTerm(term=term, gender=Gender(gender), meaning=m, term_id=sid)
+            for ex_id, (lang, text) in self._examples.get(mid, {}).items():
+                Example(language=lang, text=text, meaning=m, example_id=ex_id)
+        return et
+
+    def insert_english_term(self, term: EnglishTerm) -> None:
+        with self._lock:
+            self._upsert_english(term)
+
+    def insert_meaning(self, meaning: Meaning) -> None:
+        with self._lock:
+            if meaning.meaning_id in self._meanings:
+                raise ValueError(f"duplicate meaning id {meaning.meaning_id}")
+            self._meanings[meaning.meaning_id] = meaning.description
+
+    def insert_spanish_term(self, term: SpanishTerm) -> None:
+        with self._lock:
+            self._upsert_spanish(term)
+
+    def insert_example(self, example: Example) -> None:
+        with self._lock:
+            self._add_example(example, example.meaning.meaning_id)
+
+    def link_meaning_english(self, meaning_id: UUID, english_term_id: UUID) -> None:
+        with self._lock:
+            if meaning_id not in self._meanings or english_term_id not in self._english_keys:
+                raise ValueError("cannot link unknown meaning or English term")
+            self._meaning_english.setdefault(meaning_id, {})[english_term_id] = None
+            self._english_meanings.setdefault(english_term_id, {})[meaning_id] = None
+
+    def link_meaning_spanish(self, meaning_id: UUID, spanish_term_id: UUID) -> None:
+        with self._lock:
+            if meaning_id not in self._meanings or spanish_term_id not in self._spanish_keys:
+                raise ValueError("cannot link unknown meaning or Spanish term")
+            self._meaning_spanish.setdefault(meaning_id, {})[spanish_term_id] = None
+            self._spanish_meanings.setdefault(spanish_term_id, {})[meaning_id] = None
+
+    def persist_entry_graph(
+        self,
+        english: EnglishTerm,
+        meaning: Meaning,
+        spanish: SpanishTerm,
+        examples: Iterable[Example],
+    ) -> None:
+        with self._lock:
+            if meaning.meaning_id in self._meanings:
+                raise ValueError(f"duplicate meaning id {meaning.meaning_id}")
+            self._upsert_english(english)
+            self._meanings[meaning.meaning_id] = meaning.description
+            self._upsert_spanish(spanish)
+            self.link_meaning_english(meaning.meaning_id, english.term_id)
+            self.link_meaning_spanish(meaning.meaning_id, spanish.term_id)
+            for ex in examples:
+                self._add_example(ex, meaning.meaning_id)
+
+    def persist_entries(self, entries: Sequence[EnglishTerm]) -> List[EnglishTerm]:
+        with self._lock:
+            for et in entries:
+                for m in et.meanings:
+                    if m.meaning_id in self._meanings:
+                        raise ValueError(f"duplicate meaning id {m.meaning_id}")
+            merged: Dict[str, Optional[EnglishTerm]] = {}
+            for et in entries:
+                key = et.term.casefold()
+                # Lemmas stored before or repeated in the batch are returned
+                # hydrated; the rest are returned as submitted.
+                merged[key] = None if key not in merged and key not in self._english else et
+                self._upsert_english(et)
+                for m in et.meanings:
+                    self._meanings[m.meaning_id] = m.description
+                    self.link_meaning_english(m.meaning_id, et.term_id)
+                    for st in m.spanish_terms:
+                        self._upsert_spanish(st)
+                        self.link_meaning_spanish(m.meaning_id, st.term_id)
+                    for ex in m.examples:
+                        self._add_example(ex, m.meaning_id)
+            graphs = {
+                key: self._hydrate(self._english[key]) for key, et in merged.items() if et is not None
+            }
+            return [graphs.get(et.term.casefold(), et) for et in entries]
+
+    def upsert_entry(self, entry: EnglishTerm) -> EnglishTerm:
+        with self._lock:
+            self._upsert_english(entry)
+            existing = {
+                description_key(self._meanings[mid]): mid
+                for mid in self._english_meanings.get(entry.term_id, ())
+            }
+            for m in entry.meanings:
+                mid = existing.get(description_key(m.description))
+                if mid is None:
+                    if m.meaning_id in self._meanings:
+                        raise ValueError(f"duplicate meaning id {m.meaning_id}")
+                    self._meanings[m.meaning_id] = m.description
+                    self.link_meaning_english(m.meaning_id, entry.term_id)
+                    existing[description_key(m.description)] = m.meaning_id
+                else:
+                    m.meaning_id = mid
+                for st in m.spanish_terms:
+                    self._upsert_spanish(st)
+                    self.link_meaning_spanish(m.meaning_id, st.term_id)
+                known = {
+                    (lang, text): ex_id
+                    for ex_id, (lang, text) in self._examples.get(m.meaning_id, {}).items()
+                }
+                for ex in m.examples:
+                    if (ex.language, ex.text) in known:
+                        ex.example_id = known[(ex.language, ex.text)]
+                    else:
+                        self._add_example(ex, m.meaning_id)
+                        known[(ex.language, ex.text)] = ex.example_id
+            return self._hydrate(self._english[entry.term.casefold()])
+
+    def delete_entries_by_english_lemmas(
+        self, lemmas: Iterable[str]
+    ) -> Tuple[List[str], List[str]]:
+        deleted: List[str] = []
+        orphans: List[str] = []
+        with self._lock:
+            for lemma in lemmas:
+                row = self._english.get(lemma.casefold())
+                if row:
+                    deleted.append(row[1])
+                    orphans.extend(self._delete_entry(lemma))
+        return deleted, orphans
+
+    def _delete_entry(self, lemma: str) -> List[str]:
+        row = self._english.pop(lemma.casefold(), None)
+        if not row:
+            return []
+        orphans: List[str] = []
+        en_id = row[0]
+        del self._english_keys[en_id]
+        self._sorted_keys.clear()
+        self._english_changes += 1
+        for mid in self._english_meanings.pop(en_id, {}):
+            owners = self._meaning_english[mid]
+            owners.pop(en_id, None)
+            if owners:
+                continue
+            del self._meaning_english[mid]
+            del self._meanings[mid]
+            self._examples.pop(mid, None)
+            for sid in self._meaning_spanish.pop(mid, {}):
+                linked = self._spanish_meanings[sid]
+                linked.pop(mid, None)
+                if not linked:
+                    del self._spanish_meanings[sid]
+                    key = self._spanish_keys.pop(sid)
+                    orphans.append(self._spanish.pop(key)[1])
+                    folds = self._spanish_folds[fold(key)]
+                    folds.discard(key)
+                    if not folds:
+                        del self._spanish_folds[fold(key)]
+        return orphans
+
+    def english_marker(self) -> Any:
+        with self._lock:
+            return self._english_changes
+
+    def list_terms(
+        self, language: str = "en", after: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[str]:
+        rows = self._english if language == "en" else self._spanish
+        with self._lock:
+            keys = self._sorted_keys.get(language)
+            if keys is None:
+                keys = self._sorted_keys[language] = sorted(rows)
+            start = 0 if after is None else bisect.bisect_right(keys, after.casefold())
+            end = len(keys) if limit is None else start + limit
+            return [rows[key][1] for key in keys[start:end]]
+
+    def _upsert_english(self, term: EnglishTerm) -> None:
+        key = term.term.casefold()
+        existing = self._english.get(key)
+        if existing:
+            term.term_id = existing[0]
+        else:
+            self._english_keys[term.term_id] = key
+            self._sorted_keys.pop("en", None)
+            self._english_changes += 1
+        self._english[key] = (term.term_id, existing[1] if existing else term.term, term.pos.value)
+
+    def _upsert_spanish(self, term: SpanishTerm) -> None:
+        key = term.term.casefold()
+        existing = self._spanish.get(key)
+        if existing:
+            term.term_id = existing[0]
+        else:
+            self._spanish_keys[term.term_id] = key
+            self._spanish_folds.setdefault(fold(key), set()).add(key)
+            self._sorted_keys.pop("es", None)
+        self._spanish[key] = (term.term_id, existing[1] if existing else term.term, term.gender.value)
+
+    def _add_example(self, example: Example, meaning_id: UUID) -> None:
+        if meaning_id not in self._meanings:
+            raise ValueError(f"unknown meaning id {meaning_id}")
+        self._examples.setdefault(meaning_id, {})[example.example_id] = (
+            example.language, example.text,
+        )
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Tuple
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """Bounded pool of DB-API connections.
+
+    Connections are created lazily up to ``size``. A checkout waits at most
+    ``timeout`` seconds for a free slot before raising ``PoolTimeout``.
+    Connections idle longer than ``ping_after`` seconds are pinged before
+    being handed out and replaced if the ping fails.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = 5,
+        timeout: float = 10.0,
+        ping_after: float = 30.0,
+    ) -> None:
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+        self._factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._cond = threading.Condition()
+        self._open = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._created = 0
+        self._discarded = 0
+        self._timeouts = 0
+        self._checkouts = 0
+
+    def acquire(self) -> Any:
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while not self._idle and self._open >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"no connection available within {self.timeout}s "
+                        f"(size={self.size}, in_use={self._in_use})"
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            if self._idle:
+                cn, released_at = self._idle.pop()
+            else:
+                cn, released_at = None, 0.0
+            self._open += 1 if cn is None else 0
+            self._in_use += 1
+            self._checkouts += 1
+
+        try:
+            if cn is None:
+                cn = self._create()
+            elif time.monotonic() - released_at > self.ping_after and not self._alive(cn):
+                self._close(cn)
+                with self._cond:
+                    self._discarded += 1
+                cn = self._create()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return cn
+
+    def release(self, cn: Any, discard: bool = False) -> None:
+        if not discard:
+            try:
+                cn.rollback()
+            except Exception:
+                discard = True
+        if discard:
+            self._close(cn)
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._open -= 1
+                self._discarded += 1
+            else:
+                self._idle.append((cn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        cn = self.acquire()
+        broken = False
+        try:
+            yield cn
+        except Exception:
+            broken = not self._alive(cn, ping=False)
+            raise
+        finally:
+            self.release(cn, discard=broken)
+
+    def close(self) -> None:
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for cn, _ in idle:
+            self._close(cn)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "created": self._created,
+                "discarded": self._discarded,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+            }
+
+    def _create(self) -> Any:
+        cn = self._factory()
+        with self._cond:
+            self._created += 1
+        return cn
+
+    @staticmethod
+    def _alive(cn: Any, ping: bool = True) -> bool:
+        try:
+            if ping and hasattr(cn, "ping"):
+                cn.ping(reconnect=False)
+                return True
+            is_connected = getattr(cn, "is_connected", None)
+            return bool(is_connected()) if is_connected else True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(cn: Any) -> None:
+        try:
+            cn.close()
+        except Exception:
+            pass
@@ -1,12 +1,18 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Optional, Iterable         
+from typing import Any, Optional, Iterable, Dict, List, Sequence, Tuple
 from uuid import UUID
 from models import EnglishTerm, Meaning, SpanishTerm, Example
 
 class Repository(ABC):
     @abstractmethod
     def load_english_term(self, lemma: str) -> Optional[EnglishTerm]: ...
+    @abstractmethod
+    def load_english_terms(self, lemmas: Iterable[str]) -> Dict[str, EnglishTerm]: ...
+    @abstractmethod
+    def load_spanish_term(self, term: str) -> List[EnglishTerm]:
+        """English entries with a meaning linked to ``term``, matched ignoring
+        case and accents. Each entry holds only those linked meanings."""
 
     @abstractmethod
     def insert_english_term(self, term: EnglishTerm) -> None: ...
@@ -32,6 +38,44 @@ class Repository(ABC):
         examples: Iterable[Example],
     ) -> None: ...
 
+    @abstractmethod
+    def persist_entries(self, entries: Sequence[EnglishTerm]) -> List[EnglishTerm]:
+        """Write many entries in one transaction and return, per entry, the
+        lemma's graph: the entry itself for a new lemma, the merged graph when
+        the lemma was already stored or repeats in the batch."""
+
+    @abstractmethod
+    def upsert_entry(self, entry: EnglishTerm) -> EnglishTerm:
+        """Write the entry with all its meanings in one transaction, merging
+        meanings and examples the lemma already has, and return the lemma's
+        merged graph as stored."""
+
+    def upsert_entries(self, entries: Sequence[EnglishTerm]) -> List[EnglishTerm]:
+        """``upsert_entry`` for each entry; SQL backends do them all in one
+        transaction (group commit)."""
+        return [self.upsert_entry(entry) for entry in entries]
+
+
+    def delete_entry_by_english_lemma(self, lemma: str) -> List[str]:
+        """Delete the entry and return the Spanish terms it left orphaned."""
+        return self.delete_entries_by_english_lemmas([lemma])[1]
+
+    @abstractmethod
+    def delete_entries_by_english_lemmas(
+        self, lemmas: Iterable[str]
+    ) -> Tuple[List[str], List[str]]:
+        """Delete every listed entry that exists. Returns the lemmas deleted,
+        as stored, and the Spanish terms left without a meaning."""
+
+    def english_marker(self) -> Any:
+        """A cheap value that changes whenever English lemmas are added or
+        deleted, by this process or another one; None if the backend has no
+        such value."""
+        return None
 
     @abstractmethod
-    def delete_entry_by_english_lemma(self, lemma: str) -> None: ...
+    def list_terms(
+        self, language: str = "en", after: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[str]:
+        """English lemmas (``"en"``) or Spanish terms (``"es"``) in sorted
+        order, starting after ``after`` (keyset pagination)."""
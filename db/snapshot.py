@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from .repository import Repository
+from models import (
+    EnglishTerm,
+    Meaning,
+    SpanishTerm,
+    Example,
+    PartOfSpeech,
+    Gender,
+)
+from models.text import fold
+
+logger = logging.getLogger(__name__)
+
+# Layout, all integers little-endian:
+#
+#   header   MAGIC, format version, entry counts, region offsets, build
+#            time and the CRC-32 of every byte after the header
+#   data     one record per English entry (the whole graph), then one
+#            record per folded Spanish term
+#   keys     UTF-8 index keys
+#   en index fixed-size (key_off, key_len, val_off, val_len) slots sorted
+#            by casefolded lemma
+#   es index same, sorted by accent-folded Spanish term
+#
+# Lookups binary-search an index straight out of the mapping and decode a
+# single record, so opening a snapshot costs one mmap, a header read and
+# (unless disabled) one CRC pass over the file.
+MAGIC = b"MDSNAP\x00\x01"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHHIIQQQQI")
+SLOT = struct.Struct("<QIQI")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_LINK = struct.Struct("<QI16s")
+
+
+class SnapshotError(ValueError):
+    """The file is not a valid snapshot of a supported version."""
+
+
+class ReadOnlyError(Exception):
+    pass
+
+
+def _short(text: str) -> bytes:
+    raw = text.encode("utf-8")
+    return _U16.pack(len(raw)) + raw
+
+
+def _long(text: str) -> bytes:
+    raw = text.encode("utf-8")
+    return _U32.pack(len(raw)) + raw
+
+
+def encode_entry(et: EnglishTerm) -> bytes:
+    parts = [et.term_id.bytes, _short(et.term), _short(et.pos.value), _U16.pack(len(et.meanings))]
+    for m in et.meanings:
+        parts += [m.meaning_id.bytes, _long(m.description), _U16.pack(len(m.spanish_terms))]
+        for st in m.spanish_terms:
+            parts += [st.term_id.bytes, _short(st.term), _short(st.gender.value)]
+        parts.append(_U16.pack(len(m.examples)))
+        for ex in m.examples:
+            parts += [ex.example_id.bytes, _short(ex.language), _long(ex.text)]
+    return b"".join(parts)
+
+
+class _Reader:
+    __slots__ = ("buf", "pos")
+
+    def __init__(self, buf, pos: int) -> None:
+        self.buf = buf
+        self.pos = pos
+
+    def uuid(self) -> UUID:
+        self.pos += 16
+        return UUID(bytes=bytes(self.buf[self.pos - 16:self.pos]))
+
+    def u16(self) -> int:
+        self.pos += 2
+        return _U16.unpack_from(self.buf, self.pos - 2)[0]
+
+    def short(self) -> str:
+        n = self.u16()
+        self.pos += n
+        return bytes(self.buf[self.pos - n:self.pos]).decode("utf-8")
+
+    def long(self) -> str:
+        n = _U32.unpack_from(self.buf, self.pos)[0]
+        self.pos += 4 + n
+        return bytes(self.buf[self.pos - n:self.pos]).decode("utf-8")
+
+
+def decode_entry(buf, offset: int, meaning_ids: Optional[set] = None) -> EnglishTerm:
+    r = _Reader(buf, offset)
+    et = EnglishTerm(term_id=r.uuid(), term=r.short(), pos=PartOfSpeech(r.short()))
+    for _ in range(r.u16()):
+        mid = r.uuid()
+        description = r.long()
+        keep = meaning_ids is None or mid in meaning_ids
+        m = Meaning(description=description, english_term=et, meaning_id=mid) if keep else None
+        for _ in range(r.u16()):
+            sid, term, gender = r.uuid(), r.short(), r.short()
+            if keep:
+                SpanishTerm(term=term, gender=Gender(gender), meaning=m, term_id=sid)
+        for _ in range(r.u16()):
+            ex_id, language, text = r.uuid(), r.short(), r.long()
+            if keep:
+                Example(language=language, text=text, meaning=m, example_id=ex_id)
+    return et
+
+
+def write_snapshot(entries: Iterable[EnglishTerm], path: str) -> Dict[str, int]:
+    """Write ``entries`` to ``path`` atomically.
+
+    The file is built next to ``path`` and renamed over it, so a reader
+    that already mapped the old snapshot keeps a consistent view.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    try:
+        with os.fdopen(fd, "w+b") as f:
+            stats = _write(entries, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return stats
+
+
+def _write(entries: Iterable[EnglishTerm], f: BinaryIO) -> Dict[str, int]:
+    crc = 0
+    pos = HEADER.size
+
+    def put(chunk: bytes) -> int:
+        nonlocal crc, pos
+        f.write(chunk)
+        crc = zlib.crc32(chunk, crc)
+        start, pos = pos, pos + len(chunk)
+        return start
+
+    f.write(b"\x00" * HEADER.size)
+    english: Dict[bytes, Tuple[int, int]] = {}
+    spanish: Dict[bytes, Tuple[Dict[str, None], List[Tuple[int, int, bytes]]]] = {}
+    for et in entries:
+        key = et.term.casefold().encode("utf-8")
+        if key in english:
+            continue
+        record = encode_entry(et)
+        offset = put(record)
+        english[key] = (offset, len(record))
+        for m in et.meanings:
+            for st in m.spanish_terms:
+                terms, links = spanish.setdefault(fold(st.term).encode("utf-8"), ({}, []))
+                terms[st.term] = None
+                links.append((offset, len(record), m.meaning_id.bytes))
+
+    es_values: Dict[bytes, Tuple[int, int]] = {}
+    for key, (terms, links) in spanish.items():
+        record = b"".join(
+            [_U16.pack(len(terms)), *(_short(t) for t in terms), _U32.pack(len(links))]
+            + [_LINK.pack(*link) for link in links]
+        )
+        es_values[key] = (put(record), len(record))
+
+    data_end = pos
+    slots = {}
+    for name, values in (("en", english), ("es", es_values)):
+        keys = sorted(values)
+        key_offsets = [put(key) for key in keys]
+        slots[name] = [
+            SLOT.pack(key_off, len(key), *values[key]) for key, key_off in zip(keys, key_offsets)
+        ]
+    en_index = put(b"".join(slots["en"]))
+    es_index = put(b"".join(slots["es"]))
+
+    f.seek(0)
+    f.write(HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, len(english), len(es_values),
+        en_index, es_index, data_end, int(time.time()), crc,
+    ))
+    return {"english": len(english), "spanish": len(es_values), "bytes": pos}
+
+
+class Snapshot:
+    """One opened, validated snapshot file mapped read-only into memory."""
+
+    def __init__(self, path: str, verify: bool = True) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if st.st_size < HEADER.size:
+                raise SnapshotError(f"{path}: too short for a snapshot header")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+        (magic, version, _, self.english_count, self.spanish_count,
+         self._en_index, self._es_index, _, self.built_at, self.checksum) = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise SnapshotError(f"{path}: not a dictionary snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"{path}: unsupported snapshot version {version}")
+        if self._es_index + self.spanish_count * SLOT.size != len(self._map):
+            raise SnapshotError(f"{path}: truncated snapshot")
+        if verify and zlib.crc32(memoryview(self._map)[HEADER.size:]) != self.checksum:
+            raise SnapshotError(f"{path}: checksum mismatch")
+
+    def _key(self, index: int, i: int) -> bytes:
+        key_off, key_len, _, _ = SLOT.unpack_from(self._map, index + i * SLOT.size)
+        return self._map[key_off:key_off + key_len]
+
+    def _find(self, index: int, count: int, key: bytes) -> Optional[Tuple[int, int]]:
+        i = self._bisect(index, count, key)
+        if i < count:
+            key_off, key_len, val_off, val_len = SLOT.unpack_from(self._map, index + i * SLOT.size)
+            if self._map[key_off:key_off + key_len] == key:
+                return val_off, val_len
+        return None
+
+    def _bisect(self, index: int, count: int, key: bytes, right: bool = False) -> int:
+        keys = _Keys(self, index, count)
+        return bisect.bisect_right(keys, key) if right else bisect.bisect_left(keys, key)
+
+    def english(self, lemma: str) -> Optional[EnglishTerm]:
+        found = self._find(self._en_index, self.english_count, lemma.casefold().encode("utf-8"))
+        return decode_entry(self._map, found[0]) if found else None
+
+    def spanish(self, term: str) -> List[EnglishTerm]:
+        found = self._find(self._es_index, self.spanish_count, fold(term).encode("utf-8"))
+        if not found:
+            return []
+        r = _Reader(self._map, found[0])
+        for _ in range(r.u16()):
+            r.short()
+        n_links = _U32.unpack_from(self._map, r.pos)[0]
+        meanings_by_entry: Dict[int, set] = {}
+        for i in range(n_links):
+            offset, _, mid = _LINK.unpack_from(self._map, r.pos + 4 + i * _LINK.size)
+            meanings_by_entry.setdefault(offset, set()).add(UUID(bytes=mid))
+        return [decode_entry(self._map, offset, mids) for offset, mids in meanings_by_entry.items()]
+
+    def terms(self, language: str, after: Optional[str], limit: Optional[int]) -> List[str]:
+        en = language == "en"
+        index, count = (self._en_index, self.english_count) if en else (self._es_index, self.spanish_count)
+        start = 0
+        if after is not None:
+            key = after.casefold() if en else fold(after)
+            start = self._bisect(index, count, key.encode("utf-8"), right=True)
+        end = count if limit is None else min(count, start + limit)
+        result: List[str] = []
+        for i in range(start, end):
+            _, _, val_off, _ = SLOT.unpack_from(self._map, index + i * SLOT.size)
+            r = _Reader(self._map, val_off)
+            if en:
+                r.uuid()
+                result.append(r.short())
+            else:
+                # Every spelling under a folded key, so keyset paging by
+                # the last term never splits a key across pages.
+                result.extend(r.short() for _ in range(r.u16()))
+        return result
+
+
+class _Keys(Sequence):
+    """Index keys as a lazy sequence, so ``bisect`` can search the mapping."""
+
+    def __init__(self, snapshot: Snapshot, index: int, count: int) -> None:
+        self._snapshot = snapshot
+        self._index = index
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):
+        return self._snapshot._key(self._index, i)
+
+
+class SnapshotRepository(Repository):
+    """Read-only repository serving lookups from a snapshot file.
+
+    Nothing is parsed up front: each lookup binary-searches the mapped
+    index and decodes one record, and the pages are shared through the
+    OS page cache by every process mapping the same file. ``reload``
+    validates a replacement snapshot before swapping it in; lookups
+    already running finish against the old mapping. The header, version
+    and size are always checked. The CRC over the whole file, which reads
+    every page, always runs on ``reload``; on the first open it only runs
+    with ``verify`` (``SNAPSHOT_VERIFY=1``). With a
+    ``reload_interval`` the file is re-checked that often during lookups.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        verify: Optional[bool] = None,
+        reload_interval: Optional[float] = None,
+    ) -> None:
+        self.path = path or os.getenv("SNAPSHOT_PATH", "dictionary.snapshot")
+        if verify is None:
+            verify = os.getenv("SNAPSHOT_VERIFY", "0") == "1"
+        if reload_interval is None:
+            reload_interval = float(os.getenv("SNAPSHOT_RELOAD_INTERVAL", "0"))
+        self.reload_interval = reload_interval
+        self._next_check = time.monotonic() + reload_interval
+        self._lock = threading.Lock()
+        self._snapshot = Snapshot(self.path, verify=verify)
+
+    @property
+    def snapshot(self) -> Snapshot:
+        return self._snapshot
+
+    def reload(self, path: Optional[str] = None) -> bool:
+        """Swap in the snapshot at ``path`` (default: the current path).
+
+        Returns False when the file is unchanged. Raises ``SnapshotError``
+        and keeps serving the current snapshot if the new file is invalid.
+        """
+        with self._lock:
+            path = path or self.path
+            st = os.stat(path)
+            if (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size) == self._snapshot.identity:
+                return False
+            self._snapshot = Snapshot(path)
+            self.path = path
+            return True
+
+    def _current(self) -> Snapshot:
+        if self.reload_interval > 0 and time.monotonic() >= self._next_check:
+            self._next_check = time.monotonic() + self.reload_interval
+            try:
+                self.reload()
+            except (OSError, SnapshotError) as e:
+                logger.warning("keeping snapshot %s: %s", self._snapshot.path, e)
+        return self._snapshot
+
+    def bootstrap_if_needed(self) -> None:
+        pass
+
+    def load_english_term(self, lemma: str) -> Optional[EnglishTerm]:
+        return self._current().english(lemma)
+
+    def load_english_terms(self, lemmas: Iterable[str]) -> Dict[str, EnglishTerm]:
+        snapshot = self._current()
+        found: Dict[str, EnglishTerm] = {}
+        for lemma in lemmas:
+            et = snapshot.english(lemma)
+            if et and et.term not in found:
+                found[et.term] = et
+        return found
+
+    def load_spanish_term(self, term: str) -> List[EnglishTerm]:
+        return self._current().spanish(term)
+
+    def english_marker(self) -> Any:
+        return self._current().identity
+
+    def list_terms(
+        self, language: str = "en", after: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[str]:
+        return self._current().terms(language, after, limit)
+
+    def _read_only(self, *args, **kwargs):
+        raise ReadOnlyError("snapshot repository is read-only")
+
+    insert_english_term = insert_meaning = insert_spanish_term = insert_example = _read_only
+    link_meaning_english = link_meaning_spanish = _read_only
+    persist_entry_graph = persist_entries = upsert_entry = upsert_entries = _read_only
+    delete_entry_by_english_lemma = delete_entries_by_english_lemmas = _read_only
@@ -0,0 +1,709 @@
+from __future__ import annotations
+
+import time
+from abc import abstractmethod
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Optional, Iterable, Iterator, Dict, List, Sequence, Tuple
+from uuid import UUID
+
+from . import instrumentation
+from .pool import ConnectionPool
+from .repository import Repository
+from models import (
+    EnglishTerm,
+    Meaning,
+    SpanishTerm,
+    Example,
+    PartOfSpeech,
+    Gender,
+)
+from models.text import description_key, fold
+
+# Lemmas per transaction in bulk deletes; keeps every IN list under
+# SQLite's historical limit of 999 bound parameters.
+DELETE_CHUNK_SIZE = 200
+
+
+def _merge_into(graph: EnglishTerm, entry: EnglishTerm) -> None:
+    """Attach ``entry``'s meanings, Spanish terms and examples to ``graph``,
+    skipping ids it already holds."""
+    meanings = {m.meaning_id: m for m in graph.meanings}
+    for m in entry.meanings:
+        target = meanings.get(m.meaning_id)
+        if target is None:
+            target = meanings[m.meaning_id] = Meaning(
+                description=m.description, english_term=graph, meaning_id=m.meaning_id
+            )
+        for st in m.spanish_terms:
+            SpanishTerm(term=st.term, gender=st.gender, meaning=target, term_id=st.term_id)
+        for ex in m.examples:
+            Example(language=ex.language, text=ex.text, meaning=target, example_id=ex.example_id)
+
+
+class SqlRepository(Repository):
+    """Repository over a DB-API connection pool using the init.sql schema.
+
+    Statements use ``%s`` placeholders. Subclasses provide the pool, the
+    driver's ``Error`` class and the few dialect-specific clauses.
+    """
+
+    pool: ConnectionPool
+    Error: type = Exception
+    _insert_ignore = "INSERT IGNORE"
+    _TERM_COLUMNS = {"en": ("english_term", "lemma"), "es": ("spanish_term", "term")}
+
+    # Ids are CHAR(36) text unless a subclass stores them as BINARY(16).
+    binary_ids = False
+
+    @staticmethod
+    def _key(text: str) -> str:
+        """The value under which the unique ``lemma`` and ``term`` columns
+        compare equal. MySQL's ``*_ci`` collations ignore case and accents,
+        so "lesion" upserts onto a stored "lesión"."""
+        return fold(text)
+
+    @abstractmethod
+    def _upsert_tail(self, key: str, column: str) -> str:
+        """Clause after an INSERT that updates ``column`` when the row with
+        unique ``key`` already exists."""
+
+    def _id(self, value: UUID):
+        return value.bytes if self.binary_ids else str(value)
+
+    @staticmethod
+    def _uuid(value) -> UUID:
+        # Accepts either storage format, so rows read back correctly while
+        # a database is being converted.
+        if isinstance(value, (bytes, bytearray)):
+            return UUID(bytes=bytes(value))
+        return UUID(value)
+
+    @contextmanager
+    def _cursor(self, commit: bool = False, _cn=None) -> Iterator:
+        if _cn is not None:
+            cur = _cn.cursor()
+            if instrumentation.enabled:
+                cur = instrumentation.InstrumentedCursor(cur)
+            try:
+                yield cur
+                if commit:
+                    _cn.commit()
+            except Exception:
+                _cn.rollback()
+                raise
+            finally:
+                cur.close()
+            return
+        if not instrumentation.enabled:
+            with self.pool.connection() as cn:
+                with self._cursor(commit=commit, _cn=cn) as cur:
+                    yield cur
+            return
+        started = time.perf_counter()
+        with self.pool.connection() as cn:
+            acquired = time.perf_counter()
+            try:
+                with self._cursor(commit=commit, _cn=cn) as cur:
+                    yield cur
+            finally:
+                instrumentation.record_checkout(acquired - started, time.perf_counter() - acquired)
+
+    def pool_stats(self) -> Dict[str, int]:
+        return self.pool.stats()
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def bootstrap_if_needed(self) -> None:
+        with self.pool.connection() as cn:
+            cur = cn.cursor()
+            try:
+                cur.execute("SELECT 1 FROM english_term WHERE lemma=%s", ("lesion",))
+            except self.Error:
+                cur.close()
+                return
+            found = cur.fetchone()
+            cur.close()
+            if not found:
+                et = EnglishTerm(term="lesion", pos=PartOfSpeech.NOUN)
+                m = Meaning(description="Pathological change; abnormal tissue", english_term=et)
+                es = SpanishTerm(term="lesión", gender=Gender.FEMININE, meaning=m)
+                ex1 = Example(language="en", text="The MRI showed a brain lesion.", meaning=m)
+                ex2 = Example(language="es", text="La resonancia mostró una lesión cerebral.", meaning=m)
+                self.persist_entry_graph(et, m, es, [ex1, ex2], _cn=cn)
+
+    def load_english_term(self, lemma: str) -> Optional[EnglishTerm]:
+        with self._cursor() as cur:
+            cur.execute("SELECT id, lemma, pos FROM english_term WHERE lemma=%s", (lemma,))
+            rows = cur.fetchall()
+            if not rows:
+                return None
+            return self._hydrate(cur, rows)[0]
+
+    def load_english_terms(self, lemmas: Iterable[str]) -> Dict[str, EnglishTerm]:
+        wanted = tuple(dict.fromkeys(lemmas))
+        if not wanted:
+            return {}
+        in_clause = ",".join(["%s"] * len(wanted))
+        with self._cursor() as cur:
+            cur.execute(
+                f"SELECT id, lemma, pos FROM english_term WHERE lemma IN ({in_clause})",
+                wanted,
+            )
+            rows = cur.fetchall()
+            if not rows:
+                return {}
+            return {et.term: et for et in self._hydrate(cur, rows)}
+
+    def load_spanish_term(self, term: str) -> List[EnglishTerm]:
+        with self._cursor() as cur:
+            cur.execute(
+                """
+                SELECT et.id, et.lemma, et.pos, ms.meaning_id
+                FROM spanish_term s
+                JOIN meaning_spanish ms ON ms.spanish_term_id = s.id
+                JOIN meaning_english me ON me.meaning_id = ms.meaning_id
+                JOIN english_term et ON et.id = me.english_term_id
+                WHERE s.term_key = %s
+                """,
+                (fold(term),),
+            )
+            rows = cur.fetchall()
+            if not rows:
+                return []
+            term_rows = list({self._uuid(row[0]): row[:3] for row in rows}.values())
+            meaning_ids = [
+                self._id(mid) for mid in dict.fromkeys(self._uuid(row[3]) for row in rows)
+            ]
+            return self._hydrate(cur, term_rows, meaning_ids)
+
+    def _hydrate(
+        self, cur, term_rows, meaning_ids: Optional[Sequence[str]] = None
+    ) -> List[EnglishTerm]:
+        """Build full entry graphs for ``(id, lemma, pos)`` rows.
+
+        Uses one query per child table (meanings, Spanish terms, examples),
+        so the number of round trips does not depend on how many meanings
+        the terms have. ``meaning_ids`` restricts the graphs to those meanings.
+        """
+        terms_by_id: Dict[UUID, EnglishTerm] = {}
+        for et_id, lem, pos in term_rows:
+            et = EnglishTerm(term=lem, pos=PartOfSpeech(pos), term_id=self._uuid(et_id))
+            terms_by_id[et.term_id] = et
+
+        in_clause = ",".join(["%s"] * len(terms_by_id))
+        params = tuple(self._id(et_id) for et_id in terms_by_id)
+        only = ""
+        if meaning_ids is not None:
+            only = f"AND m.id IN ({','.join(['%s'] * len(meaning_ids))})"
+            params += tuple(meaning_ids)
+        cur.execute(
+            f"""
+            SELECT me.english_term_id, m.id, m.description
+            FROM meaning m
+            JOIN meaning_english me ON me.meaning_id = m.id
+            WHERE me.english_term_id IN ({in_clause}) {only}
+            """,
+            params,
+        )
+        meanings_by_id: Dict[UUID, List[Meaning]] = {}
+        for et_id, mid, desc in cur.fetchall():
+            mid = self._uuid(mid)
+            meaning = Meaning(
+                description=desc, english_term=terms_by_id[self._uuid(et_id)], meaning_id=mid
+            )
+            meanings_by_id.setdefault(mid, []).append(meaning)
+
+        if meanings_by_id:
+            ids = tuple(self._id(mid) for mid in meanings_by_id)
+            in_clause = ",".join(["%s"] * len(ids))
+            cur.execute(
+                f"""
+                SELECT ms.meaning_id, s.id, s.term, s.gender
+                FROM meaning_spanish ms
+                JOIN spanish_term s ON s.id = ms.spanish_term_id
+                WHERE ms.meaning_id IN ({in_clause})
+                """,
+                ids,
+            )
+            for m_id, s_id, s_term, s_gender in cur.fetchall():
+                for meaning in meanings_by_id[self._uuid(m_id)]:
+                    SpanishTerm(
+                        term=s_term, gender=Gender(s_gender), meaning=meaning, term_id=self._uuid(s_id)
+                    )
+
+            cur.execute(
+                f"""
+                SELECT meaning_id, id, language, text
+                FROM example
+                WHERE meaning_id IN ({in_clause})
+                """,
+                ids,
+            )
+            for m_id, ex_id, lang, text in cur.fetchall():
+                for meaning in meanings_by_id[self._uuid(m_id)]:
+                    Example(language=lang, text=text, meaning=meaning, example_id=self._uuid(ex_id))
+
+        return list(terms_by_id.values())
+
+    def insert_english_term(self, term: EnglishTerm) -> None:
+        with self._cursor(commit=True) as cur:
+            cur.execute(
+                f"""
+                INSERT INTO english_term (id, lemma, pos)
+                VALUES (%s, %s, %s)
+                {self._upsert_tail("lemma", "pos")}
+                """,
+                (self._id(term.term_id), term.term, term.pos.value),
+            )
+            cur.execute("SELECT id FROM english_term WHERE lemma = %s", (term.term,))
+            self._english_changed(cur, int(self._uuid(cur.fetchone()[0]) == term.term_id))
+
+    def insert_meaning(self, meaning: Meaning) -> None:
+        with self._cursor(commit=True) as cur:
+            cur.execute(
+                "INSERT INTO meaning (id, description) VALUES (%s, %s)",
+                (self._id(meaning.meaning_id), meaning.description),
+            )
+
+    def insert_spanish_term(self, term: SpanishTerm) -> None:
+        with self._cursor(commit=True) as cur:
+            cur.execute(
+                f"""
+                INSERT INTO spanish_term (id, term, term_key, gender)
+                VALUES (%s, %s, %s, %s)
+                {self._upsert_tail("term", "gender")}
+                """,
+                (self._id(term.term_id), term.term, fold(term.term), term.gender.value),
+            )
+
+    def insert_example(self, example: Example) -> None:
+        with self._cursor(commit=True) as cur:
+            cur.execute(
+                """
+                INSERT INTO example (id, language, text, meaning_id)
+                VALUES (%s, %s, %s, %s)
+                """,
+                (
+                    self._id(example.example_id),
+                    example.language,
+                    example.text,
+                    self._id(example.meaning.meaning_id),
+                ),
+            )
+
+    def link_meaning_english(self, meaning_id: UUID, english_term_id: UUID) -> None:
+        with self._cursor(commit=True) as cur:
+            cur.execute(
+                f"""
+                {self._insert_ignore} INTO meaning_english (meaning_id, english_term_id)
+                VALUES (%s, %s)
+                """,
+                (self._id(meaning_id), self._id(english_term_id)),
+            )
+
+    def link_meaning_spanish(self, meaning_id: UUID, spanish_term_id: UUID) -> None:
+        with self._cursor(commit=True) as cur:
+            cur.execute(
+                f"""
+                {self._insert_ignore} INTO meaning_spanish (meaning_id, spanish_term_id)
+                VALUES (%s, %s)
+                """,
+                (self._id(meaning_id), self._id(spanish_term_id)),
+            )
+
+    def persist_entry_graph(
+        self,
+        english: EnglishTerm,
+        meaning: Meaning,
+        spanish: SpanishTerm,
+        examples: Iterable[Example],
+        _cn=None,
+    ) -> None:
+        with self._cursor(commit=True, _cn=_cn) as cur:
+            self._write_graph(cur, english, [(meaning, [spanish], list(examples))], reuse=False)
+
+    def upsert_entry(self, entry: EnglishTerm) -> EnglishTerm:
+        """Write a whole entry in one transaction and return the lemma's
+        merged graph.
+
+        The lemma and Spanish terms are upserted. A meaning whose
+        description matches one the lemma already has is merged into it,
+        and examples it already holds are not written again, so submitting
+        the same entry twice leaves one copy. The graph is built from the
+        rows the merge reads anyway, without a second lookup.
+        """
+        with self._cursor(commit=True) as cur:
+            return self._write_graph(
+                cur, entry, [(m, m.spanish_terms, m.examples) for m in entry.meanings], reuse=True
+            )
+
+    def upsert_entries(self, entries: Sequence[EnglishTerm]) -> List[EnglishTerm]:
+        """Upsert many entries in one transaction: one commit for the batch,
+        with the same merging as ``upsert_entry``. A lemma repeated in the
+        batch is merged like a second submission."""
+        if not entries:
+            return []
+        with self._cursor(commit=True) as cur:
+            return [
+                self._write_graph(
+                    cur, entry, [(m, m.spanish_terms, m.examples) for m in entry.meanings], reuse=True
+                )
+                for entry in entries
+            ]
+
+    def _stored_graphs(self, cur, entries: Sequence[EnglishTerm]) -> Dict[UUID, EnglishTerm]:
+        """The stored meanings of ``entries``' lemmas, with their Spanish
+        terms and examples, keyed by term id. One statement, run inside the
+        caller's transaction."""
+        graphs = {et.term_id: EnglishTerm(term=et.term, pos=et.pos, term_id=et.term_id) for et in entries}
+        ids = tuple(self._id(term_id) for term_id in graphs)
+        marks = self._marks(ids)
+        cur.execute(
+            f"""
+            SELECT me.english_term_id, et.lemma, m.id, m.description, 'ex', ex.id, ex.language, ex.text
+            FROM meaning_english me
+            JOIN english_term et ON et.id = me.english_term_id
+            JOIN meaning m ON m.id = me.meaning_id
+            LEFT JOIN example ex ON ex.meaning_id = m.id
+            WHERE me.english_term_id IN ({marks})
+            UNION ALL
+            SELECT me.english_term_id, et.lemma, m.id, m.description, 'es', s.id, s.term, s.gender
+            FROM meaning_english me
+            JOIN english_term et ON et.id = me.english_term_id
+            JOIN meaning m ON m.id = me.meaning_id
+            JOIN meaning_spanish ms ON ms.meaning_id = m.id
+            JOIN spanish_term s ON s.id = ms.spanish_term_id
+            WHERE me.english_term_id IN ({marks})
+            """,
+            ids + ids,
+        )
+        meanings: Dict[Tuple[UUID, UUID], Meaning] = {}
+        for et_id, lemma, mid, description, kind, child_id, first, second in cur.fetchall():
+            graph = graphs[self._uuid(et_id)]
+            graph.term = lemma
+            key = (graph.term_id, self._uuid(mid))
+            m = meanings.get(key)
+            if m is None:
+                m = meanings[key] = Meaning(description=description, english_term=graph, meaning_id=key[1])
+            if child_id is None:
+                continue
+            if kind == "es":
+                SpanishTerm(term=first, gender=Gender(second), meaning=m, term_id=self._uuid(child_id))
+            else:
+                Example(language=first, text=second, meaning=m, example_id=self._uuid(child_id))
+        return graphs
+
+    def _write_graph(
+        self,
+        cur,
+        english: EnglishTerm,
+        parts: Sequence[Tuple[Meaning, Sequence[SpanishTerm], Sequence[Example]]],
+        reuse: bool,
+    ) -> Optional[EnglishTerm]:
+        """Write one lemma's graph. With ``reuse``, meanings and examples the
+        lemma already has are merged, and the merged graph is returned."""
+        # The upsert locks the lemma's row, so concurrent writers of the same
+        # lemma queue here and see each other's meanings below.
+        submitted = english.term_id
+        cur.execute(
+            f"INSERT INTO english_term (id, lemma, pos) VALUES (%s, %s, %s) "
+            f"{self._upsert_tail('lemma', 'pos')}",
+            (self._id(english.term_id), english.term, english.pos.value),
+        )
+        spanish = {self._key(st.term): st for _, terms, _ in parts for st in terms}
+        if spanish:
+            self._insert_rows(
+                cur,
+                "INSERT INTO spanish_term (id, term, term_key, gender)",
+                [
+                    (self._id(st.term_id), st.term, fold(st.term), st.gender.value)
+                    for st in spanish.values()
+                ],
+                self._upsert_tail("term", "gender"),
+            )
+        cur.execute(
+            "SELECT 'en', id, lemma FROM english_term WHERE lemma = %s "
+            "UNION ALL "
+            f"SELECT 'es', id, term FROM spanish_term WHERE term IN ({self._marks(spanish) or 'NULL'})",
+            (english.term, *(st.term for st in spanish.values())),
+        )
+        # Rows come back in their stored spelling, which can differ from the
+        # submitted one in anything the collation ignores.
+        ids = {(lang, self._key(key)): self._uuid(row_id) for lang, row_id, key in cur.fetchall()}
+        english.term_id = ids[("en", self._key(english.term))]
+        self._english_changed(cur, int(english.term_id == submitted))
+        for _, terms, _ in parts:
+            for st in terms:
+                st.term_id = ids[("es", self._key(st.term))]
+
+        existing: Dict[str, UUID] = {}
+        known_examples: Dict[Tuple[UUID, str, str], UUID] = {}
+        graph = None
+        if reuse:
+            graph = self._stored_graphs(cur, [english])[english.term_id]
+            for m in graph.meanings:
+                existing.setdefault(description_key(m.description), m.meaning_id)
+                for ex in m.examples:
+                    known_examples[(m.meaning_id, ex.language, ex.text)] = ex.example_id
+
+        meanings, links_en, links_es, examples = [], [], [], []
+        for meaning, terms, exs in parts:
+            mid = existing.get(description_key(meaning.description)) if reuse else None
+            if mid is None:
+                meanings.append((self._id(meaning.meaning_id), meaning.description))
+                links_en.append((self._id(meaning.meaning_id), self._id(english.term_id)))
+                if reuse:
+                    existing[description_key(meaning.description)] = meaning.meaning_id
+            else:
+                meaning.meaning_id = mid
+            for st in terms:
+                links_es.append((self._id(meaning.meaning_id), self._id(st.term_id)))
+            for ex in exs:
+                if reuse:
+                    example_key = (meaning.meaning_id, ex.language, ex.text)
+                    if example_key in known_examples:
+                        ex.example_id = known_examples[example_key]
+                        continue
+                    known_examples[example_key] = ex.example_id
+                examples.append(
+                    (self._id(ex.example_id), ex.language, ex.text, self._id(meaning.meaning_id))
+                )
+
+        self._insert_rows(cur, "INSERT INTO meaning (id, description)", meanings)
+        self._insert_rows(
+            cur, f"{self._insert_ignore} INTO meaning_english (meaning_id, english_term_id)", links_en
+        )
+        self._insert_rows(
+            cur, f"{self._insert_ignore} INTO meaning_spanish (meaning_id, spanish_term_id)", links_es
+        )
+        self._insert_rows(cur, "INSERT INTO example (id, language, text, meaning_id)", examples)
+        if graph is not None:
+            _merge_into(graph, english)
+        return graph
+
+    def persist_entries(self, entries: Sequence[EnglishTerm]) -> List[EnglishTerm]:
+        """Write many entry graphs in a single transaction.
+
+        English lemmas and Spanish terms that occur more than once, in the
+        batch or in the database, resolve to one row. Each table is written
+        with one multi-row statement, so the number of round trips does not
+        depend on the batch size. Lemmas that were already stored cost one
+        more statement, which reads their meanings for the returned graphs.
+        """
+        if not entries:
+            return []
+        english: Dict[str, EnglishTerm] = {}
+        spanish: Dict[str, SpanishTerm] = {}
+        for et in entries:
+            english[self._key(et.term)] = et
+            for m in et.meanings:
+                for st in m.spanish_terms:
+                    spanish[self._key(st.term)] = st
+
+        with self._cursor(commit=True) as cur:
+            self._insert_rows(
+                cur,
+                "INSERT INTO english_term (id, lemma, pos)",
+                [(self._id(et.term_id), et.term, et.pos.value) for et in english.values()],
+                self._upsert_tail("lemma", "pos"),
+            )
+            english_ids = self._ids_by_key(
+                cur, "SELECT id, lemma FROM english_term WHERE lemma IN ({})",
+                [et.term for et in english.values()],
+            )
+            # A row that kept another id than the one submitted was already there.
+            stored = [
+                et for et in english.values() if english_ids[self._key(et.term)] != et.term_id
+            ]
+            for et in entries:
+                et.term_id = english_ids[self._key(et.term)]
+            graphs = self._stored_graphs(cur, stored) if stored else {}
+            self._english_changed(cur, len(english) - len(stored))
+            if spanish:
+                self._insert_rows(
+                    cur,
+                    "INSERT INTO spanish_term (id, term, term_key, gender)",
+                    [
+                        (self._id(st.term_id), st.term, fold(st.term), st.gender.value)
+                        for st in spanish.values()
+                    ],
+                    self._upsert_tail("term", "gender"),
+                )
+                spanish_ids = self._ids_by_key(
+                    cur, "SELECT id, term FROM spanish_term WHERE term IN ({})",
+                    [st.term for st in spanish.values()],
+                )
+
+            meanings, links_en, links_es, examples = [], [], [], []
+            for et in entries:
+                for m in et.meanings:
+                    meanings.append((self._id(m.meaning_id), m.description))
+                    links_en.append((self._id(m.meaning_id), self._id(et.term_id)))
+                    for st in m.spanish_terms:
+                        st.term_id = spanish_ids[self._key(st.term)]
+                        links_es.append((self._id(m.meaning_id), self._id(st.term_id)))
+                    for ex in m.examples:
+                        examples.append(
+                            (self._id(ex.example_id), ex.language, ex.text, self._id(m.meaning_id))
+                        )
+
+            self._insert_rows(cur, "INSERT INTO meaning (id, description)", meanings)
+            self._insert_rows(
+                cur, f"{self._insert_ignore} INTO meaning_english (meaning_id, english_term_id)", links_en
+            )
+            self._insert_rows(
+                cur, f"{self._insert_ignore} INTO meaning_spanish (meaning_id, spanish_term_id)", links_es
+            )
+            self._insert_rows(
+                cur, "INSERT INTO example (id, language, text, meaning_id)", examples
+            )
+
+        # A new lemma written once is stored exactly as submitted.
+        counts = Counter(et.term_id for et in entries)
+        merged: List[EnglishTerm] = []
+        for et in entries:
+            if counts[et.term_id] == 1 and et.term_id not in graphs:
+                merged.append(et)
+                continue
+            graph = graphs.get(et.term_id)
+            if graph is None:
+                graph = graphs[et.term_id] = EnglishTerm(term=et.term, pos=et.pos, term_id=et.term_id)
+            _merge_into(graph, et)
+            merged.append(graph)
+        return merged
+
+    @staticmethod
+    def _insert_rows(cur, head: str, rows: Sequence[tuple], tail: str = "") -> None:
+        if not rows:
+            return
+        row = "(" + ",".join(["%s"] * len(rows[0])) + ")"
+        params = [value for r in rows for value in r]
+        cur.execute(f"{head} VALUES {','.join([row] * len(rows))} {tail}", params)
+
+    def _ids_by_key(self, cur, sql: str, keys: Sequence[str]) -> Dict[str, UUID]:
+        cur.execute(sql.format(",".join(["%s"] * len(keys))), tuple(keys))
+        return {self._key(key): self._uuid(row_id) for row_id, key in cur.fetchall()}
+
+    def delete_entries_by_english_lemmas(
+        self, lemmas: Iterable[str], chunk_size: int = DELETE_CHUNK_SIZE
+    ) -> Tuple[List[str], List[str]]:
+        """Delete many entries, ``chunk_size`` lemmas per transaction.
+
+        Each chunk runs the same five statements however many meanings the
+        entries have. Meanings linked only to deleted lemmas are removed and
+        ``ON DELETE CASCADE`` takes their examples and links with them;
+        meanings shared with a surviving lemma lose only the deleted link.
+        """
+        lemmas = list(dict.fromkeys(lemmas))
+        deleted: List[str] = []
+        orphans: List[str] = []
+        for start in range(0, len(lemmas), chunk_size):
+            chunk = lemmas[start:start + chunk_size]
+            with self._cursor(commit=True) as cur:
+                found, chunk_orphans = self._delete_chunk(cur, chunk)
+            deleted.extend(found)
+            orphans.extend(chunk_orphans)
+        return deleted, orphans
+
+    def _delete_chunk(self, cur, lemmas: Sequence[str]) -> Tuple[List[str], List[str]]:
+        cur.execute(
+            f"SELECT id, lemma FROM english_term WHERE lemma IN ({self._marks(lemmas)})",
+            tuple(lemmas),
+        )
+        rows = cur.fetchall()
+        if not rows:
+            return [], []
+        en_ids = tuple(row_id for row_id, _ in rows)
+        marks = self._marks(en_ids)
+        # Meanings with no link to an English term outside this chunk.
+        owned = f"""
+            SELECT me.meaning_id FROM meaning_english me
+            WHERE me.english_term_id IN ({marks})
+            AND NOT EXISTS (
+                SELECT 1 FROM meaning_english o
+                WHERE o.meaning_id = me.meaning_id
+                AND o.english_term_id NOT IN ({marks})
+            )
+        """
+        # Spanish terms whose every meaning is about to go.
+        cur.execute(
+            f"""
+            SELECT st.id, st.term FROM spanish_term st
+            WHERE st.id IN (
+                SELECT ms.spanish_term_id FROM meaning_spanish ms
+                WHERE ms.meaning_id IN ({owned})
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM meaning_spanish ms
+                WHERE ms.spanish_term_id = st.id
+                AND ms.meaning_id NOT IN ({owned})
+            )
+            """,
+            en_ids * 4,
+        )
+        orphans = cur.fetchall()
+        cur.execute(f"DELETE FROM meaning WHERE id IN ({owned})", en_ids * 2)
+        cur.execute(f"DELETE FROM english_term WHERE id IN ({marks})", en_ids)
+        self._english_changed(cur, len(en_ids))
+        if orphans:
+            cur.execute(
+                f"DELETE FROM spanish_term WHERE id IN ({self._marks(orphans)})",
+                tuple(sid for sid, _ in orphans),
+            )
+        return [lemma for _, lemma in rows], [term for _, term in orphans]
+
+    @staticmethod
+    def _marks(values: Sequence) -> str:
+        return ",".join(["%s"] * len(values))
+
+    def backfill_spanish_term_keys(self, batch_size: int = 1000) -> int:
+        updated = 0
+        while True:
+            with self._cursor(commit=True) as cur:
+                cur.execute(
+                    "SELECT id, term FROM spanish_term WHERE term_key = '' LIMIT %s",
+                    (batch_size,),
+                )
+                rows = cur.fetchall()
+                for sid, term in rows:
+                    cur.execute(
+                        "UPDATE spanish_term SET term_key = %s WHERE id = %s",
+                        (fold(term) or term, sid),
+                    )
+            updated += len(rows)
+            if len(rows) < batch_size:
+                return updated
+
+    @staticmethod
+    def _english_changed(cur, rows: int) -> None:
+        # Bumped inside the writing transaction, so the counter moves exactly
+        # when the added or deleted lemmas become visible.
+        if rows:
+            cur.execute(
+                "UPDATE english_term_changes SET changes = changes + %s WHERE id = 1", (rows,)
+            )
+
+    def english_marker(self) -> Any:
+        with self._cursor() as cur:
+            cur.execute("SELECT changes FROM english_term_changes WHERE id = 1")
+            row = cur.fetchone()
+            return row[0] if row else None
+
+    def list_terms(
+        self, language: str = "en", after: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[str]:
+        table, column = self._TERM_COLUMNS[language]
+        sql = f"SELECT {column} FROM {table}"
+        params: tuple = ()
+        if after is not None:
+            sql += f" WHERE {column} > %s"
+            params = (after,)
+        sql += f" ORDER BY {column}"
+        if limit is not None:
+            sql += " LIMIT %s"
+            params += (int(limit),)
+        with self._cursor() as cur:
+            cur.execute(sql, params)
+            return [term for (term,) in cur.fetchall()]
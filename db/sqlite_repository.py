@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import string
+from typing import Optional
+
+from models.text import fold
+from .pool import ConnectionPool
+from .sql_repository import SqlRepository
+
+# Same tables, keys and cascades as data/init.sql. Lemmas and Spanish terms
+# compare case-insensitively like the MySQL *_ci collations, but NOCASE
+# folds ASCII only and keeps accents: "lesión" and "LESIÓN" are two rows.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS english_term (
+  id CHAR(36) NOT NULL PRIMARY KEY,
+  lemma VARCHAR(100) NOT NULL COLLATE NOCASE,
+  pos VARCHAR(20) NOT NULL,
+  CONSTRAINT uq_lemma UNIQUE (lemma)
+);
+
+CREATE TABLE IF NOT EXISTS spanish_term (
+  id CHAR(36) NOT NULL PRIMARY KEY,
+  term VARCHAR(100) NOT NULL COLLATE NOCASE,
+  term_key VARCHAR(100) NOT NULL DEFAULT '',
+  gender VARCHAR(10) NOT NULL,
+  CONSTRAINT uq_spanish_term UNIQUE (term)
+);
+
+CREATE TABLE IF NOT EXISTS meaning (
+  id CHAR(36) NOT NULL PRIMARY KEY,
+  description TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS example (
+  id CHAR(36) NOT NULL PRIMARY KEY,
+  meaning_id CHAR(36) NOT NULL REFERENCES meaning(id) ON DELETE CASCADE,
+  language CHAR(2) NOT NULL,
+  text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fk_example_meaning ON example (meaning_id);
+
+CREATE TABLE IF NOT EXISTS meaning_english (
+  meaning_id CHAR(36) NOT NULL REFERENCES meaning(id) ON DELETE CASCADE,
+  english_term_id CHAR(36) NOT NULL REFERENCES english_term(id) ON DELETE CASCADE,
+  PRIMARY KEY (meaning_id, english_term_id)
+);
+CREATE INDEX IF NOT EXISTS fk_me_et ON meaning_english (english_term_id);
+
+CREATE TABLE IF NOT EXISTS meaning_spanish (
+  meaning_id CHAR(36) NOT NULL REFERENCES meaning(id) ON DELETE CASCADE,
+  spanish_term_id CHAR(36) NOT NULL REFERENCES spanish_term(id) ON DELETE CASCADE,
+  PRIMARY KEY (meaning_id, spanish_term_id)
+);
+CREATE INDEX IF NOT EXISTS fk_ms_st ON meaning_spanish (spanish_term_id);
+
+CREATE TABLE IF NOT EXISTS english_term_changes (
+  id INTEGER NOT NULL PRIMARY KEY,
+  changes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO english_term_changes (id, changes) VALUES (1, 0);
+"""
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_spanish_term_key ON spanish_term (term_key);
+"""
+
+
+class _Cursor:
+    """sqlite3 cursor that accepts the ``%s`` placeholders used by SqlRepository."""
+
+    def __init__(self, cur: sqlite3.Cursor) -> None:
+        self._cur = cur
+
+    def execute(self, sql: str, params=()):
+        return self._cur.execute(sql.replace("%s", "?"), tuple(params))
+
+    def executemany(self, sql: str, seq_of_params):
+        return self._cur.executemany(sql.replace("%s", "?"), seq_of_params)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+class _Connection:
+    def __init__(self, cn: sqlite3.Connection) -> None:
+        self._cn = cn
+
+    def cursor(self) -> _Cursor:
+        return _Cursor(self._cn.cursor())
+
+    def __getattr__(self, name):
+        return getattr(self._cn, name)
+
+
+class SqliteRepository(SqlRepository):
+    Error = sqlite3.Error
+    _insert_ignore = "INSERT OR IGNORE"
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        pool_timeout: Optional[float] = None,
+        binary_ids: bool = False,
+    ) -> None:
+        # SQLite stores whatever it is given, so 16-byte ids need no schema
+        # change; only use this on a new database.
+        self.binary_ids = binary_ids
+        self.path = path or os.getenv("SQLITE_PATH", "medical.sqlite3")
+        if self.path == ":memory:":
+            # Every connection to ":memory:" is a separate database.
+            pool_size = 1
+        self.pool = ConnectionPool(
+            self._connect,
+            size=int(pool_size or os.getenv("SQLITE_POOL_SIZE", "4")),
+            timeout=float(pool_timeout or os.getenv("SQLITE_POOL_TIMEOUT", "10")),
+        )
+        with self.pool.connection() as cn:
+            cn.executescript(SCHEMA)
+            self._migrate(cn)
+            cn.executescript(INDEXES)
+
+    @staticmethod
+    def _migrate(cn) -> None:
+        columns = {row[1] for row in cn.execute("PRAGMA table_info(spanish_term)")}
+        if "term_key" not in columns:
+            cn.execute("ALTER TABLE spanish_term ADD COLUMN term_key VARCHAR(100) NOT NULL DEFAULT ''")
+        rows = cn.execute("SELECT id, term FROM spanish_term WHERE term_key = ''").fetchall()
+        cn.executemany(
+            "UPDATE spanish_term SET term_key = ? WHERE id = ?",
+            [(fold(term), sid) for sid, term in rows],
+        )
+        cn.commit()
+
+    def _connect(self) -> _Connection:
+        cn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        cn.execute("PRAGMA foreign_keys = ON")
+        if self.path != ":memory:":
+            cn.execute("PRAGMA journal_mode = WAL")
+        return _Connection(cn)
+
+    @staticmethod
+    def _key(text: str) -> str:
+        # NOCASE folds ASCII letters only: "LESIÓN" and "lesión" are
+        # different rows here, unlike on MySQL.
+        return text.translate(_ASCII_LOWER)
+
+    def _upsert_tail(self, key: str, column: str) -> str:
+        return f"ON CONFLICT({key}) DO UPDATE SET {column} = excluded.{column}"
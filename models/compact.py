@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Tuple
+from uuid import UUID
+
+from .models import EnglishTerm, Meaning, SpanishTerm, Example, PartOfSpeech, Gender
+
+# Frozen, slotted mirrors of the domain model for holding many entries in
+# memory. Entries are trees of tuples without back-references, ids are the
+# raw 16 UUID bytes, and enum members and language codes are shared
+# singletons. The ``*_id`` properties rebuild UUIDs on access, so code
+# written against the full model (e.g. the service serializers) can read a
+# compact entry unchanged.
+
+
+@dataclass(frozen=True, slots=True)
+class CompactExample:
+    language: str
+    text: str
+    id_bytes: bytes
+
+    @property
+    def example_id(self) -> UUID:
+        return UUID(bytes=self.id_bytes)
+
+
+@dataclass(frozen=True, slots=True)
+class CompactSpanishTerm:
+    term: str
+    gender: Gender
+    id_bytes: bytes
+
+    @property
+    def term_id(self) -> UUID:
+        return UUID(bytes=self.id_bytes)
+
+
+@dataclass(frozen=True, slots=True)
+class CompactMeaning:
+    description: str
+    spanish_terms: Tuple[CompactSpanishTerm, ...]
+    examples: Tuple[CompactExample, ...]
+    id_bytes: bytes
+
+    @property
+    def meaning_id(self) -> UUID:
+        return UUID(bytes=self.id_bytes)
+
+
+@dataclass(frozen=True, slots=True)
+class CompactEntry:
+    term: str
+    pos: PartOfSpeech
+    meanings: Tuple[CompactMeaning, ...]
+    id_bytes: bytes
+
+    @property
+    def term_id(self) -> UUID:
+        return UUID(bytes=self.id_bytes)
+
+    def expand(self) -> EnglishTerm:
+        """A fresh, mutable ``EnglishTerm`` graph with the same content."""
+        et = EnglishTerm(term=self.term, pos=self.pos, term_id=self.term_id)
+        for cm in self.meanings:
+            m = Meaning(description=cm.description, english_term=et, meaning_id=cm.meaning_id)
+            for cs in cm.spanish_terms:
+                SpanishTerm(term=cs.term, gender=cs.gender, meaning=m, term_id=cs.term_id)
+            for ce in cm.examples:
+                Example(language=ce.language, text=ce.text, meaning=m, example_id=ce.example_id)
+        return et
+
+
+def compact(et: EnglishTerm) -> CompactEntry:
+    return CompactEntry(
+        term=et.term,
+        pos=et.pos,
+        id_bytes=et.term_id.bytes,
+        meanings=tuple(
+            CompactMeaning(
+                description=m.description,
+                id_bytes=m.meaning_id.bytes,
+                spanish_terms=tuple(
+                    CompactSpanishTerm(term=st.term, gender=st.gender, id_bytes=st.term_id.bytes)
+                    for st in m.spanish_terms
+                ),
+                examples=tuple(
+                    CompactExample(
+                        language=sys.intern(ex.language), text=ex.text, id_bytes=ex.example_id.bytes
+                    )
+                    for ex in m.examples
+                ),
+            )
+            for m in et.meanings
+        ),
+    )
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from uuid import UUID
+
+_lock = threading.Lock()
+_last = (0, 0)
+
+
+def uuid7() -> UUID:
+    """Time-ordered UUID (RFC 9562 version 7).
+
+    The first 48 bits are the Unix time in milliseconds and the next 12 a
+    counter within that millisecond, so ids created later sort later and
+    new rows land at the right edge of a primary-key index instead of on
+    random pages.
+    """
+    global _last
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        last_ms, seq = _last
+        if ms <= last_ms:
+            ms, seq = last_ms, seq + 1
+            if seq > 0xFFF:
+                ms, seq = last_ms + 1, 0
+        else:
+            seq = 0
+        _last = (ms, seq)
+    rand = int.from_bytes(os.urandom(8), "big") & 0x3FFF_FFFF_FFFF_FFFF
+    value = (ms << 80) | (0x7 << 76) | (seq << 64) | (0b10 << 62) | rand
+    return UUID(int=value)
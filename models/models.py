@@ -1,8 +1,10 @@
 from __future__ import annotations
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List
-from uuid import uuid4, UUID
+from typing import List, Optional, Set
+from uuid import UUID
+from .ids import uuid7
 
 class PartOfSpeech(Enum):
     NOUN = "noun"
@@ -16,60 +18,100 @@ class Gender(Enum):
     NEUTER    = "n"
     COMMON    = "c"
 
-@dataclass
+# Lists up to this length are scanned for duplicates; longer ones get an
+# id set so attaching children stays O(1) for very large graphs.
+_SCAN_LIMIT = 8
+
+
+def _append_once(items: list, item, id_attr: str, ids: Optional[Set[UUID]]) -> Optional[Set[UUID]]:
+    key = getattr(item, id_attr)
+    if ids is None:
+        if len(items) < _SCAN_LIMIT:
+            if all(getattr(x, id_attr) != key for x in items):
+                items.append(item)
+            return None
+        ids = {getattr(x, id_attr) for x in items}
+    if key not in ids:
+        ids.add(key)
+        items.append(item)
+    return ids
+
+@dataclass(slots=True)
 class EnglishTerm:
     term: str
     pos: PartOfSpeech
-    term_id: UUID = field(default_factory=uuid4)
+    term_id: UUID = field(default_factory=uuid7)
     meanings: List["Meaning"] = field(default_factory=list)
+    _meaning_ids: Optional[Set[UUID]] = field(default=None, init=False, repr=False, compare=False)
 
     def add_meaning(self, meaning: "Meaning") -> None:
-        if meaning not in self.meanings:
-            self.meanings.append(meaning)
+        self._meaning_ids = _append_once(self.meanings, meaning, "meaning_id", self._meaning_ids)
 
-@dataclass
+@dataclass(slots=True)
 class Meaning:
     description: str
     english_term: EnglishTerm
-    meaning_id: UUID = field(default_factory=uuid4)
+    meaning_id: UUID = field(default_factory=uuid7)
     spanish_terms: List["SpanishTerm"] = field(default_factory=list)
     examples: List["Example"] = field(default_factory=list)
+    _spanish_ids: Optional[Set[UUID]] = field(default=None, init=False, repr=False, compare=False)
+    _example_ids: Optional[Set[UUID]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.english_term.add_meaning(self)
 
     def add_spanish_term(self, st: "SpanishTerm") -> None:
-        if st not in self.spanish_terms:
-            self.spanish_terms.append(st)
+        self._spanish_ids = _append_once(self.spanish_terms, st, "term_id", self._spanish_ids)
 
     def add_example(self, ex: "Example") -> None:
-        if ex not in self.examples:
-            self.examples.append(ex)
+        self._example_ids = _append_once(self.examples, ex, "example_id", self._example_ids)
 
-@dataclass
+@dataclass(slots=True)
 class SpanishTerm:
     term: str
     gender: Gender
     meaning: Meaning
-    term_id: UUID = field(default_factory=uuid4)
+    term_id: UUID = field(default_factory=uuid7)
+
+    def __post_init__(self) -> None:
+        self.meaning.add_spanish_term(self)
 
-@dataclass
+@dataclass(slots=True)
 class Example:
     language: str
     text: str
     meaning: Meaning
-    example_id: UUID = field(default_factory=uuid4)
+    example_id: UUID = field(default_factory=uuid7)
+
+    def __post_init__(self) -> None:
+        # A handful of codes shared by every example in the process.
+        self.language = sys.intern(self.language)
+        self.meaning.add_example(self)
 
 def serialize_entry(et: EnglishTerm) -> dict:
+    """The API representation of an entry; the only place entries become JSON."""
     return {
-        "english_term": et.term,
+        "term": et.term,
         "pos": et.pos.value,
+        "term_id": str(et.term_id),
         "meanings": [
             {
+                "meaning_id": str(m.meaning_id),
                 "description": m.description,
                 "spanish_terms": [
-                    {"term": st.term, "gender": st.gender.value}
+                    {
+                        "term_id": str(st.term_id),
+                        "term": st.term,
+                        "gender": st.gender.value,
+                    }
                     for st in m.spanish_terms
                 ],
                 "examples": [
-                    {"language": ex.language, "text": ex.text}
+                    {
+                        "example_id": str(ex.example_id),
+                        "language": ex.language,
+                        "text": ex.text,
+                    }
                     for ex in m.examples
                 ],
             }
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import unicodedata
+
+
+def fold(text: str) -> str:
+    """Case- and accent-insensitive key: ``" Lesión "`` -> ``"lesion"``."""
+    decomposed = unicodedata.normalize("NFKD", text.strip().casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def description_key(text: str) -> str:
+    """Key under which two meaning descriptions count as the same meaning:
+    case-insensitive, with runs of whitespace collapsed."""
+    return " ".join(text.split()).casefold()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from db.pool import PoolTimeout
+from .encoded import EncodedJson
+from .service import DictionaryService
+from .write_behind import WriteBehindQueue
+
+
+class Overloaded(Exception):
+    """Raised when a call is refused because the bridge is saturated."""
+
+
+class AsyncDictionaryService:
+    """Awaitable facade over ``DictionaryService`` for async servers.
+
+    Repository drivers are blocking, so every call runs on a dedicated
+    thread pool sized to the repository's connection pool: more threads
+    would only queue on ``ConnectionPool.acquire``. At most
+    ``max_workers + max_pending`` calls may be in flight; beyond that, and
+    whenever the connection pool times out, calls fail fast with
+    ``Overloaded`` instead of piling up unbounded work.
+    """
+
+    def __init__(
+        self,
+        service: DictionaryService,
+        max_workers: Optional[int] = None,
+        max_pending: int = 256,
+    ) -> None:
+        pool = getattr(service.repo, "pool", None)
+        self.service = service
+        self.max_workers = max_workers or getattr(pool, "size", None) or 8
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="dictionary-io"
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def _run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_pending:
+                self._rejected += 1
+                raise Overloaded(f"{self._in_flight} requests already in flight")
+            self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            # run_in_executor does not carry context variables over; copy
+            # them so per-request query stats reach the worker thread.
+            ctx = contextvars.copy_context()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(ctx.run, fn, *args, **kwargs)
+            )
+        except PoolTimeout as e:
+            with self._lock:
+                self._rejected += 1
+            raise Overloaded(str(e)) from e
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+
+    async def lookup_english_as_dict(self, lemma: str) -> Optional[Dict[str, Any]]:
+        return await self._run(self.service.lookup_english_as_dict, lemma)
+
+    async def lookup_english_encoded(self, lemma: str) -> Optional[EncodedJson]:
+        return await self._run(self.service.lookup_english_encoded, lemma)
+
+    async def lookup_spanish_as_dict(self, term: str) -> Optional[Dict[str, Any]]:
+        return await self._run(self.service.lookup_spanish_as_dict, term)
+
+    async def lookup_fuzzy(self, query: str, max_distance: int) -> List[Dict[str, Any]]:
+        return await self._run(self.service.lookup_fuzzy, query, max_distance=max_distance)
+
+    async def add_entry_as_dict(
+        self,
+        lemma: str,
+        pos: str,
+        meaning_desc: str,
+        spanish_term: str,
+        gender: str,
+        examples: Iterable[tuple[str, str]] = (),
+    ) -> Dict[str, Any]:
+        return await self._run(
+            self.service.add_entry_as_dict,
+            lemma, pos, meaning_desc, spanish_term, gender, examples,
+        )
+
+    async def add_full_entry_as_dict(
+        self, lemma: str, pos: str, meanings: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return await self._run(self.service.add_full_entry_as_dict, lemma, pos, meanings)
+
+    async def submit_write(self, writes: WriteBehindQueue, data: Any) -> Dict[str, Any]:
+        # The journal append may fsync while holding the queue's lock.
+        return await self._run(writes.submit, data)
+
+    async def list_terms_page(self, language: str, after: Optional[str], limit: int) -> Dict[str, Any]:
+        return await self._run(self.service.list_terms_page, language, after, limit)
+
+    async def export_ndjson(self) -> AsyncIterator[bytes]:
+        # Each batch is read on the pool; the generator only advances on
+        # one thread at a time.
+        chunks = self.service.export_ndjson()
+        while True:
+            chunk = await self._run(next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    async def get_english_lesson(self, **filters: Any) -> dict:
+        return await self._run(self.service.get_english_lesson, **filters)
+
+    async def get_english_lesson_encoded(self, **filters: Any) -> EncodedJson:
+        return await self._run(self.service.get_english_lesson_encoded, **filters)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .variants import normalize
+
+# Room for adds between rebuilds before the false-positive rate degrades.
+HEADROOM = 1.5
+MIN_CAPACITY = 1024
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings.
+
+    Sized for ``capacity`` keys at ``fp_rate``; ``k`` bit positions per key
+    come from one blake2b digest by double hashing.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float = 0.01) -> None:
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate must be between 0 and 1")
+        self.capacity = max(int(capacity), 1)
+        self.fp_rate = fp_rate
+        self.bits = max(8, math.ceil(-self.capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / self.capacity * math.log(2)))
+        self.count = 0
+        self._array = bytearray((self.bits + 7) // 8)
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._array)
+
+    def _hashes(self, key: str) -> Tuple[int, int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    def add(self, key: str) -> None:
+        h, step = self._hashes(key)
+        for _ in range(self.hashes):
+            pos = h % self.bits
+            self._array[pos >> 3] |= 1 << (pos & 7)
+            h += step
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        # Most absent keys hit a clear bit within the first probe or two.
+        h, step = self._hashes(key)
+        array, bits = self._array, self.bits
+        for _ in range(self.hashes):
+            pos = h % bits
+            if not array[pos >> 3] & (1 << (pos & 7)):
+                return False
+            h += step
+        return True
+
+
+class LemmaFilter:
+    """Bloom filter over folded English lemmas, answering "certainly not
+    in the dictionary" without a repository read.
+
+    The service calls ``add`` for every lemma it writes, so its own adds
+    are visible at once. Bits cannot be cleared: deletes and lemmas written
+    by other processes are picked up by ``rebuild``, which the service runs
+    in the background once ``rebuild_interval`` seconds have passed (``0``
+    disables it) or the filter is over capacity. Lookups keep using the old
+    filter until the new one is swapped in.
+
+    Every ``check_interval`` seconds the service compares, in a background
+    thread, the repository's ``english_marker`` with the one recorded at
+    the last build. If it moved,
+    another process may have added a lemma, so negative answers are not
+    trusted until a rebuild has caught up.
+    """
+
+    def __init__(
+        self,
+        fp_rate: float = 0.01,
+        rebuild_interval: float = 300.0,
+        check_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate must be between 0 and 1")
+        self.fp_rate = fp_rate
+        self.rebuild_interval = rebuild_interval
+        self.check_interval = check_interval
+        self._clock = clock
+        self._filter = BloomFilter(MIN_CAPACITY, fp_rate)
+        self._built_at = self._checked_at = clock()
+        self._marker: Any = None
+        self._stale = False
+        self._pending: Optional[List[str]] = None
+        self._lock = threading.Lock()
+        self._checks = self._short_circuits = self._rebuilds = self._deletes = 0
+        self.built = False
+
+    def __len__(self) -> int:
+        return self._filter.count
+
+    def build(self, terms: Iterable[Tuple[str, str]], marker: Any = None) -> None:
+        """Replace the filter with one over ``terms``. ``marker`` is the
+        repository's ``english_marker``, read before the scan started."""
+        # Adds that land while the scan runs are replayed into the new
+        # filter, so the swap never loses a lemma.
+        with self._lock:
+            self._pending = []
+        try:
+            keys = [normalize(term) for language, term in terms if language == "en"]
+            bloom = BloomFilter(max(MIN_CAPACITY, int(len(keys) * HEADROOM)), self.fp_rate)
+            for key in keys:
+                bloom.add(key)
+        except BaseException:
+            # Keep the old filter and wait another interval before retrying.
+            with self._lock:
+                self._pending = None
+                self._built_at = self._clock()
+            raise
+        with self._lock:
+            for key in self._pending:
+                bloom.add(key)
+            self._filter, self._pending = bloom, None
+            self._built_at = self._checked_at = self._clock()
+            self._marker, self._stale = marker, False
+            self._deletes = 0
+            if self.built:
+                self._rebuilds += 1
+            self.built = True
+
+    def add(self, language: str, term: str) -> None:
+        if language != "en":
+            return
+        key = normalize(term)
+        with self._lock:
+            self._filter.add(key)
+            if self._pending is not None:
+                self._pending.append(key)
+
+    def remove(self, language: str, term: str) -> None:
+        if language == "en":
+            with self._lock:
+                self._deletes += 1
+
+    def check_due(self) -> bool:
+        """Whether the repository's marker should be compared again."""
+        return (
+            self.built and not self._stale and self.check_interval > 0
+            and self._clock() - self._checked_at >= self.check_interval
+        )
+
+    def check(self, marker: Any) -> None:
+        """Record the repository's current ``english_marker``; a change
+        since the last build makes the filter stale."""
+        with self._lock:
+            self._checked_at = self._clock()
+            if marker != self._marker:
+                self._stale = True
+
+    def might_contain(self, lemma: str) -> bool:
+        """False only if ``lemma`` was in none of the scanned or added lemmas
+        and the filter is not known to be stale."""
+        found = self._stale or normalize(lemma) in self._filter
+        # Unlocked: under contention the counters may lose an increment.
+        self._checks += 1
+        if not found:
+            self._short_circuits += 1
+        return found
+
+    def due(self) -> bool:
+        """Whether a rebuild is due: the filter is stale, older than
+        ``rebuild_interval`` or holds more lemmas than it was sized for."""
+        if not self.built or self._pending is not None:
+            return False
+        if self._filter.count > self._filter.capacity:
+            return True
+        age = self._clock() - self._built_at
+        # After a failed rebuild a stale filter waits ``check_interval``.
+        if self._stale and age >= self.check_interval:
+            return True
+        return bool(self.rebuild_interval) and age >= self.rebuild_interval
+
+    def stats(self) -> Dict[str, float]:
+        bloom = self._filter
+        return {
+            "size_bytes": bloom.size_bytes,
+            "hashes": bloom.hashes,
+            "lemmas": bloom.count,
+            "capacity": bloom.capacity,
+            "fp_rate": self.fp_rate,
+            "checks": self._checks,
+            "short_circuits": self._short_circuits,
+            "short_circuit_rate": self._short_circuits / self._checks if self._checks else 0.0,
+            "deletes_since_rebuild": self._deletes,
+            "rebuilds": self._rebuilds,
+            "stale": int(self._stale),
+            "age_seconds": self._clock() - self._built_at,
+        }
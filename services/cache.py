@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from models import EnglishTerm
+from models.compact import CompactEntry, compact
+
+MISSING = object()
+
+
+class Cache(ABC):
+    @abstractmethod
+    def get(self, key: Hashable) -> Any: ...
+    @abstractmethod
+    def put(self, key: Hashable, value: Any) -> None: ...
+    @abstractmethod
+    def invalidate(self, keys: Iterable[Hashable]) -> None: ...
+    @abstractmethod
+    def clear(self) -> None: ...
+    @abstractmethod
+    def stats(self) -> Dict[str, int]: ...
+
+
+class NullCache(Cache):
+    def get(self, key: Hashable) -> Any:
+        return MISSING
+
+    def put(self, key: Hashable, value: Any) -> None:
+        pass
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+
+class LRUCache(Cache):
+    """Thread-safe LRU cache with per-entry TTL.
+
+    ``get`` returns ``MISSING`` when the key is absent or expired; a stored
+    ``None`` is a cached negative result and expires after ``negative_ttl``.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 300.0,
+        negative_ttl: Optional[float] = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self._misses += 1
+                return MISSING
+            value, expires_at = item
+            if expires_at <= self._clock():
+                del self._data[key]
+                self._expirations += 1
+                self._misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        ttl = self.negative_ttl if value is None else self.ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, self._clock() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        with self._lock:
+            for key in keys:
+                if self._data.pop(key, None) is not None:
+                    self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+
+class CompactingCache(Cache):
+    """Stores entries in ``inner`` as frozen ``CompactEntry`` trees.
+
+    Cached graphs take a fraction of the memory of the full model, and
+    every hit expands a fresh ``EnglishTerm``, so callers can't mutate
+    what other requests will see.
+    """
+
+    def __init__(self, inner: Cache) -> None:
+        self.inner = inner
+
+    def get(self, key: Hashable) -> Any:
+        value = self.inner.get(key)
+        if isinstance(value, CompactEntry):
+            return value.expand()
+        if isinstance(value, tuple):
+            return [entry.expand() for entry in value]
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if isinstance(value, EnglishTerm):
+            value = compact(value)
+        elif isinstance(value, list):
+            value = tuple(compact(et) for et in value)
+        self.inner.put(key, value)
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        self.inner.invalidate(keys)
+
+    def clear(self) -> None:
+        self.inner.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self.inner.stats()
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedJson:
+    """A response body encoded once, with a strong ETag of its bytes."""
+
+    body: bytes
+    etag: str
+    term: str = ""
+
+
+def encode_json(payload: Any, term: str = "") -> EncodedJson:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return EncodedJson(body, hashlib.blake2b(body, digest_size=16).hexdigest(), term)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from models.text import fold
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or ``limit + 1`` once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1] if prev[-1] <= limit else limit + 1
+
+
+def _deletes(word: str, depth: int) -> Set[str]:
+    found = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+
+class FuzzyIndex:
+    """Symmetric-deletion index for edit-distance lookups.
+
+    Every folded term registers all strings reachable by deleting up to
+    ``max_distance`` characters from its first ``prefix_length``
+    characters. A query generates the same deletions of its own prefix;
+    terms sharing a deletion are the only candidates whose real distance
+    gets computed, so lookup cost depends on the query length, not on the
+    size of the dictionary.
+    """
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7) -> None:
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._deletions: Dict[str, Set[str]] = {}
+        self._terms: Dict[str, Set[Tuple[str, str]]] = {}
+        self._lock = threading.RLock()
+        self.built = False
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def build(self, terms: Iterable[Tuple[str, str]]) -> None:
+        with self._lock:
+            self._deletions.clear()
+            self._terms.clear()
+            for language, term in terms:
+                self._add(language, term)
+            self.built = True
+
+    def add(self, language: str, term: str) -> None:
+        with self._lock:
+            self._add(language, term)
+
+    def remove(self, language: str, term: str) -> None:
+        key = fold(term)
+        with self._lock:
+            entries = self._terms.get(key)
+            if not entries:
+                return
+            entries -= {e for e in entries if e[0] == language and e[1].casefold() == term.casefold()}
+            if entries:
+                return
+            del self._terms[key]
+            for variant in _deletes(key[: self.prefix_length], self.max_distance):
+                bucket = self._deletions.get(variant)
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self._deletions[variant]
+
+    def search(
+        self, query: str, max_distance: Optional[int] = None, limit: int = 10
+    ) -> List[Dict[str, object]]:
+        bound = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        key = fold(query)
+        if not key:
+            return []
+        with self._lock:
+            candidates: Set[str] = set()
+            for variant in _deletes(key[: self.prefix_length], bound):
+                candidates |= self._deletions.get(variant, set())
+            scored = []
+            for cand in candidates:
+                d = edit_distance(key, cand, bound)
+                if d <= bound:
+                    for language, term in self._terms[cand]:
+                        scored.append((d, language != "en", term, language))
+        scored.sort()
+        return [
+            {"term": term, "language": language, "distance": d}
+            for d, _, term, language in scored[:limit]
+        ]
+
+    def _add(self, language: str, term: str) -> None:
+        key = fold(term)
+        if not key:
+            return
+        entries = self._terms.setdefault(key, set())
+        if entries:
+            entries.add((language, term))
+            return
+        entries.add((language, term))
+        for variant in _deletes(key[: self.prefix_length], self.max_distance):
+            self._deletions.setdefault(variant, set()).add(key)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models import EnglishTerm
+from .service import DictionaryService
+
+Record = Tuple[int, Dict[str, Any]]
+
+CSV_EXAMPLE_COLUMNS = (("example_en", "en"), ("example_es", "es"))
+
+
+def read_records(path: str, fmt: Optional[str] = None) -> Iterator[Record]:
+    """Yield ``(line_number, record)`` pairs from a JSONL or CSV glossary.
+
+    JSONL lines use the same keys as the ``/api/v1/add`` payload. CSV files
+    need a header with ``lemma,pos,meaning_desc,spanish_term,gender`` and
+    may add ``example_en``/``example_es`` columns.
+    """
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    with open(path, encoding="utf-8-sig", newline="") as fh:
+        if fmt in ("jsonl", "ndjson", "json"):
+            for line_no, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, {"_error": f"invalid JSON: {e.msg}"}
+        elif fmt == "csv":
+            for line_no, row in enumerate(csv.DictReader(fh), start=2):
+                examples = [
+                    (lang, row[col]) for col, lang in CSV_EXAMPLE_COLUMNS if row.get(col)
+                ]
+                yield line_no, {**row, "examples": examples}
+        else:
+            raise ValueError(f"unsupported format: {fmt!r}")
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    imported: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class BulkImporter:
+    """Stream records into the repository in chunked transactions.
+
+    Rows that fail validation are reported and skipped. When a chunk fails
+    to write, its rows are retried one by one so only the offending rows
+    are reported.
+    """
+
+    def __init__(
+        self,
+        service: DictionaryService,
+        chunk_size: int = 1000,
+        on_progress: Optional[Callable[[ImportReport], None]] = None,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.service = service
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+
+    def run(self, records: Iterable[Record]) -> ImportReport:
+        report = ImportReport()
+        started = time.perf_counter()
+        chunk: List[Tuple[int, EnglishTerm]] = []
+        for line_no, record in records:
+            report.rows += 1
+            try:
+                chunk.append((line_no, self._build(record)))
+            except (ValueError, TypeError, KeyError) as e:
+                report.errors.append((line_no, str(e)))
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk, report)
+                chunk = []
+                report.seconds = time.perf_counter() - started
+                if self.on_progress:
+                    self.on_progress(report)
+        if chunk:
+            self._flush(chunk, report)
+        report.seconds = time.perf_counter() - started
+        if self.on_progress:
+            self.on_progress(report)
+        return report
+
+    def _build(self, record: Dict[str, Any]) -> EnglishTerm:
+        if "_error" in record:
+            raise ValueError(record["_error"])
+        return self.service.build_entry(
+            lemma=record["lemma"],
+            pos=record["pos"],
+            meaning_desc=record["meaning_desc"],
+            spanish_term=record["spanish_term"],
+            gender=record["gender"],
+            examples=[tuple(ex) for ex in record.get("examples") or []],
+        )
+
+    def _flush(self, chunk: List[Tuple[int, EnglishTerm]], report: ImportReport) -> None:
+        try:
+            self.service.add_entries([et for _, et in chunk])
+            report.imported += len(chunk)
+            return
+        except Exception as e:
+            if len(chunk) == 1:
+                report.errors.append((chunk[0][0], str(e)))
+                return
+        for line_no, et in chunk:
+            try:
+                self.service.add_entries([et])
+                report.imported += 1
+            except Exception as e:
+                report.errors.append((line_no, str(e)))
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import itertools
+import math
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from models import EnglishTerm, PartOfSpeech
+from models.text import fold
+from .cache import LRUCache, MISSING
+from .encoded import EncodedJson, encode_json
+
+MAX_LESSON_SIZE = 50
+MODES = ("random", "spaced")
+DIFFICULTIES = ("easy", "medium", "hard")
+
+# A lesson entry belongs to a topic when a word of its lemma or of its
+# first definition starts with one of the topic's stems. Stems shorter than
+# MIN_PREFIX must match the whole word, so "ear" does not claim "early".
+TOPICS: Dict[str, Tuple[str, ...]] = {
+    "cardiology": ("cardi", "heart", "coronar", "angi", "arter", "vascul", "aort"),
+    "dermatology": ("derm", "skin", "rash", "lesion", "wound", "itch"),
+    "digestive": ("gastr", "hepat", "colon", "colitis", "colorect", "stomach", "liver", "bowel",
+                  "intestin", "nause", "vomit"),
+    "ent": ("rhin", "otitis", "otol", "otosc", "laryng", "pharyng", "ear", "ears", "earache",
+            "nose", "throat", "sinus"),
+    "hematology": ("hema", "hemo", "haem", "blood", "thromb", "lymph", "anemi", "bleed"),
+    "musculoskeletal": ("oste", "arthr", "myalg", "myosit", "myopath", "chondr", "bone", "joint",
+                        "muscle", "fractur", "sprain"),
+    "neurology": ("neur", "encephal", "brain", "nerve", "seizure", "mening", "headache"),
+    "ophthalmology": ("ophthalm", "eye", "eyes", "eyelid", "vision", "retin"),
+    "renal": ("nephr", "cyst", "kidney", "renal", "urin", "bladder"),
+    "respiratory": ("pneum", "pulmon", "lung", "bronch", "cough", "breath", "asthma"),
+    "general": ("fever", "pain", "fatigue", "infection", "inflammation", "swelling"),
+}
+
+MIN_PREFIX = 4
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_STEM_TOPICS: Dict[str, Tuple[str, ...]] = {}
+for _topic, _stems in TOPICS.items():
+    for _stem in _stems:
+        _STEM_TOPICS[_stem] = _STEM_TOPICS.get(_stem, ()) + (_topic,)
+_STEM_LENGTHS = sorted({len(stem) for stem in _STEM_TOPICS})
+
+# (topic, pos, difficulty); None matches any value.
+SetKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def _digest(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+@dataclass(frozen=True, slots=True)
+class LessonItem:
+    english: str
+    spanish: str
+    pos: str
+    definition: str
+    difficulty: str
+    topics: Tuple[str, ...]
+
+    def as_dict(self) -> Dict[str, str]:
+        return {
+            "english": self.english,
+            "spanish": self.spanish,
+            "pos": self.pos,
+            "definition": self.definition,
+            "difficulty": self.difficulty,
+        }
+
+
+def difficulty(lemma: str) -> str:
+    """Rough learner difficulty of a lemma: short single words are easy,
+    long words and multi-word terms are hard."""
+    words = lemma.split()
+    letters = sum(len(w) for w in words)
+    if len(words) > 1 or letters >= 11:
+        return "hard"
+    return "easy" if letters <= 6 else "medium"
+
+
+def topics(et: EnglishTerm) -> Tuple[str, ...]:
+    text = et.term + " " + et.meanings[0].description if et.meanings else et.term
+    found = set()
+    for word in _WORD.findall(fold(text)):
+        for n in _STEM_LENGTHS:
+            if n > len(word):
+                break
+            if n < MIN_PREFIX and n != len(word):
+                continue
+            matched = _STEM_TOPICS.get(word[:n])
+            if matched:
+                found.update(matched)
+    return tuple(topic for topic in TOPICS if topic in found)
+
+
+def lesson_item(et: EnglishTerm) -> Optional[LessonItem]:
+    """The entry's lesson card: its first meaning with a Spanish term, or
+    None when it has no translation to teach."""
+    for m in et.meanings:
+        if m.spanish_terms:
+            return LessonItem(
+                english=et.term,
+                spanish=m.spanish_terms[0].term,
+                pos=et.pos.value,
+                definition=m.description,
+                difficulty=difficulty(et.term),
+                topics=topics(et),
+            )
+    return None
+
+
+class LessonIndex:
+    """Materialized lesson sets over the dictionary.
+
+    Every entry with a Spanish translation is reduced to a ``LessonItem``.
+    Its folded lemma is filed under each (topic, pos, difficulty)
+    combination it matches, with ``None`` as a wildcard. Each set is
+    a list kept in a fixed pseudo-random order (a hash of the lemma, taken
+    when the item is materialized) by ``add_entry`` and ``remove_entry``.
+    A seed walks that list with its own offset and stride, so any page of
+    any seed is read by position without shuffling the set. Encoded pages
+    are cached per set version, and a write only invalidates the sets its
+    lemma is filed under. A repeated request is one cache read.
+    """
+
+    def __init__(self, cache_size: int = 4096) -> None:
+        self._items: Dict[str, LessonItem] = {}
+        self._ranks: Dict[str, Tuple[int, str]] = {}
+        self._sets: Dict[SetKey, List[str]] = {}
+        self._versions: Dict[SetKey, int] = {}
+        self._pages = LRUCache(max_size=cache_size, ttl=math.inf)
+        self._lock = threading.RLock()
+        self.built = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @staticmethod
+    def _set_keys(item: LessonItem) -> Iterable[SetKey]:
+        return itertools.product(
+            (None,) + item.topics, (None, item.pos), (None, item.difficulty)
+        )
+
+    def build(self, entries: Iterable[EnglishTerm]) -> None:
+        with self._lock:
+            old = set(self._sets)
+            self._items.clear()
+            self._ranks.clear()
+            self._sets.clear()
+            for et in entries:
+                self._add(et, sort=False)
+            for members in self._sets.values():
+                members.sort(key=self._ranks.__getitem__)
+            for set_key in old | set(self._sets):
+                self._versions[set_key] = self._versions.get(set_key, 0) + 1
+            self.built = True
+
+    def add_entry(self, et: EnglishTerm) -> None:
+        with self._lock:
+            self._remove(fold(et.term))
+            self._add(et)
+
+    def remove_entry(self, lemma: str) -> None:
+        with self._lock:
+            self._remove(fold(lemma))
+
+    def _add(self, et: EnglishTerm, sort: bool = True) -> None:
+        item = lesson_item(et)
+        if item is None:
+            return
+        key = fold(et.term)
+        self._items[key] = item
+        self._ranks[key] = (_digest(key), key)
+        for set_key in self._set_keys(item):
+            members = self._sets.setdefault(set_key, [])
+            if sort:
+                bisect.insort(members, key, key=self._ranks.__getitem__)
+                self._versions[set_key] = self._versions.get(set_key, 0) + 1
+            else:
+                members.append(key)
+
+    def _remove(self, key: str) -> bool:
+        item = self._items.pop(key, None)
+        if item is None:
+            return False
+        rank = self._ranks[key]
+        for set_key in self._set_keys(item):
+            members = self._sets[set_key]
+            i = bisect.bisect_left(members, rank, key=self._ranks.__getitem__)
+            if i < len(members) and members[i] == key:
+                members.pop(i)
+            if not members:
+                del self._sets[set_key]
+            self._versions[set_key] = self._versions.get(set_key, 0) + 1
+        del self._ranks[key]
+        return True
+
+    def lesson(
+        self,
+        topic: Optional[str] = None,
+        pos: Optional[PartOfSpeech] = None,
+        difficulty: Optional[str] = None,
+        mode: str = "random",
+        seed: int = 0,
+        page: int = 1,
+        per_page: int = 10,
+    ) -> EncodedJson:
+        if topic is not None and topic not in TOPICS:
+            raise ValueError(f"invalid topic: {topic!r}")
+        if difficulty is not None and difficulty not in DIFFICULTIES:
+            raise ValueError(f"invalid difficulty: {difficulty!r}")
+        if mode not in MODES:
+            raise ValueError(f"invalid mode: {mode!r}")
+        if page < 1 or not 1 <= per_page <= MAX_LESSON_SIZE:
+            raise ValueError(f"page must be >= 1 and per_page between 1 and {MAX_LESSON_SIZE}")
+        set_key = (topic, pos.value if pos else None, difficulty)
+        cache_key = (self._versions.get(set_key, 0), set_key, mode, seed, page, per_page)
+        encoded = self._pages.get(cache_key)
+        if encoded is not MISSING:
+            return encoded
+
+        with self._lock:
+            cache_key = (self._versions.get(set_key, 0),) + cache_key[1:]
+            members = self._sets.get(set_key, [])
+            terms = self._sample(self._walk(members, seed), mode, page, per_page)
+            cards = [dict(self._items[key].as_dict(), **extra) for key, extra in terms]
+            total = len(members)
+        title = f"{topic.capitalize() if topic else 'Basic Medical'} Terms"
+        encoded = encode_json({
+            "lesson_title": title,
+            "topic": topic,
+            "pos": set_key[1],
+            "difficulty": difficulty,
+            "mode": mode,
+            "seed": seed,
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "pages": math.ceil(total / per_page),
+            "terms": cards,
+        })
+        self._pages.put(cache_key, encoded)
+        return encoded
+
+    @staticmethod
+    def _walk(members: List[str], seed: int) -> Callable[[int, int], List[str]]:
+        """Positions ``start:stop`` of the set in ``seed``'s order: the
+        hash-ordered members read from a seeded offset with a seeded stride
+        coprime with the set size, which visits every member once."""
+        n = len(members)
+        if not n:
+            return lambda start, stop: []
+        mixed = _digest(f"lesson-seed:{seed}")
+        offset = mixed % n
+        stride = (mixed >> 32) % n or 1
+        while math.gcd(stride, n) != 1:
+            stride += 1
+        return lambda start, stop: [
+            members[(offset + i * stride) % n] for i in range(max(start, 0), min(stop, n))
+        ]
+
+    @staticmethod
+    def _sample(
+        order: Callable[[int, int], List[str]], mode: str, page: int, per_page: int
+    ) -> List[Tuple[str, Dict[str, bool]]]:
+        batch = order((page - 1) * per_page, page * per_page)
+        if mode == "random":
+            return [(key, {}) for key in batch]
+        # Spaced repetition: page n is session n. It introduces the next
+        # batch and reviews the batches introduced 1, 2, 4, 8... sessions
+        # earlier, so each card comes back at doubling intervals.
+        terms = [(key, {"review": False}) for key in batch]
+        reviews: List[str] = []
+        interval = 1
+        while interval < page and len(reviews) < per_page:
+            start = (page - interval - 1) * per_page
+            reviews.extend(order(start, start + per_page))
+            interval *= 2
+        return terms + [(key, {"review": True}) for key in reviews[:per_page]]
@@ -0,0 +1,163 @@
+"""Per-route request metrics rendered in the Prometheus text format.
+
+``RequestMetrics.observe`` is called once per request by the Flask and
+ASGI apps. It records the request's latency by (method, route, status).
+It also records how much database work the request did: connections,
+queries and rows, and the time spent in each phase. The phases are
+connecting (pool wait), querying, hydrating (holding a connection
+between queries) and serializing. Process-wide query totals come from
+``db.instrumentation``.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from db import instrumentation
+from db.instrumentation import Histogram, QueryStats
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000)
+DB_KINDS = ("connections", "queries", "rows")
+PHASES = ("connect", "query", "hydrate", "serialize")
+# Stats keys that only grow, exported as ``dictionary_<prefix>_<key>_total``
+# counters; every other numeric stat is a gauge.
+COUNTERS: Dict[str, Tuple[str, ...]] = {
+    "pool": ("created", "discarded", "checkouts", "timeouts"),
+    "cache": ("hits", "misses", "evictions", "expirations", "invalidations"),
+    "async": ("completed", "rejected"),
+    "lemma_filter": ("checks", "short_circuits", "rebuilds"),
+    "write_behind": ("submitted", "committed", "failed", "rejected", "batches"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Labels, **extra: str) -> str:
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(name: str, labels: Labels, hist: Histogram) -> List[str]:
+    buckets, count, total = hist.snapshot()
+    lines = [f"{name}_bucket{_labels(labels, le=_number(bound))} {n}" for bound, n in buckets]
+    lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+    lines.append(f"{name}_count{_labels(labels)} {count}")
+    return lines
+
+
+class _RouteMetrics:
+    """The per-request histograms of one route; all share the registry lock."""
+
+    __slots__ = ("db", "phases")
+
+    def __init__(self, lock: threading.Lock) -> None:
+        self.db = [Histogram(COUNT_BUCKETS, lock) for _ in DB_KINDS]
+        self.phases = [Histogram(lock=lock) for _ in PHASES]
+
+
+class RequestMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latency: Dict[Labels, Histogram] = {}
+        self._routes: Dict[str, _RouteMetrics] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        stats: Optional[QueryStats] = None,
+    ) -> None:
+        key = (("method", method), ("route", route), ("status", str(status)))
+        with self._lock:
+            latency = self._latency.get(key)
+            if latency is None:
+                latency = self._latency[key] = Histogram(lock=self._lock)
+            latency.observe_locked(seconds)
+            if stats is None:
+                return
+            per_route = self._routes.get(route)
+            if per_route is None:
+                per_route = self._routes[route] = _RouteMetrics(self._lock)
+            db, phases = per_route.db, per_route.phases
+            db[0].observe_locked(stats.connections)
+            db[1].observe_locked(stats.queries)
+            db[2].observe_locked(stats.rows)
+            phases[0].observe_locked(stats.connect_seconds)
+            phases[1].observe_locked(stats.query_seconds)
+            phases[2].observe_locked(stats.hydrate_seconds)
+            phases[3].observe_locked(stats.serialize_seconds)
+
+    def render(
+        self,
+        gauges: Optional[Mapping[str, Mapping[str, float]]] = None,
+        histograms: Optional[Mapping[str, Histogram]] = None,
+    ) -> str:
+        """The exposition text; ``gauges`` maps a prefix such as ``"pool"``
+        to a stats dict, exported as ``dictionary_<prefix>_<key>`` (or as a
+        ``_total`` counter for keys listed in ``COUNTERS``), and
+        ``histograms`` maps a name to a histogram exported as
+        ``dictionary_<name>``."""
+        with self._lock:
+            latency = dict(self._latency)
+            routes = dict(self._routes)
+        tables = [
+            ("dictionary_request_duration_seconds", "Request latency by route.", latency),
+            (
+                "dictionary_request_db_operations",
+                "Connections, queries and rows per request.",
+                {
+                    (("route", route), ("kind", kind)): hist
+                    for route, per_route in routes.items()
+                    for kind, hist in zip(DB_KINDS, per_route.db)
+                },
+            ),
+            (
+                "dictionary_request_phase_seconds",
+                "Per-request time spent connecting, querying, hydrating and serializing.",
+                {
+                    (("route", route), ("phase", phase)): hist
+                    for route, per_route in routes.items()
+                    for phase, hist in zip(PHASES, per_route.phases)
+                },
+            ),
+        ]
+        lines: List[str] = []
+        for name, help_text, table in tables:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for labels in sorted(table):
+                lines += _histogram_lines(name, labels, table[labels])
+
+        for key, value in instrumentation.totals.snapshot().items():
+            name = f"dictionary_db_{key}_total"
+            lines += [f"# TYPE {name} counter", f"{name} {value}"]
+        name = "dictionary_db_query_duration_seconds"
+        lines += [f"# HELP {name} Latency of single statements.", f"# TYPE {name} histogram"]
+        lines += _histogram_lines(name, (), instrumentation.totals.query_seconds)
+        for key, hist in (histograms or {}).items():
+            name = f"dictionary_{key}"
+            lines += [f"# TYPE {name} histogram"] + _histogram_lines(name, (), hist)
+
+        for prefix, stats in (gauges or {}).items():
+            counters = COUNTERS.get(prefix, ())
+            for key, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    if key in counters:
+                        name, kind = f"dictionary_{prefix}_{key}_total", "counter"
+                    else:
+                        name, kind = f"dictionary_{prefix}_{key}", "gauge"
+                    lines += [f"# TYPE {name} {kind}", f"{name} {_number(value)}"]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import html
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from models import EnglishTerm
+from models.text import fold
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# (lemma key, meaning id, field, example id or "")
+DocId = Tuple[str, str, str, str]
+
+
+def tokenize(text: str) -> List[str]:
+    return [fold(m.group()) for m in _WORD.finditer(text)]
+
+
+def highlight(text: str, terms: Set[str], width: int = 160) -> str:
+    """HTML-escaped snippet of ``text`` around the first matching word,
+    with every matching word wrapped in ``<mark>``."""
+    matches = [m for m in _WORD.finditer(text) if fold(m.group()) in terms]
+    if not matches:
+        return html.escape(text[:width])
+    start = max(0, matches[0].start() - width // 3)
+    end = min(len(text), start + width)
+    parts, pos = [], start
+    for m in matches:
+        if m.start() < start or m.end() > end:
+            continue
+        parts.append(html.escape(text[pos:m.start()]))
+        parts.append(f"<mark>{html.escape(m.group())}</mark>")
+        pos = m.end()
+    parts.append(html.escape(text[pos:end]))
+    return ("…" if start else "") + "".join(parts) + ("…" if end < len(text) else "")
+
+
+class SearchIndex:
+    """In-process inverted index over meaning descriptions and example
+    sentences, ranked with BM25.
+
+    Documents are keyed by owning English lemma, so an entry can be
+    re-indexed or dropped without touching the rest of the index.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[DocId, int]] = {}
+        self._docs: Dict[DocId, Tuple[str, str, str, int]] = {}
+        self._by_lemma: Dict[str, Set[DocId]] = {}
+        self._total_len = 0
+        self._lock = threading.RLock()
+        self.built = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def build(self, entries: Iterable[EnglishTerm]) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            self._by_lemma.clear()
+            self._total_len = 0
+            for et in entries:
+                self._add_entry(et)
+            self.built = True
+
+    def add_entry(self, et: EnglishTerm) -> None:
+        with self._lock:
+            self._add_entry(et)
+
+    def remove_entry(self, lemma: str) -> None:
+        with self._lock:
+            for doc_id in self._by_lemma.pop(lemma.casefold(), set()):
+                self._remove_doc(doc_id)
+
+    def search(
+        self,
+        query: str,
+        offset: int = 0,
+        limit: int = 10,
+        language: Optional[str] = None,
+    ) -> Tuple[int, List[Dict[str, object]]]:
+        terms = set(tokenize(query))
+        if not terms:
+            return 0, []
+        with self._lock:
+            n_docs = len(self._docs)
+            avg_len = self._total_len / n_docs if n_docs else 0.0
+            scores: Counter = Counter()
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    doc_len = self._docs[doc_id][3]
+                    norm = self.k1 * (1 - self.b + self.b * doc_len / avg_len)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+            if language:
+                scores = Counter({d: s for d, s in scores.items() if self._docs[d][1] == language})
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            page = [(doc_id, score, self._docs[doc_id]) for doc_id, score in ranked[offset:offset + limit]]
+
+        results = []
+        for (_, meaning_id, field, example_id), score, (lemma, lang, text, _) in page:
+            results.append({
+                "lemma": lemma,
+                "meaning_id": meaning_id,
+                "field": field,
+                "example_id": example_id or None,
+                "language": lang,
+                "snippet": highlight(text, terms),
+                "score": round(score, 4),
+            })
+        return len(ranked), results
+
+    def _add_entry(self, et: EnglishTerm) -> None:
+        key = et.term.casefold()
+        for m in et.meanings:
+            mid = str(m.meaning_id)
+            self._add_doc((key, mid, "description", ""), et.term, "en", m.description)
+            for ex in m.examples:
+                self._add_doc((key, mid, "example", str(ex.example_id)), et.term, ex.language, ex.text)
+
+    def _add_doc(self, doc_id: DocId, lemma: str, language: str, text: str) -> None:
+        if doc_id in self._docs:
+            self._remove_doc(doc_id)
+        tokens = tokenize(text)
+        self._docs[doc_id] = (lemma, language, text, len(tokens))
+        self._by_lemma.setdefault(doc_id[0], set()).add(doc_id)
+        self._total_len += len(tokens)
+        for term, tf in Counter(tokens).items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+    def _remove_doc(self, doc_id: DocId) -> None:
+        _, _, text, length = self._docs.pop(doc_id)
+        self._total_len -= length
+        for term in set(tokenize(text)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional, Dict, Any
+import json
+import logging
+import threading
+from typing import Callable, Iterable, Iterator, Optional, Dict, Any, List, Tuple
 from models import (
     EnglishTerm,
     Meaning,
@@ -8,27 +11,230 @@ from models import (
     Example,
     PartOfSpeech,
     Gender,
+    serialize_entry,
 )
+from models.text import description_key, fold
+from db import instrumentation
 from db.repository import Repository
+from .bloom import LemmaFilter
+from .cache import Cache, NullCache, MISSING
+from .encoded import EncodedJson, encode_json
+from .fuzzy import FuzzyIndex
+from .lessons import LessonIndex
+from .search import SearchIndex
+from .suggest import PrefixIndex
+from .variants import VariantIndex
+
+
+MAX_BATCH_SIZE = 100
+MAX_SUGGESTIONS = 20
+MAX_FUZZY_DISTANCE = 2
+MAX_PAGE_SIZE = 100
+MAX_TERMS_PAGE = 1000
+DELETE_CHUNK_SIZE = 200
+SCAN_PAGE_SIZE = 10000
+
+logger = logging.getLogger(__name__)
+
+_ALIASES = {
+    PartOfSpeech: {"adjective": PartOfSpeech.ADJ, "adverb": PartOfSpeech.ADV},
+    Gender: {},
+}
+
+
+def _batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _coerce(enum_cls, value, field_name: str):
+    if isinstance(value, enum_cls):
+        return value
+    key = str(value or "").strip().lower()
+    for member in enum_cls:
+        if key in (member.value, member.name.lower()):
+            return member
+    if key in _ALIASES[enum_cls]:
+        return _ALIASES[enum_cls][key]
+    raise ValueError(f"invalid {field_name}: {value!r}")
 
 
 class DictionaryService:
-    def __init__(self, repo: Repository) -> None:
+    def __init__(
+        self,
+        repo: Repository,
+        cache: Optional[Cache] = None,
+        lemma_filter: Optional[LemmaFilter] = None,
+    ) -> None:
         self.repo = repo
+        self.cache = cache or NullCache()
+        self.lemma_filter = lemma_filter
+        self.suggestions = PrefixIndex(top_k=MAX_SUGGESTIONS)
+        self.fuzzy = FuzzyIndex(max_distance=MAX_FUZZY_DISTANCE)
+        self.variants = VariantIndex()
+        self._term_indexes = [self.suggestions, self.fuzzy, self.variants]
+        self.search_index = SearchIndex()
+        self.lessons = LessonIndex()
+        self._build_lock = threading.Lock()
+        self._filter_rebuild = threading.Lock()
+        self._filter_check = threading.Lock()
+        # Bumped per cache key on every invalidation, so a load that raced a
+        # write does not put the value it read before the write.
+        self._generations: Dict[Tuple[str, str], int] = {}
+        self._generation_lock = threading.Lock()
 
-    def lookup_english(self, lemma: str) -> Optional[EnglishTerm]:
-        lemma = (lemma or "").strip()
-        if not lemma:
+    @staticmethod
+    def _cache_key(lemma: str) -> Tuple[str, str]:
+        return ("en", lemma.casefold())
+
+    @staticmethod
+    def _encoded_key(key: Tuple[str, str]) -> Tuple[str, str]:
+        return (key[0] + ".json", key[1])
+
+    def resolve_lemma(self, query: str) -> str:
+        """The canonical lemma a query refers to: ``" Lesions "``,
+        ``"LESION"`` and ``"lesión"`` all give ``"lesion"``, ``"coughing"``
+        gives ``"cough"``. Resolved in memory against the variant index;
+        a query matching no known lemma is returned stripped, so a lemma
+        another process added since is still looked up as typed."""
+        query = (query or "").strip()
+        if not query:
             raise ValueError("lemma is required")
-        return self.repo.load_english_term(lemma)
+        self._ensure_built(self.variants)
+        return self.variants.resolve(query) or query
 
-    def add_entry(
+    def build_variant_index(self) -> None:
+        """Build the variant index now instead of on the first lookup."""
+        self._ensure_built(self.variants)
+
+    def lookup_english(self, lemma: str) -> Optional[EnglishTerm]:
+        lemma = self.resolve_lemma(lemma)
+        key = self._cache_key(lemma)
+        et = self.cache.get(key)
+        if et is MISSING:
+            # Filter misses are not cached: the filter may be behind writes
+            # from other processes, and catches up on its own.
+            if not self._may_exist(lemma):
+                return None
+            generation = self._generations.get(key, 0)
+            et = self.repo.load_english_term(lemma)
+            self._fill(key, et, generation)
+        if et:
+            self.suggestions.record_hit("en", et.term)
+        return et
+
+    def lookup_spanish(self, term: str) -> List[EnglishTerm]:
+        term = (term or "").strip()
+        if not term:
+            raise ValueError("term is required")
+        key = ("es", fold(term))
+        entries = self.cache.get(key)
+        if entries is MISSING:
+            generation = self._generations.get(key, 0)
+            entries = self.repo.load_spanish_term(term) or None
+            self._fill(key, entries, generation)
+        return entries or []
+
+    def lookup_many(
+        self, lemmas: Iterable[str]
+    ) -> Tuple[Dict[str, EnglishTerm], List[str]]:
+        wanted = list(dict.fromkeys(
+            lemma.strip() for lemma in lemmas if lemma and lemma.strip()
+        ))
+        if not wanted:
+            raise ValueError("at least one lemma is required")
+        if len(wanted) > MAX_BATCH_SIZE:
+            raise ValueError(f"at most {MAX_BATCH_SIZE} lemmas per batch")
+
+        resolved = {query: self.resolve_lemma(query) for query in wanted}
+        cached = {
+            lemma: self.cache.get(self._cache_key(lemma)) for lemma in resolved.values()
+        }
+        to_load = []
+        for lemma, et in cached.items():
+            if et is MISSING:
+                if self._may_exist(lemma):
+                    to_load.append(lemma)
+                else:
+                    cached[lemma] = None
+        if to_load:
+            generations = {lemma: self._generations.get(self._cache_key(lemma), 0) for lemma in to_load}
+            loaded = self.repo.load_english_terms(to_load)
+            folded = {term.casefold(): et for term, et in loaded.items()}
+            for lemma in to_load:
+                et = loaded.get(lemma) or folded.get(lemma.casefold())
+                self._fill(self._cache_key(lemma), et, generations[lemma])
+                cached[lemma] = et
+
+        found: Dict[str, EnglishTerm] = {}
+        missing: List[str] = []
+        for lemma, resolved_lemma in resolved.items():
+            et = cached[resolved_lemma]
+            if et:
+                found[lemma] = et
+                self.suggestions.record_hit("en", et.term)
+            else:
+                missing.append(lemma)
+        return found, missing
+
+    def _may_exist(self, lemma: str) -> bool:
+        """False when the lemma filter rules ``lemma`` out, so a miss is
+        answered without a repository read."""
+        lemma_filter = self.lemma_filter
+        if lemma_filter is None:
+            return True
+        self._ensure_built(lemma_filter)
+        if lemma_filter.check_due():
+            self._in_background(self._filter_check, "lemma-filter-check", self.check_lemma_filter)
+        if lemma_filter.due():
+            self._rebuild_lemma_filter_in_background()
+        return lemma_filter.might_contain(lemma)
+
+    def check_lemma_filter(self) -> None:
+        """Compare the repository's change marker with the filter's, which
+        marks the filter stale if English lemmas were added or deleted."""
+        if self.lemma_filter is not None:
+            self.lemma_filter.check(self.repo.english_marker())
+
+    def rebuild_lemma_filter(self) -> None:
+        """Rebuild the lemma filter from a scan of every English lemma."""
+        if self.lemma_filter is not None:
+            # Read first, so a lemma added during the scan moves the marker.
+            marker = self.repo.english_marker()
+            self.lemma_filter.build((("en", lemma) for lemma in self._iter_terms("en")), marker)
+
+    def _rebuild_lemma_filter_in_background(self) -> None:
+        self._in_background(self._filter_rebuild, "lemma-filter-rebuild", self.rebuild_lemma_filter)
+
+    @staticmethod
+    def _in_background(lock: threading.Lock, name: str, work: Callable[[], None]) -> None:
+        # One run at a time: a run already in progress covers this request.
+        if not lock.acquire(blocking=False):
+            return
+
+        def run() -> None:
+            try:
+                work()
+            except Exception:
+                logger.exception("%s failed", name)
+            finally:
+                lock.release()
+
+        threading.Thread(target=run, name=name, daemon=True).start()
+
+    def build_entry(
         self,
         lemma: str,
-        pos: PartOfSpeech,
+        pos: PartOfSpeech | str,
         meaning_desc: str,
         spanish_term: str,
-        gender: Gender,
+        gender: Gender | str,
         examples: Iterable[tuple[str, str]] = (),
     ) -> EnglishTerm:
         if not (lemma and lemma.strip()):
@@ -38,53 +244,349 @@ class DictionaryService:
         if not (spanish_term and spanish_term.strip()):
             raise ValueError("spanish_term is required")
 
-        et = EnglishTerm(term=lemma.strip(), pos=pos)
+        et = EnglishTerm(term=lemma.strip(), pos=_coerce(PartOfSpeech, pos, "pos"))
         m = Meaning(description=meaning_desc.strip(), english_term=et)
-        st = SpanishTerm(term=spanish_term.strip(), gender=gender, meaning=m)
-        ex_objs = [
-            Example(language=lang.strip(), text=text.strip(), meaning=m)
-            for (lang, text) in examples
-            if lang and text and lang.strip() and text.strip()
-        ]
+        SpanishTerm(term=spanish_term.strip(), gender=_coerce(Gender, gender, "gender"), meaning=m)
+        for (lang, text) in examples:
+            if lang and text and lang.strip() and text.strip():
+                Example(language=lang.strip(), text=text.strip(), meaning=m)
+        return et
 
-        self.repo.persist_entry_graph(et, m, st, ex_objs)
-        reloaded = self.repo.load_english_term(et.term)
-        return reloaded or et
+    def add_entry(
+        self,
+        lemma: str,
+        pos: PartOfSpeech | str,
+        meaning_desc: str,
+        spanish_term: str,
+        gender: Gender | str,
+        examples: Iterable[tuple[str, str]] = (),
+    ) -> EnglishTerm:
+        et = self.build_entry(lemma, pos, meaning_desc, spanish_term, gender, examples)
+        return self.save_entry(et)
 
-    def serialize_entry(self, et: EnglishTerm) -> Dict[str, Any]:
+    def build_full_entry(
+        self, lemma: str, pos: PartOfSpeech | str, meanings: Iterable[Dict[str, Any]]
+    ) -> EnglishTerm:
+        """Entry graph from a payload with several meanings, each a dict of
+        ``description``, ``spanish_terms`` (``{"term", "gender"}`` dicts) and
+        ``examples`` (``[language, text]`` pairs). Repeated descriptions,
+        Spanish terms and examples are merged."""
+        if not (lemma and lemma.strip()):
+            raise ValueError("lemma is required")
+        if not isinstance(meanings, list) or not meanings:
+            raise ValueError("meanings must be a non-empty list")
+        et = EnglishTerm(term=lemma.strip(), pos=_coerce(PartOfSpeech, pos, "pos"))
+        by_description: Dict[str, Meaning] = {}
+        for item in meanings:
+            if not isinstance(item, dict):
+                raise ValueError("each meaning must be an object")
+            description = str(item.get("description") or "").strip()
+            if not description:
+                raise ValueError("meaning description is required")
+            spanish_terms = item.get("spanish_terms") or []
+            if not isinstance(spanish_terms, list) or not spanish_terms:
+                raise ValueError(f"meaning {description!r} needs at least one Spanish term")
+            m = by_description.get(description_key(description))
+            if m is None:
+                m = by_description[description_key(description)] = Meaning(
+                    description=description, english_term=et
+                )
+            terms = {st.term.casefold() for st in m.spanish_terms}
+            for st in spanish_terms:
+                if not isinstance(st, dict) or not str(st.get("term") or "").strip():
+                    raise ValueError("each Spanish term needs a term")
+                term = str(st["term"]).strip()
+                if term.casefold() not in terms:
+                    terms.add(term.casefold())
+                    SpanishTerm(term=term, gender=_coerce(Gender, st.get("gender"), "gender"), meaning=m)
+            seen = {(ex.language, ex.text) for ex in m.examples}
+            for pair in item.get("examples") or []:
+                if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+                    raise ValueError("examples must be [language, text] pairs")
+                lang, text = (str(v or "").strip() for v in pair)
+                if lang and text and (lang, text) not in seen:
+                    seen.add((lang, text))
+                    Example(language=lang, text=text, meaning=m)
+        return et
+
+    def add_full_entry(
+        self, lemma: str, pos: PartOfSpeech | str, meanings: Iterable[Dict[str, Any]]
+    ) -> EnglishTerm:
+        return self.save_entry(self.build_full_entry(lemma, pos, meanings))
+
+    def save_entry(self, et: EnglishTerm) -> EnglishTerm:
+        """Upsert the entry and return it as stored, merged with the meanings
+        the lemma already had.
+
+        Re-submitting an entry is idempotent: meanings with a description the
+        lemma already has, and examples they already hold, are reused."""
+        stored = self.repo.upsert_entry(et)
+        self._entries_written([stored], submitted=[et])
+        return stored
+
+    def save_entries(self, entries: Iterable[EnglishTerm]) -> None:
+        """``save_entry`` for many entries, committed together."""
+        entries = list(entries)
+        self._entries_written(self.repo.upsert_entries(entries), submitted=entries)
+
+    def add_entries(self, entries: Iterable[EnglishTerm]) -> None:
+        entries = list(entries)
+        self._entries_written(self.repo.persist_entries(entries), submitted=entries)
+
+    def delete_entry(self, lemma: str) -> None:
+        lemma = (lemma or "").strip()
+        if not lemma:
+            raise ValueError("lemma is required")
+        before = self.repo.load_english_term(lemma)
+        orphans = self.repo.delete_entry_by_english_lemma(lemma)
+        self._entries_deleted([lemma], orphans or [], [before] if before else [])
+
+    def delete_entries(self, lemmas: Iterable[str]) -> Dict[str, List[str]]:
+        """Delete many entries at once, ``DELETE_CHUNK_SIZE`` per repository call."""
+        lemmas = list(dict.fromkeys(l.strip() for l in lemmas if l and l.strip()))
+        if not lemmas:
+            raise ValueError("at least one lemma is required")
+        deleted: List[str] = []
+        orphaned: List[str] = []
+        for start in range(0, len(lemmas), DELETE_CHUNK_SIZE):
+            chunk = lemmas[start:start + DELETE_CHUNK_SIZE]
+            before = self.repo.load_english_terms(chunk)
+            found, orphans = self.repo.delete_entries_by_english_lemmas(chunk)
+            self._entries_deleted(found, orphans, before.values())
+            deleted.extend(found)
+            orphaned.extend(orphans)
+        gone = {lemma.casefold() for lemma in deleted}
         return {
-            "term": et.term,
-            "pos": et.pos.value,
-            "term_id": str(et.term_id),
-            "meanings": [
-                {
-                    "meaning_id": str(m.meaning_id),
-                    "description": m.description,
-                    "spanish_terms": [
-                        {
-                            "term_id": str(st.term_id),
-                            "term": st.term,
-                            "gender": st.gender.value,
-                        }
-                        for st in m.spanish_terms
-                    ],
-                    "examples": [
-                        {
-                            "example_id": str(ex.example_id),
-                            "language": ex.language,
-                            "text": ex.text,
-                        }
-                        for ex in m.examples
-                    ],
-                }
-                for m in et.meanings
-            ],
+            "deleted": deleted,
+            "not_found": [lemma for lemma in lemmas if lemma.casefold() not in gone],
+            "orphaned_spanish": orphaned,
         }
 
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, str]]:
+        if not (prefix and prefix.strip()):
+            raise ValueError("prefix is required")
+        self._ensure_built(self.suggestions)
+        return self.suggestions.suggest(prefix, limit)
+
+    def lookup_fuzzy(
+        self, query: str, max_distance: int = MAX_FUZZY_DISTANCE, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        if not (query and query.strip()):
+            raise ValueError("query is required")
+        self._ensure_built(self.fuzzy)
+        return self.fuzzy.search(query, max_distance=max_distance, limit=limit)
+
+    def search(
+        self, query: str, page: int = 1, per_page: int = 10, language: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if not (query and query.strip()):
+            raise ValueError("query is required")
+        if page < 1 or not 1 <= per_page <= MAX_PAGE_SIZE:
+            raise ValueError(f"page must be >= 1 and per_page between 1 and {MAX_PAGE_SIZE}")
+        self._ensure_built(self.search_index)
+        total, results = self.search_index.search(
+            query, offset=(page - 1) * per_page, limit=per_page, language=language
+        )
+        return {
+            "query": query,
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "results": results,
+        }
+
+    def iter_entries(self, batch_size: int = 500) -> Iterator[EnglishTerm]:
+        """Every entry graph in lemma order, loaded ``batch_size`` at a time."""
+        after = None
+        while True:
+            lemmas = self.repo.list_terms("en", after=after, limit=batch_size)
+            if not lemmas:
+                return
+            loaded = self.repo.load_english_terms(lemmas)
+            folded = {term.casefold(): et for term, et in loaded.items()}
+            for lemma in lemmas:
+                et = loaded.get(lemma) or folded.get(lemma.casefold())
+                if et:
+                    yield et
+            if len(lemmas) < batch_size:
+                return
+            after = lemmas[-1]
+
+    def list_terms_page(
+        self, language: str = "en", after: Optional[str] = None, limit: int = 100
+    ) -> Dict[str, Any]:
+        """One keyset page of sorted terms. Pass ``next`` back as ``after``
+        for the following page; it is None on the last one."""
+        if language not in ("en", "es"):
+            raise ValueError(f"invalid language: {language!r}")
+        if not 1 <= limit <= MAX_TERMS_PAGE:
+            raise ValueError(f"limit must be between 1 and {MAX_TERMS_PAGE}")
+        # One extra row tells whether another page follows.
+        terms = self.repo.list_terms(language, after=after or None, limit=limit + 1)
+        more = len(terms) > limit
+        terms = terms[:limit]
+        return {"language": language, "terms": terms, "next": terms[-1] if more else None}
+
+    def export_ndjson(self, batch_size: int = 500) -> Iterator[bytes]:
+        """Every entry, serialized like ``serialize_entry``, as NDJSON.
+
+        Yields one chunk of lines per keyset batch of ``iter_entries``, so
+        memory stays bounded by ``batch_size`` whatever the dictionary size.
+        """
+        for batch in _batched(self.iter_entries(batch_size), batch_size):
+            lines = [
+                json.dumps(serialize_entry(et), ensure_ascii=False, separators=(",", ":"))
+                for et in batch
+            ]
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+    def _ensure_built(self, index) -> None:
+        if index.built:
+            return
+        with self._build_lock:
+            if index.built:
+                return
+            if index is self.search_index or index is self.lessons:
+                index.build(self.iter_entries())
+            elif index is self.lemma_filter:
+                self.rebuild_lemma_filter()
+            elif index is self.variants:
+                index.build(("en", lemma) for lemma in self._iter_terms("en"))
+            else:
+                index.build(
+                    (lang, term) for lang in ("en", "es") for term in self._iter_terms(lang)
+                )
+
+    def _iter_terms(self, language: str) -> Iterator[str]:
+        after = None
+        while True:
+            page = self.repo.list_terms(language, after=after, limit=SCAN_PAGE_SIZE)
+            yield from page
+            if len(page) < SCAN_PAGE_SIZE:
+                return
+            after = page[-1]
+
+    @staticmethod
+    def _spanish_cache_keys(entries: Iterable[EnglishTerm]) -> List[Tuple[str, str]]:
+        return [
+            ("es", fold(st.term))
+            for et in entries for m in et.meanings for st in m.spanish_terms
+        ]
+
+    def _invalidate(self, keys: Iterable[Tuple[str, str]]) -> None:
+        keys = list(keys)
+        with self._generation_lock:
+            for key in keys:
+                self._generations[key] = self._generations.get(key, 0) + 1
+        self.cache.invalidate(keys + [self._encoded_key(key) for key in keys])
+
+    def _fill(
+        self,
+        key: Tuple[str, str],
+        value: Any,
+        generation: int,
+        cache_key: Optional[Tuple[str, str]] = None,
+    ) -> None:
+        """Cache a value loaded for ``key`` unless ``key`` was invalidated
+        since ``generation`` was read, i.e. while the load ran."""
+        with self._generation_lock:
+            if self._generations.get(key, 0) == generation:
+                self.cache.put(cache_key or key, value)
+
+    def _entries_written(
+        self, entries: Iterable[EnglishTerm], submitted: Iterable[EnglishTerm] = ()
+    ) -> None:
+        # ``submitted`` are the entries as sent, whose lemma may be spelled
+        # differently from the stored row it was merged into.
+        entries = list(entries)
+        self._invalidate([self._cache_key(et.term) for et in [*entries, *submitted]])
+        self._invalidate(self._spanish_cache_keys(entries))
+        if self.lemma_filter is not None:
+            # Even before the first build: a scan already running may have
+            # passed these lemmas, and the filter replays adds made during it.
+            for et in entries:
+                self.lemma_filter.add("en", et.term)
+        for index in self._term_indexes:
+            if index.built:
+                for et in entries:
+                    index.add("en", et.term)
+                    for m in et.meanings:
+                        for st in m.spanish_terms:
+                            index.add("es", st.term)
+        if self.search_index.built:
+            for et in entries:
+                self.search_index.add_entry(et)
+        if self.lessons.built:
+            for et in entries:
+                self.lessons.add_entry(et)
+
+    def _entries_deleted(
+        self,
+        lemmas: Iterable[str],
+        orphaned_spanish: Iterable[str],
+        before: Iterable[EnglishTerm] = (),
+    ) -> None:
+        lemmas = list(lemmas)
+        self._invalidate([self._cache_key(lemma) for lemma in lemmas])
+        self._invalidate(self._spanish_cache_keys(before))
+        orphaned_spanish = list(orphaned_spanish)
+        if self.lemma_filter is not None:
+            for lemma in lemmas:
+                self.lemma_filter.remove("en", lemma)
+        for index in self._term_indexes:
+            if index.built:
+                for lemma in lemmas:
+                    index.remove("en", lemma)
+                for term in orphaned_spanish:
+                    index.remove("es", term)
+        if self.search_index.built:
+            for lemma in lemmas:
+                self.search_index.remove_entry(lemma)
+        if self.lessons.built:
+            for lemma in lemmas:
+                self.lessons.remove_entry(lemma)
+
+    def serialize_entry(self, et: EnglishTerm) -> Dict[str, Any]:
+        with instrumentation.serializing():
+            return serialize_entry(et)
+
+    def lookup_english_encoded(self, lemma: str) -> Optional[EncodedJson]:
+        """The serialized entry as JSON bytes plus ETag, encoded once per
+        version of the entry and cached until a write or delete touches it.
+        Variants share the canonical lemma's bytes; ``term`` tells which
+        lemma the query resolved to."""
+        lemma = self.resolve_lemma(lemma)
+        key = self._encoded_key(self._cache_key(lemma))
+        encoded = self.cache.get(key)
+        if encoded is MISSING:
+            generation = self._generations.get(self._cache_key(lemma), 0)
+            et = self.lookup_english(lemma)
+            if et is None and self.cache.get(self._cache_key(lemma)) is MISSING:
+                return None  # a lemma filter miss, which is not cached either
+            with instrumentation.serializing():
+                encoded = encode_json(serialize_entry(et), term=et.term) if et else None
+            self._fill(self._cache_key(lemma), encoded, generation, cache_key=key)
+        elif encoded:
+            self.suggestions.record_hit("en", encoded.term)
+        return encoded
+
     def lookup_english_as_dict(self, lemma: str) -> Optional[Dict[str, Any]]:
         et = self.lookup_english(lemma)
         return self.serialize_entry(et) if et else None
 
+    def lookup_spanish_as_dict(self, term: str) -> Optional[Dict[str, Any]]:
+        entries = self.lookup_spanish(term)
+        if not entries:
+            return None
+        return {"term": term.strip(), "entries": [self.serialize_entry(et) for et in entries]}
+
+    def lookup_many_as_dict(self, lemmas: Iterable[str]) -> Dict[str, Any]:
+        found, missing = self.lookup_many(lemmas)
+        return {
+            "entries": {lemma: self.serialize_entry(et) for lemma, et in found.items()},
+            "missing": missing,
+        }
+
     def add_entry_as_dict(
         self,
         lemma: str,
@@ -97,12 +599,35 @@ class DictionaryService:
         et = self.add_entry(lemma, pos, meaning_desc, spanish_term, gender, examples)
         return self.serialize_entry(et)
 
-    def get_english_lesson(self) -> dict:
-        return {
-        "lesson_title": "Basic Medical Terms",
-        "terms": [
-            {"english": "fever", "spanish": "fiebre", "pos": "noun"},
-            {"english": "cough", "spanish": "tos", "pos": "noun"},
-            {"english": "headache", "spanish": "dolor de cabeza", "pos": "noun"},
-            ]
-        }
+    def add_full_entry_as_dict(
+        self, lemma: str, pos: PartOfSpeech | str, meanings: Iterable[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return self.serialize_entry(self.add_full_entry(lemma, pos, meanings))
+
+    def get_english_lesson_encoded(
+        self,
+        topic: Optional[str] = None,
+        pos: Optional[PartOfSpeech | str] = None,
+        difficulty: Optional[str] = None,
+        mode: str = "random",
+        seed: int = 0,
+        page: int = 1,
+        per_page: int = 10,
+    ) -> EncodedJson:
+        """A page of lesson cards drawn from the materialized lesson set for
+        the filters; the same arguments give the same page until the
+        dictionary changes."""
+        pos = _coerce(PartOfSpeech, pos, "pos") if pos else None
+        self._ensure_built(self.lessons)
+        return self.lessons.lesson(
+            topic=(topic or "").strip().lower() or None,
+            pos=pos,
+            difficulty=(difficulty or "").strip().lower() or None,
+            mode=(mode or "random").strip().lower(),
+            seed=seed,
+            page=page,
+            per_page=per_page,
+        )
+
+    def get_english_lesson(self, **filters: Any) -> dict:
+        return json.loads(self.get_english_lesson_encoded(**filters).body)
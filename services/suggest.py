@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import bisect
+import heapq
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+
+from models.text import fold
+
+_SEP = "\x1f"
+_END = "\U0010ffff"
+
+
+def _entry(language: str, term: str) -> str:
+    return f"{fold(term)}{_SEP}{language}{_SEP}{term}"
+
+
+class PrefixIndex:
+    """Sorted array of folded terms answering ranked prefix queries.
+
+    Each term is stored once as ``"<folded><SEP><lang><SEP><term>"`` in a
+    sorted list, so a prefix maps to a contiguous slice found with
+    ``bisect``. Matches are ranked by lookup count, then by length. Slices
+    small enough to rank on the fly are scanned directly; for wider
+    prefixes the top ``top_k`` matches are kept in a per-prefix cache that
+    add, remove and ``record_hit`` maintain incrementally.
+
+    Adds and removes do not shift the array. They are buffered and merged
+    into it in one pass by the next query that scans it, or once
+    ``merge_limit`` of them are pending.
+    """
+
+    def __init__(self, top_k: int = 20, scan_limit: int = 512, merge_limit: int = 1024) -> None:
+        self.top_k = top_k
+        self.scan_limit = scan_limit
+        self.merge_limit = merge_limit
+        self._entries: List[str] = []
+        # Pending writes: ``_added`` is disjoint from ``_entries`` and
+        # ``_removed`` a subset of it.
+        self._added: Set[str] = set()
+        self._removed: Set[str] = set()
+        self._hits: Counter = Counter()
+        self._top: Dict[str, List[str]] = {}
+        self._lock = threading.RLock()
+        self.built = False
+
+    def __len__(self) -> int:
+        return len(self._entries) - len(self._removed) + len(self._added)
+
+    def build(self, terms: Iterable[Tuple[str, str]]) -> None:
+        entries = sorted({_entry(lang, term) for lang, term in terms})
+        with self._lock:
+            self._entries = entries
+            self._added.clear()
+            self._removed.clear()
+            self._top.clear()
+            self.built = True
+
+    def add(self, language: str, term: str) -> None:
+        entry = _entry(language, term)
+        with self._lock:
+            if entry in self._removed:
+                self._removed.discard(entry)
+            elif entry in self._added or self._stored(entry):
+                return
+            else:
+                self._added.add(entry)
+                self._merge_if_full()
+            for prefix in self._cached_prefixes(entry):
+                self._offer(prefix, entry)
+
+    def remove(self, language: str, term: str) -> None:
+        key = f"{fold(term)}{_SEP}{language}{_SEP}"
+        with self._lock:
+            lo = bisect.bisect_left(self._entries, key)
+            hi = bisect.bisect_left(self._entries, key + _END)
+            doomed = [
+                e for e in [*self._entries[lo:hi], *self._added]
+                if e.startswith(key) and e[len(key):].casefold() == term.casefold()
+                and e not in self._removed
+            ]
+            for entry in doomed:
+                if entry in self._added:
+                    self._added.discard(entry)
+                else:
+                    self._removed.add(entry)
+                self._hits.pop(entry, None)
+                for prefix in self._cached_prefixes(entry):
+                    if entry in self._top[prefix]:
+                        del self._top[prefix]
+            self._merge_if_full()
+
+    def record_hit(self, language: str, term: str) -> None:
+        entry = _entry(language, term)
+        with self._lock:
+            self._hits[entry] += 1
+            for prefix in self._cached_prefixes(entry):
+                self._offer(prefix, entry)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, str]]:
+        key = fold(prefix)
+        if not key:
+            return []
+        limit = max(1, min(limit, self.top_k))
+        with self._lock:
+            top = self._top.get(key)
+            if top is None:
+                self._merge()
+                lo = bisect.bisect_left(self._entries, key)
+                hi = bisect.bisect_left(self._entries, key + _END)
+                if hi - lo <= self.scan_limit:
+                    top = heapq.nsmallest(limit, self._entries[lo:hi], key=self._rank)
+                else:
+                    top = self._top[key] = heapq.nsmallest(
+                        self.top_k, self._entries[lo:hi], key=self._rank
+                    )
+            top = top[:limit]
+        results = []
+        for entry in top:
+            _, language, term = entry.split(_SEP, 2)
+            results.append({"term": term, "language": language})
+        return results
+
+    def _stored(self, entry: str) -> bool:
+        i = bisect.bisect_left(self._entries, entry)
+        return i < len(self._entries) and self._entries[i] == entry
+
+    def _merge_if_full(self) -> None:
+        if len(self._added) + len(self._removed) >= self.merge_limit:
+            self._merge()
+
+    def _merge(self) -> None:
+        # One pass over the array for all pending writes, instead of an
+        # O(n) insert or remove per write.
+        if not (self._added or self._removed):
+            return
+        removed = self._removed
+        kept = (e for e in self._entries if e not in removed) if removed else self._entries
+        self._entries = list(heapq.merge(kept, sorted(self._added)))
+        self._added = set()
+        self._removed = set()
+
+    def _rank(self, entry: str) -> Tuple[int, int, str]:
+        return (-self._hits.get(entry, 0), len(entry), entry)
+
+    def _cached_prefixes(self, entry: str) -> List[str]:
+        folded = entry.split(_SEP, 1)[0]
+        return [folded[:i] for i in range(1, len(folded) + 1) if folded[:i] in self._top]
+
+    def _offer(self, prefix: str, entry: str) -> None:
+        top = self._top[prefix]
+        if entry in top:
+            top.sort(key=self._rank)
+        elif len(top) < self.top_k or self._rank(entry) < self._rank(top[-1]):
+            bisect.insort(top, entry, key=self._rank)
+            del top[self.top_k:]
@@ -0,0 +1,68 @@
+"""Record API traffic as JSONL for ``tools.replay``.
+
+Each line is one request::
+
+    {"ts": 1760000000.123, "method": "GET", "path": "/api/v1/lookup",
+     "query": "english=fever", "body": null, "status": 200, "ms": 0.84}
+
+``ts`` is the wall-clock arrival time, so the replay can reproduce the
+spacing between requests. JSON bodies are stored parsed; other bodies
+are stored as text. Headers are not recorded, so credentials never reach
+the log.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Optional
+
+# Never recorded: scraping the metrics is not traffic worth replaying.
+SKIPPED_PATHS = frozenset({"/api/v1/metrics"})
+
+
+def _decode_body(body: bytes) -> Any:
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body.decode("utf-8", errors="replace")
+
+
+class TrafficRecorder:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        query: str,
+        body: bytes,
+        status: int,
+        seconds: float,
+        started: Optional[float] = None,
+    ) -> None:
+        if path in SKIPPED_PATHS:
+            return
+        line = json.dumps({
+            "ts": round(started if started is not None else time.time() - seconds, 6),
+            "method": method,
+            "path": path,
+            "query": query,
+            "body": _decode_body(body),
+            "status": status,
+            "ms": round(seconds * 1000, 3),
+        }, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.recorded += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from models.text import fold
+
+_VOWELS = "aeiou"
+_SIBILANT = re.compile(r"(s|x|z|ch|sh)$")
+# A final consonant-vowel-consonant in a one-syllable word doubles before
+# -ing/-ed: "stab" -> "stabbing".
+_DOUBLES = re.compile(r"^[^aeiou]*[aeiou][b-df-hj-np-tv-z]$")
+
+# Plurals and past forms no suffix rule produces, by lemma word.
+IRREGULAR: Dict[str, Tuple[str, ...]] = {
+    "tooth": ("teeth",),
+    "foot": ("feet",),
+    "man": ("men",),
+    "woman": ("women",),
+    "child": ("children",),
+    "mouse": ("mice",),
+    "louse": ("lice",),
+    "ovum": ("ova",),
+    "bleed": ("bled",),
+    "feel": ("felt",),
+    "break": ("broke", "broken"),
+    "swell": ("swollen",),
+    "take": ("took", "taken"),
+    "eat": ("ate", "eaten"),
+    "fall": ("fell", "fallen"),
+    "sleep": ("slept",),
+}
+
+# Latin and Greek plurals common in medical terms, as (lemma ending, plural ending).
+_CLASSICAL = (
+    ("itis", "itides"),
+    ("is", "es"),
+    ("um", "a"),
+    ("us", "i"),
+    ("ma", "mata"),
+    ("a", "ae"),
+    ("ex", "ices"),
+    ("ix", "ices"),
+    ("on", "a"),  # ganglion, criterion; "-sion"/"-tion" words are skipped below
+    ("en", "ina"),
+)
+
+
+def normalize(text: str) -> str:
+    """Lookup key for a lemma or query: case- and accent-folded (which also
+    makes composed and decomposed Unicode equal), with whitespace collapsed."""
+    if text.isascii():
+        return " ".join(text.lower().split())
+    return " ".join(fold(text).split())
+
+
+def inflections(word: str) -> Set[str]:
+    """Plural and verb forms of a folded word. Rules are applied to every
+    word whatever its part of speech, so some forms are not real English;
+    they only matter if someone types them."""
+    forms: Set[str] = set(IRREGULAR.get(word, ()))
+    if len(word) < 2 or not word.replace("-", "").isalpha():
+        return forms
+    last, stem = word[-1], word[:-1]
+
+    # Plurals and the third person.
+    if _SIBILANT.search(word):
+        forms.add(word + "es")
+    elif last == "y" and word[-2] not in _VOWELS:
+        forms.add(stem + "ies")
+    else:
+        forms.add(word + "s")
+        if last == "o":
+            forms.add(word + "es")
+        elif last == "f":
+            forms.add(stem + "ves")
+        elif word.endswith("fe"):
+            forms.add(word[:-2] + "ves")
+    for ending, plural in _CLASSICAL:
+        if ending == "on" and word.endswith(("sion", "tion", "xion")):
+            break
+        if word.endswith(ending) and len(word) > len(ending) + 2:
+            forms.add(word[:-len(ending)] + plural)
+            break
+
+    # Present participle and past.
+    if word.endswith("ie"):
+        forms.update((word[:-2] + "ying", word + "d"))
+    elif last == "e" and word[-2] not in "eoy":
+        forms.update((stem + "ing", word + "d"))
+    elif last == "y" and word[-2] not in _VOWELS:
+        forms.update((word + "ing", stem + "ied"))
+    else:
+        forms.update((word + "ing", word + "ed"))
+        if _DOUBLES.match(word) and last not in "wxy":
+            forms.update((word + last + "ing", word + last + "ed"))
+    forms.discard(word)
+    return forms
+
+
+def variants(lemma: str) -> Set[str]:
+    """Normalized forms that resolve to ``lemma``, other than its own key.
+    Only the last word of a multi-word lemma is inflected."""
+    key = normalize(lemma)
+    head, _, last = key.rpartition(" ")
+    prefix = head + " " if head else ""
+    return {prefix + form for form in inflections(last)}
+
+
+class VariantIndex:
+    """In-memory map from normalized lemmas and their inflected forms to
+    the canonical English lemma.
+
+    Variants are generated forward from the lemmas in the dictionary, so a
+    query only ever resolves to an entry that exists. A lemma's own key
+    always beats another lemma's variant: if "fevers" were a lemma too,
+    it would resolve to itself rather than to "fever".
+    When two lemmas claim the same key, the first keeps it and the other is
+    remembered, so removing the first hands the key over. Spanish terms are
+    ignored.
+    """
+
+    def __init__(self) -> None:
+        self._lemmas: Dict[str, str] = {}
+        self._variants: Dict[str, str] = {}
+        self._shadowed: Dict[Tuple[bool, str], List[str]] = {}
+        self._lock = threading.RLock()
+        self.built = False
+
+    def __len__(self) -> int:
+        return len(self._lemmas)
+
+    def build(self, terms: Iterable[Tuple[str, str]]) -> None:
+        with self._lock:
+            self._lemmas.clear()
+            self._variants.clear()
+            self._shadowed.clear()
+            for language, term in terms:
+                self.add(language, term)
+            self.built = True
+
+    def add(self, language: str, term: str) -> None:
+        if language != "en":
+            return
+        with self._lock:
+            self._put(True, normalize(term), term)
+            for variant in variants(term):
+                self._put(False, variant, term)
+
+    def remove(self, language: str, term: str) -> None:
+        if language != "en":
+            return
+        key = normalize(term)
+        with self._lock:
+            lemma = self._lemmas.get(key)
+            if lemma is None or lemma.casefold() != term.casefold():
+                lemma = next(
+                    (l for l in self._shadowed.get((True, key), ()) if l.casefold() == term.casefold()),
+                    None,
+                )
+            if lemma is None:
+                return
+            self._drop(True, key, lemma)
+            for variant in variants(lemma):
+                self._drop(False, variant, lemma)
+
+    def resolve(self, query: str) -> Optional[str]:
+        """The canonical lemma for ``query``, or None if no known lemma or
+        variant matches."""
+        key = normalize(query)
+        return self._lemmas.get(key) or self._variants.get(key)
+
+    def _put(self, is_lemma: bool, key: str, lemma: str) -> None:
+        table = self._lemmas if is_lemma else self._variants
+        current = table.setdefault(key, lemma)
+        if current.casefold() != lemma.casefold():
+            shadowed = self._shadowed.setdefault((is_lemma, key), [])
+            if lemma.casefold() not in (l.casefold() for l in shadowed):
+                shadowed.append(lemma)
+
+    def _drop(self, is_lemma: bool, key: str, lemma: str) -> None:
+        table = self._lemmas if is_lemma else self._variants
+        shadowed = self._shadowed.get((is_lemma, key))
+        if table.get(key) == lemma:
+            if shadowed:
+                table[key] = shadowed.pop(0)
+            else:
+                del table[key]
+        elif shadowed and lemma in shadowed:
+            shadowed.remove(lemma)
+        if shadowed == []:
+            del self._shadowed[(is_lemma, key)]
@@ -0,0 +1,256 @@
+"""Write-behind mode for ``/api/v1/add``.
+
+``WriteBehindQueue.submit`` validates an add, gives it an id and queues
+it. Nothing is written yet. A background thread takes up to
+``batch_size`` queued entries at a time and commits them together with
+``DictionaryService.save_entries``, which is one transaction on the SQL
+backends. Callers poll ``status(id)`` for ``queued``, ``committed`` or
+``failed``.
+
+Durability:
+
+- ``close()`` flushes the queue by default. The apps call it on shutdown.
+- With ``spill_path`` every accepted add is appended to a JSONL journal
+  before it is acknowledged, and committed ids are appended after each
+  batch. On start, adds that were journalled but never committed are
+  queued again. The journal is truncated whenever the queue drains.
+  ``fsync=True`` also syncs each append to disk.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from db.instrumentation import Histogram
+from models import EnglishTerm
+from models.ids import uuid7
+
+
+class QueueFull(Exception):
+    """Raised when an add is refused because the queue is at capacity or closed."""
+
+
+def full_payload(data: Any) -> Dict[str, Any]:
+    """An ``/api/v1/add`` body in the ``meanings`` form, converting the
+    flat single-meaning form."""
+    if not isinstance(data, dict) or not all(field in data for field in ("lemma", "pos")):
+        raise ValueError("invalid payload")
+    if "meanings" in data:
+        return {"lemma": data["lemma"], "pos": data["pos"], "meanings": data["meanings"]}
+    if not all(field in data for field in ("meaning_desc", "spanish_term", "gender")):
+        raise ValueError("invalid payload")
+    return {
+        "lemma": data["lemma"],
+        "pos": data["pos"],
+        "meanings": [{
+            "description": data["meaning_desc"],
+            "spanish_terms": [{"term": data["spanish_term"], "gender": data["gender"]}],
+            "examples": data.get("examples") or [],
+        }],
+    }
+
+
+# (id, payload, entry, submitted at)
+_Item = Tuple[str, Dict[str, Any], EnglishTerm, float]
+
+
+class WriteBehindQueue:
+    def __init__(
+        self,
+        service,
+        max_size: int = 10_000,
+        batch_size: int = 200,
+        linger: float = 0.005,
+        spill_path: Optional[str] = None,
+        fsync: bool = False,
+        max_statuses: int = 100_000,
+    ) -> None:
+        if max_size < 1 or batch_size < 1:
+            raise ValueError("max_size and batch_size must be at least 1")
+        self.service = service
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.linger = linger
+        self.spill_path = spill_path
+        self.fsync = fsync
+        self.max_statuses = max_statuses
+        self.commit_seconds = Histogram()
+        self.delay_seconds = Histogram()
+        self._items: Deque[_Item] = deque()
+        self._statuses: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._drain = True
+        self._in_flight = 0
+        self._submitted = self._committed = self._failed = self._rejected = self._batches = 0
+        self._journal = None
+        if spill_path:
+            self._recover(spill_path)
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate and queue one add; returns its status record."""
+        payload = full_payload(payload)
+        et = self.service.build_full_entry(payload["lemma"], payload["pos"], payload["meanings"])
+        with self._cond:
+            if self._closed:
+                raise QueueFull("write-behind queue is closed")
+            if len(self._items) + self._in_flight >= self.max_size:
+                self._rejected += 1
+                raise QueueFull(f"{self.max_size} adds already queued")
+            return self._enqueue(str(uuid7()), payload, et, journal=True)
+
+    def _enqueue(self, id: str, payload: Dict[str, Any], et: EnglishTerm, journal: bool) -> Dict[str, Any]:
+        if journal:
+            self._append({"op": "add", "id": id, "payload": payload})
+        self._items.append((id, payload, et, time.monotonic()))
+        status = {"id": id, "status": "queued", "lemma": et.term}
+        self._statuses[id] = status
+        self._submitted += 1
+        self._cond.notify_all()
+        return dict(status)
+
+    def status(self, id: str) -> Optional[Dict[str, Any]]:
+        with self._cond:
+            status = self._statuses.get(id)
+            return dict(status) if status else None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is committed or failed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._items or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def close(self, flush: bool = True) -> None:
+        """Stop accepting adds. With ``flush`` the queue is committed first;
+        without it, queued adds stay in the spill file for the next start."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._drain = flush
+            self._cond.notify_all()
+        self._thread.join()
+        if self._journal:
+            self._journal.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "depth": len(self._items),
+                "in_flight": self._in_flight,
+                "max_size": self.max_size,
+                "submitted": self._submitted,
+                "committed": self._committed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "batches": self._batches,
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._items and not self._closed:
+                    self._cond.wait()
+                if self._closed and (not self._drain or not self._items):
+                    return
+            # Let a burst accumulate so it commits as one batch.
+            if self.linger and len(self._items) < self.batch_size:
+                time.sleep(self.linger)
+            with self._cond:
+                batch = [self._items.popleft() for _ in range(min(self.batch_size, len(self._items)))]
+                self._in_flight += len(batch)
+            self._commit(batch)
+
+    def _commit(self, batch: List[_Item]) -> None:
+        errors: Dict[str, str] = {}
+        started = time.perf_counter()
+        try:
+            self.service.save_entries([et for _, _, et, _ in batch])
+        except Exception:
+            # Retry one by one so a single bad entry does not fail the batch.
+            for id, _, et, _ in batch:
+                try:
+                    self.service.save_entry(et)
+                except Exception as e:
+                    errors[id] = str(e)
+        self.commit_seconds.observe(time.perf_counter() - started)
+        done = time.monotonic()
+        with self._cond:
+            for id, _, _, submitted in batch:
+                self.delay_seconds.observe(done - submitted)
+                status = self._statuses.get(id)
+                if status is not None:
+                    if id in errors:
+                        status.update(status="failed", error=errors[id])
+                    else:
+                        status["status"] = "committed"
+            self._failed += len(errors)
+            self._committed += len(batch) - len(errors)
+            self._batches += 1
+            self._in_flight -= len(batch)
+            if self._journal:
+                if self._items or self._in_flight:
+                    self._append({"op": "done", "ids": [id for id, _, _, _ in batch]})
+                else:
+                    self._journal.seek(0)
+                    self._journal.truncate()
+            while len(self._statuses) > self.max_statuses:
+                oldest = next(iter(self._statuses))
+                if self._statuses[oldest]["status"] == "queued":
+                    break
+                del self._statuses[oldest]
+            self._cond.notify_all()
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        if self._journal is None:
+            return
+        self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def _recover(self, path: str) -> None:
+        pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # a torn last line from a crash
+                    if record.get("op") == "add":
+                        pending[record["id"]] = record["payload"]
+                    elif record.get("op") == "done":
+                        for id in record["ids"]:
+                            pending.pop(id, None)
+        # Compact the journal to the pending adds in a side file and swap it in,
+        # so a crash while rewriting still leaves the old journal in place.
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for id, payload in pending.items():
+                f.write(json.dumps({"op": "add", "id": id, "payload": payload}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        self._journal = open(path, "a", encoding="utf-8")
+        with self._cond:
+            for id, payload in pending.items():
+                try:
+                    et = self.service.build_full_entry(payload["lemma"], payload["pos"], payload["meanings"])
+                except (KeyError, ValueError) as e:
+                    self._statuses[id] = {"id": id, "status": "failed", "lemma": payload.get("lemma"),
+                                          "error": str(e)}
+                    self._failed += 1
+                    continue
+                self._enqueue(id, payload, et, journal=False)
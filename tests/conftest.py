@@ -0,0 +1,42 @@
+import pytest
+
+from db.memory_repository import InMemoryRepository
+from models import EnglishTerm, PartOfSpeech
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingRepo(InMemoryRepository):
+    """In-memory repository counting ``load_english_term(s)`` calls, seeded
+    with bare entries for ``lemmas``."""
+
+    def __init__(self, lemmas=()):
+        super().__init__()
+        self.loads = 0
+        for lemma in lemmas:
+            self.insert_english_term(EnglishTerm(term=lemma, pos=PartOfSpeech.NOUN))
+
+    def load_english_term(self, lemma):
+        self.loads += 1
+        return super().load_english_term(lemma)
+
+    def load_english_terms(self, lemmas):
+        self.loads += 1
+        return super().load_english_terms(lemmas)
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def counting_repo():
+    """``CountingRepo``, called as ``counting_repo(lemmas)``."""
+    return CountingRepo
@@ -0,0 +1,291 @@
+import json
+
+import pytest
+
+from api.app import create_app
+
+
+@pytest.fixture
+def client():
+    app = create_app({"REPOSITORY_BACKEND": "memory"})
+    return app.test_client()
+
+
+def _add(client, lemma="fever", spanish="fiebre"):
+    return client.post("/api/v1/add", json={
+        "lemma": lemma,
+        "pos": "noun",
+        "meaning_desc": "An elevated body temperature.",
+        "spanish_term": spanish,
+        "gender": "feminine",
+        "examples": [["en", "He has a fever."], ["es", "Él tiene fiebre."]],
+    })
+
+
+def test_add_then_lookup(client):
+    assert _add(client).status_code == 200
+    resp = client.get("/api/v1/lookup?english=fever")
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["term"] == "fever"
+    assert body["meanings"][0]["spanish_terms"][0]["term"] == "fiebre"
+    assert len(body["meanings"][0]["examples"]) == 2
+    assert client.get("/api/v1/lookup?english=xyz").status_code == 404
+
+
+def test_lookup_resolves_variants(client):
+    _add(client, "cough", "tos")
+    fevers = client.get("/api/v1/lookup?english=Fevers")
+    assert fevers.status_code == 404
+    _add(client)
+    fevers = client.get("/api/v1/lookup?english=Fevers")
+    assert fevers.status_code == 200 and fevers.get_json()["term"] == "fever"
+    assert fevers.headers["X-Resolved-Lemma"] == "fever"
+    coughing = client.get("/api/v1/lookup?english=%20coughing%20")
+    assert coughing.headers["X-Resolved-Lemma"] == "cough"
+    assert coughing.get_etag() == client.get("/api/v1/lookup?english=cough").get_etag()
+
+
+def test_variant_index_is_built_at_startup():
+    from db.memory_repository import InMemoryRepository
+    from services.service import DictionaryService
+
+    repo = InMemoryRepository()
+    DictionaryService(repo).add_entry("fever", "noun", "An elevated body temperature.", "fiebre", "f")
+    client = create_app({"REPOSITORY": repo}).test_client()
+    repo.list_terms = None  # a scan during the request would fail
+    assert client.get("/api/v1/lookup?english=fevers").get_json()["term"] == "fever"
+
+
+def test_lookup_batch(client):
+    _add(client)
+    _add(client, "cough", "tos")
+    resp = client.post("/api/v1/lookup/batch", json={"english": ["fever", "cough", "xyz"]})
+    body = resp.get_json()
+    assert set(body["entries"]) == {"fever", "cough"}
+    assert body["missing"] == ["xyz"]
+    assert client.post("/api/v1/lookup/batch", json={"english": "fever"}).status_code == 400
+
+
+def test_suggest_tracks_adds_and_deletes(client):
+    _add(client)
+    assert client.get("/api/v1/suggest?prefix=fi").get_json()["suggestions"] == [
+        {"term": "fiebre", "language": "es"}
+    ]
+    _add(client, "fiebre-test", "fiebre")
+    client.get("/api/v1/lookup?english=fiebre-test")
+    terms = [s["term"] for s in client.get("/api/v1/suggest?prefix=fi&limit=5").get_json()["suggestions"]]
+    assert terms == ["fiebre-test", "fiebre"]
+    assert client.get("/api/v1/suggest").status_code == 400
+
+
+def test_fuzzy_lookup_fallback(client):
+    _add(client, "hemorrhage", "hemorragia")
+    assert client.get("/api/v1/lookup?english=hemorrage").status_code == 404
+    resp = client.get("/api/v1/lookup?english=hemorrage&fuzzy=1")
+    assert resp.status_code == 200
+    assert resp.get_json()["candidates"][0]["term"] == "hemorrhage"
+    assert client.get("/api/v1/lookup?english=qqqqqq&fuzzy=1").status_code == 404
+
+
+def test_lookup_spanish(client):
+    _add(client, "lesion", "lesión")
+    resp = client.get("/api/v1/lookup?spanish=LESION")
+    assert resp.status_code == 200
+    assert [e["term"] for e in resp.get_json()["entries"]] == ["lesion"]
+    _add(client, "injury", "lesión")
+    assert len(client.get("/api/v1/lookup?spanish=lesion").get_json()["entries"]) == 2
+    assert client.get("/api/v1/lookup?spanish=nada").status_code == 404
+
+
+def test_search_examples(client):
+    _add(client)
+    _add(client, "pyrexia", "pirexia")
+    body = client.get("/api/v1/search?q=tiene+fiebre&language=es").get_json()
+    assert body["total"] == 2
+    assert "<mark>fiebre</mark>" in body["results"][0]["snippet"]
+    assert client.get("/api/v1/search?q=fever&per_page=1").get_json()["total"] == 2
+    assert client.get("/api/v1/search").status_code == 400
+    assert client.get("/api/v1/search?q=fever&per_page=500").status_code == 400
+
+
+def test_lookup_etag_and_conditional_get(client):
+    _add(client)
+    resp = client.get("/api/v1/lookup?english=fever")
+    etag = resp.headers["ETag"]
+    assert resp.headers["Cache-Control"] == "public, max-age=60"
+    again = client.get("/api/v1/lookup?english=FEVER", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.data == b""
+
+    _add(client)
+    unchanged = client.get("/api/v1/lookup?english=fever", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+
+    _add(client, spanish="calentura")
+    changed = client.get("/api/v1/lookup?english=fever", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    [meaning] = changed.get_json()["meanings"]
+    assert [st["term"] for st in meaning["spanish_terms"]] == ["fiebre", "calentura"]
+
+    es = client.get("/api/v1/lookup?spanish=fiebre")
+    assert client.get(
+        "/api/v1/lookup?spanish=fiebre", headers={"If-None-Match": es.headers["ETag"]}
+    ).status_code == 304
+
+
+def test_admin_bulk_delete():
+    client = create_app({"REPOSITORY_BACKEND": "memory", "ADMIN_TOKEN": "s3cret"}).test_client()
+    _add(client)
+    _add(client, "cough", "tos")
+    auth = {"Authorization": "Bearer s3cret"}
+    assert client.post("/api/v1/admin/delete", json={"english": ["fever"]}).status_code == 401
+    resp = client.post("/api/v1/admin/delete", json={"english": ["Fever", "cough", "xyz"]}, headers=auth)
+    assert resp.get_json() == {
+        "deleted": ["fever", "cough"],
+        "not_found": ["xyz"],
+        "orphaned_spanish": ["fiebre", "tos"],
+    }
+    assert client.get("/api/v1/lookup?english=fever").status_code == 404
+    assert client.get("/api/v1/suggest?prefix=fi").get_json()["suggestions"] == []
+    assert client.post("/api/v1/admin/delete", json={"english": []}, headers=auth).status_code == 400
+
+
+def test_admin_endpoints_disabled_without_token(client):
+    assert client.post("/api/v1/admin/delete", json={"english": ["fever"]}).status_code == 403
+
+
+def test_add_full_entry_is_idempotent(client):
+    payload = {
+        "lemma": "fever",
+        "pos": "noun",
+        "meanings": [
+            {
+                "description": "An elevated body temperature.",
+                "spanish_terms": [{"term": "fiebre", "gender": "feminine"},
+                                  {"term": "calentura", "gender": "feminine"}],
+                "examples": [["en", "He has a fever."], ["es", "Él tiene fiebre."]],
+            },
+            {
+                "description": "A state of nervous excitement.",
+                "spanish_terms": [{"term": "frenesí", "gender": "masculine"}],
+            },
+        ],
+    }
+    first = client.post("/api/v1/add", json=payload).get_json()
+    assert [len(m["spanish_terms"]) for m in first["meanings"]] == [2, 1]
+    second = client.post("/api/v1/add", json=payload).get_json()
+    assert second == first
+    assert client.get("/api/v1/lookup?english=fever").get_json() == first
+
+    payload["meanings"] = [{"description": "A", "spanish_terms": []}]
+    assert client.post("/api/v1/add", json=payload).status_code == 400
+
+
+def test_metrics_endpoint_reports_routes_and_db_work(tmp_path):
+    from db.sqlite_repository import SqliteRepository
+
+    app = create_app({"REPOSITORY": SqliteRepository(str(tmp_path / "m.sqlite3"))})
+    client = app.test_client()
+    _add(client)
+    client.get("/api/v1/lookup?english=fever")
+    client.get("/api/v1/lookup?english=missing")
+
+    resp = client.get("/api/v1/metrics")
+    assert resp.status_code == 200 and resp.content_type.startswith("text/plain")
+    text = resp.get_data(as_text=True)
+    assert ('dictionary_request_duration_seconds_count'
+            '{method="GET",route="/api/v1/lookup",status="200"} 1') in text
+    assert 'route="/api/v1/lookup",status="404"} 1' in text
+    queries = [line for line in text.splitlines() if line.startswith(
+        'dictionary_request_db_operations_sum{route="/api/v1/lookup",kind="queries"}')]
+    assert queries and float(queries[0].split()[-1]) > 0
+    assert 'phase="hydrate"' in text and 'phase="serialize"' in text
+    assert "dictionary_db_queries_total" in text and "# TYPE dictionary_pool_checkouts_total counter" in text
+
+
+def test_metrics_can_be_disabled():
+    client = create_app({"REPOSITORY_BACKEND": "memory", "METRICS_ENABLED": False}).test_client()
+    assert client.get("/api/v1/health").status_code == 200
+    assert client.get("/api/v1/metrics").status_code == 404
+
+
+def test_add_returns_the_merged_entry(client):
+    _add(client)
+    assert client.get("/api/v1/english-lesson").get_json()["terms"][0]["spanish"] == "fiebre"
+    body = client.post("/api/v1/add", json={
+        "lemma": "Fever", "pos": "noun", "meaning_desc": "A state of nervous excitement.",
+        "spanish_term": "frenesí", "gender": "masculine",
+    }).get_json()
+    assert body["term"] == "fever"
+    assert [m["spanish_terms"][0]["term"] for m in body["meanings"]] == ["fiebre", "frenesí"]
+    assert client.get("/api/v1/english-lesson").get_json()["terms"][0]["spanish"] == "fiebre"
+
+
+def test_english_lesson_from_dictionary(client):
+    _add(client)
+    _add(client, "cough", "tos")
+    resp = client.get("/api/v1/english-lesson?seed=4&per_page=1")
+    body = resp.get_json()
+    assert resp.status_code == 200 and resp.headers["ETag"]
+    assert body["total"] == 2 and body["pages"] == 2 and len(body["terms"]) == 1
+    second = client.get("/api/v1/english-lesson?seed=4&per_page=1&page=2").get_json()
+    assert {body["terms"][0]["english"], second["terms"][0]["english"]} == {"fever", "cough"}
+    assert client.get("/api/v1/english-lesson?topic=respiratory").get_json()["terms"][0]["spanish"] == "tos"
+    assert client.get("/api/v1/english-lesson?page=x").status_code == 400
+    assert client.get("/api/v1/english-lesson?mode=cram").status_code == 400
+
+
+def test_terms_keyset_pages_and_ndjson_export(tmp_path):
+    from db.sqlite_repository import SqliteRepository
+    from services.service import DictionaryService
+
+    repo = SqliteRepository(str(tmp_path / "export.sqlite3"))
+    DictionaryService(repo).add_entries(
+        DictionaryService(repo).build_entry(f"term{i:03d}", "noun", f"sense {i}", f"término{i}", "m")
+        for i in range(25)
+    )
+    client = create_app({"REPOSITORY": repo}).test_client()
+
+    seen, after = [], ""
+    while True:
+        body = client.get(f"/api/v1/terms?limit=10&after={after}").get_json()
+        seen += body["terms"]
+        if body["next"] is None:
+            break
+        after = body["next"]
+    assert seen == sorted(repo.list_terms("en")) and "term024" in seen
+    assert client.get("/api/v1/terms?language=es&limit=5").get_json()["terms"][0] == "término0"
+    assert client.get("/api/v1/terms?limit=0").status_code == 400
+
+    resp = client.get("/api/v1/export")
+    assert resp.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert [r["term"] for r in rows] == seen
+    assert rows[-1]["meanings"][0]["spanish_terms"][0]["term"] == "término24"
+
+
+def test_write_behind_add_returns_202_and_status(tmp_path):
+    app = create_app({
+        "REPOSITORY_BACKEND": "memory", "WRITE_BEHIND": "1",
+        "WRITE_BEHIND_SPILL": str(tmp_path / "adds.jsonl"),
+    })
+    client = app.test_client()
+    res = client.post("/api/v1/add", json={
+        "lemma": "fever", "pos": "noun", "meaning_desc": "An elevated body temperature.",
+        "spanish_term": "fiebre", "gender": "feminine",
+    })
+    assert res.status_code == 202
+    ack = res.get_json()
+    assert ack["status"] == "queued" and ack["lemma"] == "fever"
+    assert client.post("/api/v1/add", json={"lemma": "fever"}).status_code == 400
+
+    assert app.extensions["write_behind"].flush(timeout=5)
+    status = client.get(f"/api/v1/add/status?id={ack['id']}").get_json()
+    assert status["status"] == "committed"
+    assert client.get("/api/v1/lookup?english=fever").status_code == 200
+    assert client.get("/api/v1/add/status?id=nope").status_code == 404
+    body = client.get("/api/v1/metrics").get_data(as_text=True)
+    assert "dictionary_write_behind_committed_total 1" in body
+    assert "dictionary_write_behind_commit_seconds_count 1" in body
+    app.extensions["write_behind"].close()
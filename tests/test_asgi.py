@@ -0,0 +1,172 @@
+import asyncio
+import json
+import threading
+
+from api.asgi import create_asgi_app
+from db.memory_repository import InMemoryRepository
+
+
+async def _call(app, method, path, query="", body=None, headers=()):
+    payload = json.dumps(body).encode() if body is not None else b""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(
+        {"type": "http", "method": method, "path": path, "query_string": query.encode(),
+         "headers": list(headers)},
+        receive,
+        send,
+    )
+    status, body = sent[0]["status"], sent[1]["body"]
+    return status, json.loads(body) if body else None, dict(sent[0]["headers"])
+
+
+def test_add_lookup_and_lesson():
+    app = create_asgi_app({"REPOSITORY_BACKEND": "memory"})
+
+    async def scenario():
+        status, entry, _ = await _call(app, "POST", "/api/v1/add", body={
+            "lemma": "fever", "pos": "noun", "meaning_desc": "An elevated body temperature.",
+            "spanish_term": "fiebre", "gender": "feminine",
+        })
+        assert status == 200 and entry["term"] == "fever"
+        results = await asyncio.gather(*(
+            _call(app, "GET", "/api/v1/lookup", "english=fever") for _ in range(50)
+        ))
+        assert {r[0] for r in results} == {200}
+        etag = results[0][2][b"etag"]
+        assert (await _call(app, "GET", "/api/v1/lookup", "english=fever",
+                            headers=[(b"if-none-match", etag)]))[0] == 304
+        assert (await _call(app, "GET", "/api/v1/lookup", "spanish=fiebre"))[0] == 200
+        assert (await _call(app, "GET", "/api/v1/lookup", "english=fevr&fuzzy=1"))[0] == 200
+        assert (await _call(app, "GET", "/api/v1/lookup", "english=nothing"))[0] == 404
+        assert (await _call(app, "POST", "/api/v1/add", body={"lemma": "x"}))[0] == 400
+        status, entry, _ = await _call(app, "POST", "/api/v1/add", body={
+            "lemma": "cough", "pos": "noun", "meanings": [
+                {"description": "Expelling air", "spanish_terms": [{"term": "tos", "gender": "f"}]},
+                {"description": "expelling  air", "spanish_terms": [{"term": "toser", "gender": "f"}]},
+            ],
+        })
+        assert status == 200 and len(entry["meanings"]) == 1
+        assert (await _call(app, "POST", "/api/v1/add", body={
+            "lemma": "cough", "pos": "noun", "meanings": [],
+        }))[0] == 400
+        assert (await _call(app, "GET", "/api/v1/english-lesson"))[1]["terms"]
+        assert (await _call(app, "POST", "/api/v1/lookup"))[0] == 405
+
+    asyncio.run(scenario())
+    app.service.close()
+
+
+class BlockingRepo(InMemoryRepository):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def load_english_term(self, lemma):
+        self.release.wait(5)
+        return super().load_english_term(lemma)
+
+
+def test_saturated_bridge_returns_503():
+    repo = BlockingRepo()
+    app = create_asgi_app({"REPOSITORY": repo, "ASYNC_WORKERS": 1, "ASYNC_MAX_PENDING": 1})
+
+    async def scenario():
+        pending = [
+            asyncio.create_task(_call(app, "GET", "/api/v1/lookup", f"english=t{i}"))
+            for i in range(2)
+        ]
+        await asyncio.sleep(0.05)
+        status, body, headers = await _call(app, "GET", "/api/v1/lookup", "english=t9")
+        assert status == 503 and headers[b"retry-after"] == b"1"
+        repo.release.set()
+        assert [r[0] for r in await asyncio.gather(*pending)] == [404, 404]
+
+    asyncio.run(scenario())
+    assert app.service.stats()["rejected"] == 1
+    app.service.close()
+
+
+def test_metrics_count_queries_run_on_worker_threads(tmp_path):
+    from db.sqlite_repository import SqliteRepository
+
+    app = create_asgi_app({"REPOSITORY": SqliteRepository(str(tmp_path / "m.sqlite3"))})
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    async def scenario():
+        await _call(app, "GET", "/api/v1/lookup", "english=lesion")
+        await app({"type": "http", "method": "GET", "path": "/api/v1/metrics",
+                   "query_string": b"", "headers": []}, receive, send)
+
+    asyncio.run(scenario())
+    assert sent[0]["status"] == 200
+    text = sent[1]["body"].decode()
+    line = next(l for l in text.splitlines() if l.startswith(
+        'dictionary_request_db_operations_sum{route="/api/v1/lookup",kind="queries"}'))
+    assert float(line.split()[-1]) > 0
+    assert "dictionary_async_completed_total 1" in text
+    app.service.close()
+
+
+def test_export_streams_ndjson_in_chunks():
+    from benchmarks.generator import DictionaryGenerator
+
+    repo = InMemoryRepository()
+    repo.persist_entries(list(DictionaryGenerator(1200).entries()))
+    app = create_asgi_app({"REPOSITORY": repo})
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app({"type": "http", "method": "GET", "path": "/api/v1/export",
+                     "query_string": b"", "headers": []}, receive, send))
+    assert sent[0]["status"] == 200
+    chunks = [m["body"] for m in sent[1:] if m["body"]]
+    assert len(chunks) == 3 and not sent[-1].get("more_body")
+    lines = b"".join(chunks).decode().splitlines()
+    terms = [json.loads(line)["term"] for line in lines]
+    assert len(terms) == 1200 and terms == sorted(terms)
+    app.service.close()
+
+
+def test_write_behind_add_runs_on_the_bridge(tmp_path):
+    app = create_asgi_app({
+        "REPOSITORY_BACKEND": "memory", "WRITE_BEHIND": "1",
+        "WRITE_BEHIND_SPILL": str(tmp_path / "adds.jsonl"),
+    })
+    threads = []
+    submit = app.writes.submit
+
+    def recording_submit(data):
+        threads.append(threading.current_thread().name)
+        return submit(data)
+
+    app.writes.submit = recording_submit
+
+    async def scenario():
+        status, ack, _ = await _call(app, "POST", "/api/v1/add", body={
+            "lemma": "fever", "pos": "noun", "meaning_desc": "An elevated body temperature.",
+            "spanish_term": "fiebre", "gender": "feminine",
+        })
+        assert status == 202 and ack["status"] == "queued"
+
+    asyncio.run(scenario())
+    assert threads[0].startswith("dictionary-io")
+    app.writes.close()
+    app.service.close()
@@ -0,0 +1,34 @@
+from collections import Counter
+
+from benchmarks.compare import compare
+from benchmarks.generator import DictionaryGenerator
+
+
+def test_generator_is_deterministic_per_entry():
+    gen = DictionaryGenerator(500, seed=3)
+    assert gen.payload(42) == DictionaryGenerator(10, seed=3).payload(42)
+    assert gen.payload(42) != DictionaryGenerator(500, seed=4).payload(42)
+    lemmas = [et.term for et in gen.entries()]
+    assert len(set(lemmas)) == 500
+    for et in gen.entries(0, 50):
+        assert 1 <= len(et.meanings) <= 8
+        assert all(len(m.examples) <= 5 and m.spanish_terms for m in et.meanings)
+
+
+def test_zipf_sampler_is_skewed():
+    counts = Counter(DictionaryGenerator(1000).sampler().sample(5000))
+    top = sum(n for _, n in counts.most_common(10))
+    assert top > 5000 * 0.3
+
+
+def test_compare_flags_regressions_only_past_threshold():
+    def report(p99, throughput):
+        return {"results": [{
+            "backend": "memory", "path": "service", "scale": 10, "scenario": "add",
+            "p50_ms": 1.0, "p95_ms": 2.0, "p99_ms": p99, "throughput": throughput,
+        }]}
+
+    rows = compare(report(3.0, 1000), report(3.3, 950), threshold=0.2)
+    assert not any(r["regressed"] for r in rows)
+    rows = compare(report(3.0, 1000), report(4.0, 700), threshold=0.2)
+    assert {r["metric"] for r in rows if r["regressed"]} == {"p99_ms", "throughput"}
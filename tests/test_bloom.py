@@ -0,0 +1,97 @@
+from api.app import create_app
+from benchmarks.generator import DictionaryGenerator
+from db.memory_repository import InMemoryRepository
+from services.bloom import BloomFilter, LemmaFilter
+from services.cache import LRUCache
+from services.service import DictionaryService
+
+
+def _entry(svc, lemma):
+    svc.add_full_entry(lemma, "noun", [
+        {"description": f"About {lemma}.", "spanish_terms": [{"term": lemma, "gender": "m"}]},
+    ])
+
+
+def test_false_positive_rate_matches_sizing():
+    bloom = BloomFilter(10_000, fp_rate=0.01)
+    for i in range(10_000):
+        bloom.add(f"term{i}")
+    assert all(f"term{i}" in bloom for i in range(10_000))
+    false_positives = sum(f"other{i}" in bloom for i in range(20_000))
+    assert false_positives / 20_000 < 0.02
+    assert bloom.size_bytes < 10_000 * 1.3 and bloom.hashes == 7
+
+
+def test_misses_skip_the_repository(counting_repo):
+    repo = counting_repo()
+    DictionaryService(repo).add_entries(DictionaryGenerator(200, seed=3).entries())
+    svc = DictionaryService(repo, cache=LRUCache(), lemma_filter=LemmaFilter())
+    svc.rebuild_lemma_filter()
+    _entry(svc, "fever")
+
+    repo.loads = 0
+    assert svc.lookup_english("fever").term == "fever"
+    assert svc.lookup_english("zzyzx") is None
+    found, missing = svc.lookup_many(["fever", "qwerty", "asdf"])
+    assert set(found) == {"fever"} and missing == ["qwerty", "asdf"]
+    assert repo.loads == 1  # only "fever"; the batch reuses the cached entry
+    stats = svc.lemma_filter.stats()
+    assert stats["short_circuits"] == 3 and stats["lemmas"] == 201
+
+
+def test_rebuild_forgets_deleted_lemmas(clock):
+    repo = InMemoryRepository()
+    svc = DictionaryService(repo, lemma_filter=LemmaFilter(rebuild_interval=60, clock=clock))
+    svc.rebuild_lemma_filter()
+    _entry(svc, "fever")
+    _entry(svc, "cough")
+    svc.delete_entry("cough")
+    assert svc.lemma_filter.might_contain("cough")
+    assert svc.lemma_filter.stats()["deletes_since_rebuild"] == 1
+    assert not svc.lemma_filter.due()
+
+    clock.now = 61
+    assert svc.lemma_filter.due()
+    svc.rebuild_lemma_filter()
+    assert not svc.lemma_filter.might_contain("cough")
+    assert svc.lemma_filter.might_contain("Fever")
+    assert svc.lemma_filter.stats()["rebuilds"] == 1
+
+
+def test_lemmas_written_elsewhere_are_found_after_a_check(clock):
+    repo = InMemoryRepository()
+    svc = DictionaryService(repo, cache=LRUCache(), lemma_filter=LemmaFilter(check_interval=5, clock=clock))
+    svc.rebuild_lemma_filter()
+    other = DictionaryService(repo)  # another worker on the same database
+    _entry(other, "cough")
+    assert svc.lookup_english("cough") is None
+    assert svc.lookup_english_encoded("cough") is None
+
+    clock.now = 5
+    svc.lookup_english("cough")  # starts the marker check in the background
+    with svc._filter_check:  # wait for it; the marker moved, so the filter is stale
+        pass
+    assert svc.lookup_english("cough").term == "cough"  # the miss was not cached
+    with svc._filter_rebuild:  # wait for the background rebuild
+        assert svc.lemma_filter.stats()["stale"] == 0
+    assert svc.lemma_filter.might_contain("cough")
+
+
+def test_adds_during_a_rebuild_are_kept():
+    repo = InMemoryRepository()
+    svc = DictionaryService(repo, lemma_filter=LemmaFilter())
+
+    def scan():
+        yield ("en", "fever")
+        _entry(svc, "cough")  # written after the scan passed it
+
+    svc.lemma_filter.build(scan())
+    assert svc.lemma_filter.might_contain("cough")
+
+
+def test_filter_metrics_exposed():
+    client = create_app({"REPOSITORY_BACKEND": "memory", "LEMMA_FILTER": "1"}).test_client()
+    assert client.get("/api/v1/lookup?english=zzyzx").status_code == 404
+    body = client.get("/api/v1/metrics").get_data(as_text=True)
+    assert "dictionary_lemma_filter_short_circuits_total 1" in body
+    assert "dictionary_lemma_filter_size_bytes" in body
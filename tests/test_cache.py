@@ -0,0 +1,104 @@
+from services.cache import CompactingCache, LRUCache, MISSING
+from services.service import DictionaryService
+from models import EnglishTerm, PartOfSpeech
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_and_negative_ttl(clock):
+    cache = LRUCache(ttl=10, negative_ttl=1, clock=clock)
+    cache.put("hit", 1)
+    cache.put("miss", None)
+    clock.now = 2
+    assert cache.get("hit") == 1
+    assert cache.get("miss") is MISSING
+    clock.now = 11
+    assert cache.get("hit") is MISSING
+    assert cache.stats()["expirations"] == 2
+
+
+def test_service_reads_through_and_invalidates_on_delete(counting_repo):
+    repo = counting_repo(["fever"])
+    svc = DictionaryService(repo, cache=LRUCache())
+    assert svc.lookup_english("fever").term == "fever"
+    assert svc.lookup_english("Fever ").term == "fever"
+    assert svc.lookup_english("xyz") is None
+    assert svc.lookup_english("xyz") is None
+    assert repo.loads == 2
+
+    svc.delete_entry("fever")
+    loads = repo.loads
+    assert svc.lookup_english("fever") is None
+    assert repo.loads == loads + 1
+
+
+def test_lookup_many_only_loads_uncached_lemmas(counting_repo):
+    repo = counting_repo(["fever", "pain"])
+    svc = DictionaryService(repo, cache=LRUCache())
+    svc.lookup_english("fever")
+    found, missing = svc.lookup_many(["fever", "pain", "xyz"])
+    assert set(found) == {"fever", "pain"} and missing == ["xyz"]
+    found, missing = svc.lookup_many(["pain", "xyz"])
+    assert repo.loads == 2
+
+
+def test_compacting_cache_returns_fresh_graphs():
+    cache = CompactingCache(LRUCache(max_size=4))
+    et = EnglishTerm(term="fever", pos=PartOfSpeech.NOUN)
+    cache.put(("en", "fever"), et)
+    cache.put(("es", "fiebre"), [et])
+    cache.put(("en", "nope"), None)
+    a, b = cache.get(("en", "fever")), cache.get(("en", "fever"))
+    assert a is not b and a.term_id == b.term_id == et.term_id
+    assert [e.term for e in cache.get(("es", "fiebre"))] == ["fever"]
+    assert cache.get(("en", "nope")) is None
+    assert cache.get(("en", "other")) is MISSING
+
+
+def test_encoded_lookup_is_reused_until_the_entry_changes():
+    from db.memory_repository import InMemoryRepository
+
+    svc = DictionaryService(InMemoryRepository(), cache=LRUCache(max_size=16))
+    svc.add_entry("fever", "noun", "High temperature", "fiebre", "f")
+    first = svc.lookup_english_encoded("fever")
+    assert svc.lookup_english_encoded("Fever") is first
+
+    svc.add_entry("fever", "noun", "Body heat", "calentura", "f")
+    second = svc.lookup_english_encoded("fever")
+    assert second.etag != first.etag and b"calentura" in second.body
+
+    svc.delete_entry("fever")
+    assert svc.lookup_english_encoded("fever") is None
+
+
+def test_a_load_racing_a_write_is_not_cached(counting_repo):
+    class RacingRepo(counting_repo):
+        """Lets a write land after the load read the old entry."""
+
+        during_load = None
+
+        def load_english_term(self, lemma):
+            et = super().load_english_term(lemma)
+            if self.during_load:
+                write, self.during_load = self.during_load, None
+                write()
+            return et
+
+    repo = RacingRepo(["fever", "pain"])
+    svc = DictionaryService(repo, cache=LRUCache(max_size=16))
+    repo.during_load = lambda: svc.add_entry("fever", "noun", "Body heat", "calentura", "f")
+    assert svc.lookup_english("fever").meanings == []
+    assert [m.description for m in svc.lookup_english("fever").meanings] == ["Body heat"]
+
+    repo.during_load = lambda: svc.add_entry("pain", "noun", "Suffering", "dolor", "m")
+    assert b"dolor" not in svc.lookup_english_encoded("pain").body
+    assert b"dolor" in svc.lookup_english_encoded("pain").body
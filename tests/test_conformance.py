@@ -0,0 +1,248 @@
+import pytest
+
+from db.factory import create_repository
+from models import EnglishTerm, Meaning, SpanishTerm, Example, PartOfSpeech, Gender
+
+PREFIX = "conformance-"
+
+
+def _mysql():
+    from db.mysql_repository import MysqlRepository
+    repo = MysqlRepository()
+    try:
+        repo.load_english_term("lesion")
+    except repo.Error as e:
+        pytest.skip(f"MySQL not available: {e}")
+    return repo
+
+
+@pytest.fixture(params=["memory", "sqlite", "sqlite-binary", "mysql"])
+def repo(request, tmp_path):
+    if request.param == "mysql":
+        r = _mysql()
+    elif request.param.startswith("sqlite"):
+        r = create_repository(
+            "sqlite",
+            path=str(tmp_path / "medical.sqlite3"),
+            binary_ids=request.param.endswith("binary"),
+        )
+    else:
+        r = create_repository("memory")
+    for lemma in ("bruise", "contusion", "wound", "Fever"):
+        r.delete_entry_by_english_lemma(PREFIX + lemma)
+    yield r
+    for lemma in ("bruise", "contusion", "wound", "Fever"):
+        r.delete_entry_by_english_lemma(PREFIX + lemma)
+
+
+def _entry(lemma, spanish, n_examples=2):
+    et = EnglishTerm(term=PREFIX + lemma, pos=PartOfSpeech.NOUN)
+    m = Meaning(description=f"Meaning of {lemma}", english_term=et)
+    st = SpanishTerm(term=PREFIX + spanish, gender=Gender.MASCULINE, meaning=m)
+    exs = [Example(language="en", text=f"{lemma} {i}", meaning=m) for i in range(n_examples)]
+    return et, m, st, exs
+
+
+def test_missing_lemma(repo):
+    assert repo.load_english_term(PREFIX + "nope") is None
+    assert repo.load_english_terms([PREFIX + "nope"]) == {}
+
+
+def test_persist_entry_graph_roundtrip(repo):
+    et, m, st, exs = _entry("bruise", "moretón")
+    repo.persist_entry_graph(et, m, st, exs)
+
+    back = repo.load_english_term(PREFIX + "bruise")
+    assert back.term_id == et.term_id and back.pos is PartOfSpeech.NOUN
+    [bm] = back.meanings
+    assert bm.meaning_id == m.meaning_id and bm.english_term is back
+    assert [(s.term, s.gender) for s in bm.spanish_terms] == [(PREFIX + "moretón", Gender.MASCULINE)]
+    assert sorted(ex.text for ex in bm.examples) == ["bruise 0", "bruise 1"]
+
+
+def test_lookup_is_case_insensitive(repo):
+    repo.persist_entry_graph(*_entry("Fever", "fiebre"))
+    assert repo.load_english_term(PREFIX + "fever").term == PREFIX + "Fever"
+
+
+def test_granular_inserts_roundtrip(repo):
+    et, m, st, (ex, _) = _entry("bruise", "moretón")
+    repo.insert_english_term(et)
+    repo.insert_meaning(m)
+    repo.link_meaning_english(m.meaning_id, et.term_id)
+    repo.insert_spanish_term(st)
+    repo.link_meaning_spanish(m.meaning_id, st.term_id)
+    repo.insert_example(ex)
+
+    back = repo.load_english_term(PREFIX + "bruise")
+    assert [s.term for s in back.meanings[0].spanish_terms] == [PREFIX + "moretón"]
+    assert [e.text for e in back.meanings[0].examples] == ["bruise 0"]
+
+
+def test_persist_entries_dedupes_terms(repo):
+    a, *_ = _entry("bruise", "moretón")
+    b, *_ = _entry("bruise", "moretón", n_examples=0)
+    c, *_ = _entry("contusion", "moretón")
+    repo.persist_entries([a, b, c])
+
+    loaded = repo.load_english_terms([PREFIX + "bruise", PREFIX + "contusion"])
+    assert len(loaded[PREFIX + "bruise"].meanings) == 2
+    spanish_ids = {
+        st.term_id for et in loaded.values() for m in et.meanings for st in m.spanish_terms
+    }
+    assert len(spanish_ids) == 1
+    assert a.term_id == b.term_id
+
+
+def test_delete_keeps_shared_meanings_and_spanish_terms(repo):
+    bruise, m, st, exs = _entry("bruise", "moretón")
+    repo.persist_entry_graph(bruise, m, st, exs)
+    contusion = EnglishTerm(term=PREFIX + "contusion", pos=PartOfSpeech.NOUN)
+    repo.insert_english_term(contusion)
+    repo.link_meaning_english(m.meaning_id, contusion.term_id)
+    wound, wm, wst, _ = _entry("wound", "herida")
+    repo.persist_entry_graph(wound, wm, wst, [])
+    repo.link_meaning_spanish(wm.meaning_id, st.term_id)
+
+    assert repo.delete_entry_by_english_lemma(PREFIX + "bruise") == []
+    assert repo.load_english_term(PREFIX + "bruise") is None
+    shared = repo.load_english_term(PREFIX + "contusion")
+    assert [mm.meaning_id for mm in shared.meanings] == [m.meaning_id]
+    assert len(shared.meanings[0].examples) == 2
+
+    repo.delete_entry_by_english_lemma(PREFIX + "contusion")
+    back = repo.load_english_term(PREFIX + "wound")
+    assert {s.term for s in back.meanings[0].spanish_terms} == {PREFIX + "herida", PREFIX + "moretón"}
+
+    orphans = repo.delete_entry_by_english_lemma(PREFIX + "wound")
+    assert sorted(orphans) == [PREFIX + "herida", PREFIX + "moretón"]
+    fresh, fm, fst, _ = _entry("bruise", "herida")
+    fst.gender = Gender.FEMININE
+    repo.persist_entry_graph(fresh, fm, fst, [])
+    assert fst.term_id != wst.term_id
+
+
+def test_list_terms_keyset_pages(repo):
+    for lemma, spanish in (("wound", "herida"), ("bruise", "moretón"), ("contusion", "contusión")):
+        repo.persist_entry_graph(*_entry(lemma, spanish))
+    after = PREFIX
+    pages = []
+    while True:
+        page = [t for t in repo.list_terms("en", after=after, limit=2) if t.startswith(PREFIX)]
+        if not page:
+            break
+        pages.append(page)
+        after = page[-1]
+    assert pages == [[PREFIX + "bruise", PREFIX + "contusion"], [PREFIX + "wound"]]
+    assert PREFIX + "herida" in repo.list_terms("es")
+
+
+def test_load_spanish_term_returns_linked_meanings_only(repo):
+    bruise, m, st, exs = _entry("bruise", "moretón")
+    repo.persist_entry_graph(bruise, m, st, exs)
+    repo.persist_entry_graph(*_entry("contusion", "moretón", n_examples=0))
+    other = Meaning(description="Unrelated sense", english_term=bruise)
+    repo.persist_entry_graph(
+        bruise, other, SpanishTerm(term=PREFIX + "golpe", gender=Gender.MASCULINE, meaning=other), []
+    )
+
+    entries = {et.term: et for et in repo.load_spanish_term((PREFIX + "MORETON").upper())}
+    assert set(entries) == {PREFIX + "bruise", PREFIX + "contusion"}
+    [linked] = entries[PREFIX + "bruise"].meanings
+    assert linked.meaning_id == m.meaning_id
+    assert len(linked.examples) == 2
+    assert repo.load_spanish_term(PREFIX + "nada") == []
+
+
+def test_bulk_delete_handles_meanings_shared_within_the_batch(repo):
+    bruise, m, st, exs = _entry("bruise", "moretón")
+    repo.persist_entry_graph(bruise, m, st, exs)
+    contusion = EnglishTerm(term=PREFIX + "contusion", pos=PartOfSpeech.NOUN)
+    repo.insert_english_term(contusion)
+    repo.link_meaning_english(m.meaning_id, contusion.term_id)
+    wound, wm, wst, _ = _entry("wound", "herida")
+    repo.persist_entry_graph(wound, wm, wst, [])
+    repo.link_meaning_spanish(wm.meaning_id, st.term_id)
+
+    deleted, orphans = repo.delete_entries_by_english_lemmas(
+        [PREFIX + "BRUISE", PREFIX + "contusion", PREFIX + "nope"]
+    )
+    assert sorted(deleted) == [PREFIX + "bruise", PREFIX + "contusion"]
+    assert orphans == []
+    assert repo.load_english_terms([PREFIX + "bruise", PREFIX + "contusion"]) == {}
+    assert [et.term for et in repo.load_spanish_term(PREFIX + "moretón")] == [PREFIX + "wound"]
+
+    deleted, orphans = repo.delete_entries_by_english_lemmas([PREFIX + "wound"])
+    assert deleted == [PREFIX + "wound"]
+    assert sorted(orphans) == [PREFIX + "herida", PREFIX + "moretón"]
+
+
+def test_upsert_entry_is_idempotent_and_merges_meanings(repo):
+    def payload():
+        et = EnglishTerm(term=PREFIX + "wound", pos=PartOfSpeech.NOUN)
+        cut = Meaning(description="An  injury to the body", english_term=et)
+        SpanishTerm(term=PREFIX + "herida", gender=Gender.FEMININE, meaning=cut)
+        SpanishTerm(term=PREFIX + "lesión", gender=Gender.FEMININE, meaning=cut)
+        Example(language="en", text="The wound healed.", meaning=cut)
+        grief = Meaning(description="Emotional pain", english_term=et)
+        SpanishTerm(term=PREFIX + "herida", gender=Gender.FEMININE, meaning=grief)
+        return et
+
+    first = repo.upsert_entry(payload())
+    second = repo.upsert_entry(payload())
+    assert second.term_id == first.term_id
+    assert [m.meaning_id for m in second.meanings] == [m.meaning_id for m in first.meanings]
+    assert second.meanings[0].examples[0].example_id == first.meanings[0].examples[0].example_id
+
+    back = repo.load_english_term(PREFIX + "wound")
+    assert {m.meaning_id for m in back.meanings} == {m.meaning_id for m in first.meanings}
+    by_id = {m.meaning_id: m for m in back.meanings}
+    cut = by_id[first.meanings[0].meaning_id]
+    assert sorted(s.term for s in cut.spanish_terms) == [PREFIX + "herida", PREFIX + "lesión"]
+    assert [e.text for e in cut.examples] == ["The wound healed."]
+    herida = {s.term_id for m in back.meanings for s in m.spanish_terms if s.term == PREFIX + "herida"}
+    assert len(herida) == 1
+
+    more = EnglishTerm(term=PREFIX + "WOUND", pos=PartOfSpeech.NOUN)
+    m = Meaning(description="an injury to the body", english_term=more)
+    SpanishTerm(term=PREFIX + "llaga", gender=Gender.FEMININE, meaning=m)
+    Example(language="es", text="La herida sanó.", meaning=m)
+    merged = repo.upsert_entry(more)
+    assert more.term_id == first.term_id and m.meaning_id == first.meanings[0].meaning_id
+    cut = {mm.meaning_id: mm for mm in repo.load_english_term(PREFIX + "wound").meanings}[m.meaning_id]
+    assert len(cut.spanish_terms) == 3 and len(cut.examples) == 2
+    assert merged.term == PREFIX + "wound" and len(merged.meanings) == 2
+    returned = {mm.meaning_id: mm for mm in merged.meanings}[m.meaning_id]
+    assert len(returned.spanish_terms) == 3 and len(returned.examples) == 2
+
+
+def test_persist_entries_returns_merged_graphs_for_stored_lemmas(repo):
+    repo.persist_entries([_entry("bruise", "moretón")[0]])
+    again, *_ = _entry("bruise", "cardenal")
+    fresh, *_ = _entry("contusion", "moretón")
+    merged, returned = repo.persist_entries([again, fresh])
+    assert returned is fresh
+    assert len(merged.meanings) == 2
+    assert sorted(st.term for mm in merged.meanings for st in mm.spanish_terms) == [
+        PREFIX + "cardenal", PREFIX + "moretón"
+    ]
+
+
+def test_english_marker_moves_on_adds_and_deletes(repo):
+    before = repo.english_marker()
+    repo.persist_entry_graph(*_entry("wound", "herida"))
+    added = repo.english_marker()
+    assert added != before
+    repo.upsert_entry(_entry("wound", "llaga")[0])
+    assert repo.english_marker() == added  # the lemma was already there
+    repo.delete_entry_by_english_lemma(PREFIX + "wound")
+    deleted = repo.english_marker()
+    assert deleted not in (before, added)
+    # A delete then an add under an id older than the newest row's leaves
+    # COUNT(*) and MAX(id) as they were.
+    old, *_ = _entry("wound", "herida")
+    repo.persist_entries([_entry("bruise", "moretón")[0], _entry("zz", "zz")[0]])
+    current = repo.english_marker()
+    repo.delete_entry_by_english_lemma(PREFIX + "bruise")
+    repo.persist_entries([old])
+    assert repo.english_marker() != current
@@ -1,7 +1,11 @@
-﻿from uuid import UUID
+﻿import sys
+from uuid import UUID
 from models import (
     EnglishTerm, SpanishTerm, Meaning, Example, PartOfSpeech, Gender
 )
+from models.compact import compact
+from db.memory_repository import InMemoryRepository
+from services.service import DictionaryService
 
 def test_basic_english_term():
     lesion = EnglishTerm(term="lesion", pos=PartOfSpeech.NOUN)
@@ -32,3 +36,24 @@ def test_examples_attach():
     m1.add_example(ex_en)
     m1.add_example(ex_es)
     assert {e.language for e in m1.examples} == {"en", "es"}
+
+def test_models_are_slotted_and_dedupe_by_id():
+    lesion = EnglishTerm(term="lesion", pos=PartOfSpeech.NOUN)
+    assert not hasattr(lesion, "__dict__")
+    meanings = [Meaning(description=f"sense {i}", english_term=lesion) for i in range(20)]
+    for m in meanings:
+        lesion.add_meaning(m)
+    assert len(lesion.meanings) == 20
+    assert all(a is b for a, b in zip(lesion.meanings, meanings))
+    ex = Example(language="".join(["e", "n"]), text="x", meaning=meanings[0])
+    assert ex.language is sys.intern("en")
+
+def test_compact_roundtrip_serializes_like_full_model():
+    lesion = EnglishTerm(term="lesion", pos=PartOfSpeech.NOUN)
+    m1 = Meaning(description="Pathological change", english_term=lesion)
+    SpanishTerm(term="lesión", gender=Gender.FEMININE, meaning=m1)
+    Example(language="es", text="Una lesión.", meaning=m1)
+    c = compact(lesion)
+    serialize = DictionaryService(InMemoryRepository()).serialize_entry
+    assert serialize(c) == serialize(lesion) == serialize(c.expand())
+    assert c.expand().meanings[0].english_term.term == "lesion"
@@ -0,0 +1,36 @@
+from services.fuzzy import FuzzyIndex, edit_distance
+
+
+def _index():
+    idx = FuzzyIndex(max_distance=2)
+    idx.build([("en", "hemorrhage"), ("en", "diarrhea"), ("es", "lesión"),
+               ("en", "lesion"), ("es", "diarrea"), ("en", "fever")])
+    return idx
+
+
+def test_edit_distance_is_bounded():
+    assert edit_distance("hemorrage", "hemorrhage", 2) == 1
+    assert edit_distance("fevre", "fever", 2) == 1
+    assert edit_distance("abc", "xyzxyz", 2) == 3
+
+
+def test_typos_and_accents_resolve():
+    idx = _index()
+    assert idx.search("hemorrage")[0] == {"term": "hemorrhage", "language": "en", "distance": 1}
+    assert [(c["term"], c["distance"]) for c in idx.search("Lesion")] == [("lesion", 0), ("lesión", 0)]
+    diarrea = idx.search("diarea")
+    assert {c["term"] for c in diarrea} == {"diarrea", "diarrhea"}
+    assert idx.search("diarrhea", max_distance=0) == [
+        {"term": "diarrhea", "language": "en", "distance": 0}
+    ]
+    assert idx.search("zzzzz") == []
+
+
+def test_incremental_updates():
+    idx = _index()
+    idx.remove("en", "hemorrhage")
+    assert idx.search("hemorrage") == []
+    idx.add("en", "haemorrhage")
+    assert idx.search("hemorrhage")[0]["term"] == "haemorrhage"
+    idx.remove("es", "lesión")
+    assert [c["term"] for c in idx.search("lesion")] == ["lesion"]
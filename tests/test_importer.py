@@ -0,0 +1,65 @@
+import json
+
+from services.importer import BulkImporter, read_records
+from services.service import DictionaryService
+from models import Gender, PartOfSpeech
+
+
+class BatchRepo:
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.batches = []
+
+    def persist_entries(self, entries):
+        if any(et.term in self.reject for et in entries):
+            raise RuntimeError("rejected by database")
+        self.batches.append([et.term for et in entries])
+        return list(entries)
+
+
+def _write_jsonl(path, rows):
+    path.write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+
+
+def _row(lemma, **overrides):
+    row = {
+        "lemma": lemma,
+        "pos": "noun",
+        "meaning_desc": f"meaning of {lemma}",
+        "spanish_term": f"{lemma}-es",
+        "gender": "feminine",
+        "examples": [["en", f"A {lemma}."]],
+    }
+    row.update(overrides)
+    return row
+
+
+def test_import_chunks_and_reports_row_errors(tmp_path):
+    path = tmp_path / "glossary.jsonl"
+    _write_jsonl(path, [_row("fever"), _row("pain", pos="pronoun"), _row("cough"), _row("rash")])
+    repo = BatchRepo(reject={"rash"})
+
+    report = BulkImporter(DictionaryService(repo), chunk_size=2).run(read_records(str(path)))
+
+    assert report.rows == 4
+    assert report.imported == 2
+    assert [line for line, _ in report.errors] == [2, 4]
+    assert "invalid pos" in report.errors[0][1]
+    assert repo.batches == [["fever", "cough"]]
+
+
+def test_read_csv_records(tmp_path):
+    path = tmp_path / "glossary.csv"
+    path.write_text(
+        "lemma,pos,meaning_desc,spanish_term,gender,example_en,example_es\n"
+        "fever,noun,High temperature,fiebre,f,He has a fever.,Tiene fiebre.\n",
+        encoding="utf-8",
+    )
+    [(line_no, record)] = list(read_records(str(path)))
+    et = DictionaryService(BatchRepo()).build_entry(**{
+        k: record[k] for k in ("lemma", "pos", "meaning_desc", "spanish_term", "gender", "examples")
+    })
+    assert line_no == 2
+    assert et.pos is PartOfSpeech.NOUN
+    assert et.meanings[0].spanish_terms[0].gender is Gender.FEMININE
+    assert [ex.language for ex in et.meanings[0].examples] == ["en", "es"]
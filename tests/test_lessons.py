@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from benchmarks.generator import DictionaryGenerator
+from db.memory_repository import InMemoryRepository
+from models import EnglishTerm, Gender, Meaning, PartOfSpeech, SpanishTerm
+from services.lessons import LessonIndex, difficulty, topics
+from services.service import DictionaryService
+
+
+@pytest.fixture
+def service():
+    svc = DictionaryService(InMemoryRepository())
+    svc.add_entries(DictionaryGenerator(300, seed=2).entries())
+    return svc
+
+
+def _terms(lesson):
+    return [t["english"] for t in lesson["terms"]]
+
+
+def test_difficulty_heuristic():
+    assert difficulty("fever") == "easy"
+    assert difficulty("headache") == "medium"
+    assert difficulty("encephalectomy") == "hard"
+    assert difficulty("heart attack") == "hard"
+
+
+def test_topic_stems_skip_ordinary_words():
+    def entry(lemma, description):
+        et = EnglishTerm(term=lemma, pos=PartOfSpeech.NOUN)
+        Meaning(description=description, english_term=et)
+        return et
+
+    assert topics(entry("chill", "My other early cold color of the hemisphere.")) == ()
+    assert topics(entry("otitis", "Pain in the ear.")) == ("ent", "general")
+    assert topics(entry("colonoscopy", "A look inside the colon.")) == ("digestive",)
+    assert topics(entry("myalgia", "Muscle pain.")) == ("musculoskeletal", "general")
+    assert topics(entry("hematoma", "Blood under the eyelids.")) == ("hematology", "ophthalmology")
+
+
+def test_filters_and_reproducible_pages(service):
+    lesson = service.get_english_lesson(topic="cardiology", pos="noun", per_page=5)
+    assert lesson["total"] > 5 and len(lesson["terms"]) == 5
+    assert all(t["pos"] == "noun" for t in lesson["terms"])
+    # The generated descriptions have no cardiology words, so only the roots match.
+    assert all(t["english"].startswith(("cardi", "angi")) for t in lesson["terms"])
+    assert lesson == service.get_english_lesson(topic="cardiology", pos="noun", per_page=5)
+
+    pages = [
+        _terms(service.get_english_lesson(seed=9, page=p, per_page=20))
+        for p in range(1, 5)
+    ]
+    flat = [t for page in pages for t in page]
+    assert len(flat) == len(set(flat)) == 80
+    assert pages[0] != _terms(service.get_english_lesson(seed=10, per_page=20))
+
+    with pytest.raises(ValueError):
+        service.get_english_lesson(topic="astrology")
+    with pytest.raises(ValueError):
+        service.get_english_lesson(per_page=1000)
+
+
+def test_spaced_sessions_review_earlier_batches(service):
+    sessions = [
+        service.get_english_lesson(mode="spaced", seed=1, page=p, per_page=4)["terms"]
+        for p in range(1, 6)
+    ]
+    new = [[t["english"] for t in s if not t["review"]] for s in sessions]
+    review = [[t["english"] for t in s if t["review"]] for s in sessions]
+    assert review[0] == []
+    assert review[1] == new[0]
+    # Session 5 reviews sessions 4 and 3 (intervals 1 and 2), capped at per_page.
+    assert review[4] == new[3]
+
+
+def test_lesson_sets_follow_writes(service):
+    before = service.get_english_lesson(difficulty="easy", per_page=50)
+    service.add_full_entry("tos", "noun", [
+        {"description": "A cough.", "spanish_terms": [{"term": "tos", "gender": "f"}]},
+    ])
+    after = service.get_english_lesson(difficulty="easy", per_page=50)
+    assert after["total"] == before["total"] + 1
+    service.delete_entry("tos")
+    assert service.get_english_lesson(difficulty="easy", per_page=50) == before
+
+
+def test_repeat_requests_are_served_from_the_page_cache():
+    idx = LessonIndex()
+    idx.build(DictionaryGenerator(50).entries())
+    first = idx.lesson(seed=3)
+    assert idx.lesson(seed=3) is first
+    assert json.loads(first.body)["total"] == 50
+
+
+def test_a_write_only_invalidates_the_sets_it_touches():
+    idx = LessonIndex()
+    idx.build(DictionaryGenerator(50).entries())
+    respiratory = idx.lesson(topic="respiratory", seed=4)
+    everything = idx.lesson(seed=4)
+
+    et = EnglishTerm(term="cardiopathy", pos=PartOfSpeech.NOUN)
+    m = Meaning(description="Heart disease.", english_term=et)
+    SpanishTerm(term="cardiopatía", gender=Gender.FEMININE, meaning=m)
+    idx.add_entry(et)
+    assert idx.lesson(topic="respiratory", seed=4) is respiratory
+    assert json.loads(idx.lesson(seed=4).body)["total"] == json.loads(everything.body)["total"] + 1
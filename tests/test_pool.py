@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+from db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.alive = True
+        self.rollbacks = 0
+
+    def ping(self, reconnect=False):
+        if not self.alive:
+            raise OSError("gone away")
+
+    def is_connected(self):
+        return self.alive
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def test_connections_are_reused():
+    pool = ConnectionPool(FakeConnection, size=2)
+    with pool.connection() as a:
+        pass
+    with pool.connection() as b:
+        assert b is a
+    stats = pool.stats()
+    assert stats["created"] == 1
+    assert stats["in_use"] == 0
+    assert stats["idle"] == 1
+    assert a.rollbacks == 2
+
+
+def test_checkout_times_out_when_exhausted():
+    pool = ConnectionPool(FakeConnection, size=1, timeout=0.05)
+    cn = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    assert pool.stats()["timeouts"] == 1
+    pool.release(cn)
+    assert pool.acquire() is cn
+
+
+def test_waiter_gets_released_connection():
+    pool = ConnectionPool(FakeConnection, size=1, timeout=2)
+    cn = pool.acquire()
+    got = []
+    t = threading.Thread(target=lambda: got.append(pool.acquire()))
+    t.start()
+    while pool.stats()["waiting"] == 0:
+        pass
+    pool.release(cn)
+    t.join()
+    assert got == [cn]
+
+
+def test_stale_connection_is_replaced():
+    pool = ConnectionPool(FakeConnection, size=1, ping_after=0)
+    with pool.connection() as first:
+        pass
+    first.alive = False
+    with pool.connection() as second:
+        assert second is not first
+    assert first.closed
+    assert pool.stats()["discarded"] == 1
+    assert pool.stats()["open"] == 1
@@ -0,0 +1,69 @@
+import json
+import threading
+from collections import Counter
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+from api.app import create_app
+from benchmarks.generator import DictionaryGenerator
+from tools.replay import HttpTarget, InProcessTarget, read_log, replay, synthesize
+
+
+def _record_some_traffic(log):
+    client = create_app({"REPOSITORY_BACKEND": "memory", "TRAFFIC_LOG": str(log)}).test_client()
+    client.post("/api/v1/add", json={
+        "lemma": "fever", "pos": "noun", "meaning_desc": "An elevated body temperature.",
+        "spanish_term": "fiebre", "gender": "feminine",
+    })
+    client.get("/api/v1/lookup?english=fever")
+    client.get("/api/v1/lookup?english=missing")
+    client.get("/api/v1/metrics")
+
+
+def test_recorded_log_replays_in_process(tmp_path):
+    log = tmp_path / "traffic.jsonl"
+    _record_some_traffic(log)
+    records = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [(r["method"], r["path"], r["status"]) for r in records] == [
+        ("POST", "/api/v1/add", 200),
+        ("GET", "/api/v1/lookup", 200),
+        ("GET", "/api/v1/lookup", 404),
+    ]
+    assert records[0]["body"]["lemma"] == "fever" and records[1]["query"] == "english=fever"
+
+    requests = list(read_log(str(log)))
+    assert requests[0]["at"] == 0 and requests[2]["at"] >= requests[1]["at"] >= 0
+    target = InProcessTarget(create_app({"REPOSITORY_BACKEND": "memory"}), {})
+    summary = replay(requests, target, concurrency=1, speedup=100).summary()
+    assert summary["GET /api/v1/lookup"]["statuses"] == {"200": 1, "404": 1}
+    assert summary["POST /api/v1/add"]["error_rate"] == 0
+
+
+def test_synthetic_traffic_over_http(tmp_path):
+    class Quiet(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    gen = DictionaryGenerator(200, seed=1)
+    requests = list(synthesize(300, gen, seed=1))
+    assert requests == list(synthesize(300, gen, seed=1))
+    lookups = Counter(r["query"] for r in requests if r["path"] == "/api/v1/lookup")
+    assert lookups.most_common(1)[0][1] > 5
+
+    from db.memory_repository import InMemoryRepository
+    from services.service import DictionaryService
+
+    repo = InMemoryRepository()
+    DictionaryService(repo).add_entries(gen.entries())
+    server = make_server("127.0.0.1", 0, create_app({"REPOSITORY": repo}), handler_class=Quiet)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        target = HttpTarget(f"http://127.0.0.1:{server.server_port}", {})
+        report = replay(requests, target, concurrency=4)
+    finally:
+        server.shutdown()
+    summary = report.summary()
+    assert sum(ep["count"] for ep in summary.values()) == 300
+    assert all(ep["error_rate"] == 0 for ep in summary.values())
+    assert summary["GET /api/v1/lookup"]["statuses"].keys() <= {"200", "404"}
+    assert summary["POST /api/v1/add"]["statuses"] == {"200": summary["POST /api/v1/add"]["count"]}
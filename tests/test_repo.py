@@ -1,4 +1,10 @@
-﻿from db.mysql_repository import MysqlRepository
+﻿from uuid import UUID
+
+from db import instrumentation, sqlite_repository
+from db.mysql_repository import MysqlRepository
+from db.pool import ConnectionPool
+from db.sqlite_repository import SqliteRepository
+from models.text import fold
 from models import EnglishTerm, Meaning, SpanishTerm, Example, PartOfSpeech, Gender
 
 import pytest
@@ -32,3 +38,218 @@ def test_insert_and_roundtrip_graph(repo: MysqlRepository):
     back = repo.load_english_term("bruise")
     assert back and back.term == "bruise"
     assert any(st.term == "moretón" for mm in back.meanings for st in mm.spanish_terms)
+
+
+def _entry(lemma, n_meanings):
+    et = EnglishTerm(term=lemma, pos=PartOfSpeech.NOUN)
+    for j in range(n_meanings):
+        m = Meaning(description=f"sense {j}", english_term=et)
+        SpanishTerm(term=f"{lemma}-{j}", gender=Gender.MASCULINE, meaning=m)
+        Example(language="en", text="example", meaning=m)
+    return et
+
+
+class RecordingCursor:
+    def __init__(self, tables):
+        self.tables = tables
+        self.queries = []
+        self._rows = []
+
+    def execute(self, sql, params=()):
+        self.queries.append(sql)
+        if "FROM english_term" in sql:
+            self._rows = [r for r in self.tables["english_term"] if r[1] in params]
+        elif "FROM meaning m" in sql:
+            self._rows = [r for r in self.tables["meaning"] if r[0] in params]
+        elif "FROM meaning_spanish" in sql:
+            self._rows = [r for r in self.tables["spanish"] if r[0] in params]
+        elif "FROM example" in sql:
+            self._rows = [r for r in self.tables["example"] if r[0] in params]
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _fake_dictionary(n_meanings):
+    et_id = "00000000-0000-0000-0000-000000000001"
+    tables = {
+        "english_term": [(et_id, "discharge", "noun")],
+        "meaning": [],
+        "spanish": [],
+        "example": [],
+    }
+    for i in range(n_meanings):
+        mid = f"00000000-0000-0000-0001-{i:012d}"
+        tables["meaning"].append((et_id, mid, f"sense {i}"))
+        tables["spanish"].append((mid, f"00000000-0000-0000-0002-{i:012d}", f"alta {i}", "f"))
+        tables["example"].append((mid, f"00000000-0000-0000-0003-{i:012d}", "en", f"example {i}"))
+    return tables
+
+
+def _load_counting_queries(n_meanings):
+    cur = RecordingCursor(_fake_dictionary(n_meanings))
+    r = MysqlRepository(pool=ConnectionPool(lambda: RecordingConnection(cur)))
+    et = r.load_english_term("discharge")
+    return et, len(cur.queries)
+
+
+def test_load_english_term_query_count_is_constant():
+    small, small_queries = _load_counting_queries(1)
+    large, large_queries = _load_counting_queries(25)
+    assert small_queries == large_queries
+    assert len(large.meanings) == 25
+
+
+def test_load_english_term_attaches_children():
+    et, _ = _load_counting_queries(3)
+    for m in et.meanings:
+        assert len(m.spanish_terms) == 1 and m.spanish_terms[0].meaning is m
+        assert len(m.examples) == 1 and m.examples[0].meaning is m
+
+
+def test_load_english_terms_query_count_is_constant():
+    tables = _fake_dictionary(3)
+    for i in range(2, 40):
+        tables["english_term"].append((f"00000000-0000-0000-0004-{i:012d}", f"term{i}", "noun"))
+    cur = RecordingCursor(tables)
+    r = MysqlRepository(pool=ConnectionPool(lambda: RecordingConnection(cur)))
+
+    found = r.load_english_terms(["discharge", "term2"])
+    few_queries = len(cur.queries)
+    cur.queries.clear()
+    many = r.load_english_terms(["discharge"] + [f"term{i}" for i in range(2, 40)] + ["missing"])
+
+    assert set(found) == {"discharge", "term2"}
+    assert len(many) == 39 and "missing" not in many
+    assert len(cur.queries) == few_queries
+
+
+def test_binary_ids_roundtrip_through_bytes():
+    def to_bin(value):
+        try:
+            return bytearray(UUID(value).bytes)
+        except (TypeError, ValueError):
+            return value
+
+    tables = {
+        name: [tuple(to_bin(v) for v in row) for row in rows]
+        for name, rows in _fake_dictionary(2).items()
+    }
+    cur = RecordingCursor(tables)
+    r = MysqlRepository(pool=ConnectionPool(lambda: RecordingConnection(cur)), binary_ids=True)
+    et = r.load_english_term("discharge")
+    assert et.term_id == UUID("00000000-0000-0000-0000-000000000001")
+    assert [m.meaning_id.hex[-1] for m in et.meanings] == ["0", "1"]
+    assert et.meanings[1].examples[0].example_id == UUID("00000000-0000-0000-0003-000000000001")
+    assert r._id(et.term_id) == et.term_id.bytes
+
+
+def test_bulk_delete_statement_count_does_not_grow_with_meanings(monkeypatch):
+    def statements(n_meanings):
+        r = SqliteRepository(":memory:")
+        entries = []
+        for i in range(5):
+            et = EnglishTerm(term=f"term{i}", pos=PartOfSpeech.NOUN)
+            for j in range(n_meanings):
+                m = Meaning(description=f"sense {j}", english_term=et)
+                SpanishTerm(term=f"término{i}-{j}", gender=Gender.MASCULINE, meaning=m)
+                Example(language="en", text="example", meaning=m)
+            entries.append(et)
+        r.persist_entries(entries)
+        executed = []
+        execute = sqlite_repository._Cursor.execute
+        monkeypatch.setattr(
+            sqlite_repository._Cursor, "execute",
+            lambda cur, sql, params=(): executed.append(sql) or execute(cur, sql, params),
+        )
+        deleted, orphans = r.delete_entries_by_english_lemmas(
+            [f"term{i}" for i in range(5)], chunk_size=2
+        )
+        assert len(deleted) == 5 and len(orphans) == 5 * n_meanings
+        monkeypatch.undo()
+        assert r.list_terms("en") == [] and r.list_terms("es") == []
+        return len(executed)
+
+    assert statements(1) == statements(20)
+
+
+def test_instrumented_cursor_counts_queries_rows_and_logs_slow_ones(monkeypatch, caplog):
+    monkeypatch.setattr(instrumentation, "enabled", True)
+    r = SqliteRepository(":memory:")
+    r.persist_entries([_entry("sprain", 3)])
+
+    with instrumentation.track() as stats:
+        et = r.load_english_term("sprain")
+    assert len(et.meanings) == 3
+    assert stats.connections == 1
+    assert stats.queries >= 1 and stats.rows >= 1 + 3 * 2
+    assert stats.held_seconds >= stats.query_seconds > 0
+
+    monkeypatch.setattr(instrumentation, "slow_query_seconds", 0.0)
+    with caplog.at_level("WARNING", logger="db.instrumentation"):
+        r.load_english_term("sprain")
+    assert any("slow query" in rec.getMessage() and "english_term" in rec.getMessage()
+               for rec in caplog.records)
+
+    monkeypatch.setattr(instrumentation, "enabled", False)
+    with instrumentation.track() as stats:
+        r.load_english_term("sprain")
+    assert stats.queries == 0 and stats.connections == 0
+
+
+class AccentInsensitiveRepo(SqliteRepository):
+    """SQLite with MySQL's *_ci behaviour: NOCASE also ignores accents."""
+
+    _key = staticmethod(fold)
+
+    def _connect(self):
+        cn = super()._connect()
+        cn.create_collation("NOCASE", lambda a, b: (fold(a) > fold(b)) - (fold(a) < fold(b)))
+        return cn
+
+
+def test_upsert_onto_accent_variant_of_stored_row():
+    r = AccentInsensitiveRepo(":memory:")
+    first = _entry("lesión", 1)
+    first.meanings[0].spanish_terms[0].term = "daño"
+    r.upsert_entry(first)
+    again = _entry("Lesion", 1)
+    again.meanings[0].spanish_terms[0].term = "DANO"
+    r.upsert_entry(again)
+    assert again.term_id == first.term_id
+    assert again.meanings[0].spanish_terms[0].term_id == first.meanings[0].spanish_terms[0].term_id
+    assert [m.description for m in r.load_english_term("lesion").meanings] == ["sense 0"]
+
+
+def test_bulk_import_onto_accent_variants_of_stored_rows():
+    r = AccentInsensitiveRepo(":memory:")
+    r.persist_entries([_entry("lesión", 1)])
+    batch = [_entry("LESION", 1), _entry("lésion", 1), _entry("bruise", 1)]
+    batch[2].meanings[0].spanish_terms[0].term = "lesion-0"
+    r.persist_entries(batch)
+    assert batch[0].term_id == batch[1].term_id
+    assert r.list_terms("en") == ["bruise", "lesión"]
+    assert len(r.load_english_term("lesion").meanings) == 3
@@ -0,0 +1,57 @@
+from models import EnglishTerm, Meaning, Example, PartOfSpeech
+from services.search import SearchIndex, highlight
+
+
+def _entry(lemma, description, *examples):
+    et = EnglishTerm(term=lemma, pos=PartOfSpeech.NOUN)
+    m = Meaning(description=description, english_term=et)
+    for lang, text in examples:
+        Example(language=lang, text=text, meaning=m)
+    return et
+
+
+def _index():
+    idx = SearchIndex()
+    idx.build([
+        _entry("lesion", "Pathological change; abnormal tissue",
+               ("en", "The MRI showed a brain lesion."),
+               ("es", "La resonancia mostró una lesión cerebral.")),
+        _entry("fever", "An elevated body temperature",
+               ("en", "He has a fever and a headache.")),
+        _entry("headache", "Pain in the head",
+               ("en", "A headache, a headache, a terrible headache.")),
+    ])
+    return idx
+
+
+def test_bm25_ranks_and_highlights():
+    idx = _index()
+    total, results = idx.search("showed a brain lesion")
+    assert total >= 1
+    top = results[0]
+    assert (top["lemma"], top["field"], top["language"]) == ("lesion", "example", "en")
+    assert "<mark>brain</mark>" in top["snippet"]
+
+    total, results = idx.search("headache")
+    assert [r["lemma"] for r in results] == ["headache", "fever"]
+    assert total == 2
+
+
+def test_accent_insensitive_and_language_filter():
+    idx = _index()
+    total, results = idx.search("lesion cerebral", language="es")
+    assert total == 1 and results[0]["snippet"].count("<mark>") == 2
+
+
+def test_pagination_and_incremental_updates():
+    idx = _index()
+    total, page2 = idx.search("headache", offset=1, limit=1)
+    assert total == 2 and page2[0]["lemma"] == "fever"
+    idx.remove_entry("Headache")
+    assert idx.search("headache")[0] == 1
+    idx.add_entry(_entry("migraine", "Recurring severe headache"))
+    assert {r["lemma"] for r in idx.search("headache")[1]} == {"fever", "migraine"}
+
+
+def test_highlight_escapes_html():
+    assert highlight("<b>fever</b>", {"fever"}) == "&lt;b&gt;<mark>fever</mark>&lt;/b&gt;"
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from db.memory_repository import InMemoryRepository
+from db.snapshot import ReadOnlyError, SnapshotError, SnapshotRepository, write_snapshot
+from models import EnglishTerm, Meaning, SpanishTerm, Example, PartOfSpeech, Gender
+from services.service import DictionaryService
+
+
+def _source():
+    repo = InMemoryRepository()
+    entries = []
+    for lemma, spanish in [("Lesion", "lesión"), ("bruise", "moretón"), ("wound", "herida"),
+                           ("injury", "lesion")]:
+        et = EnglishTerm(term=lemma, pos=PartOfSpeech.NOUN)
+        m = Meaning(description=f"Meaning of {lemma}", english_term=et)
+        SpanishTerm(term=spanish, gender=Gender.FEMININE, meaning=m)
+        Example(language="en", text=f"A {lemma}.", meaning=m)
+        Example(language="es", text=f"Una {spanish}.", meaning=m)
+        entries.append(et)
+    repo.persist_entries(entries)
+    return repo
+
+
+@pytest.fixture
+def source():
+    return _source()
+
+
+@pytest.fixture
+def path(tmp_path, source):
+    path = str(tmp_path / "dictionary.snapshot")
+    write_snapshot(DictionaryService(source).iter_entries(batch_size=2), path)
+    return path
+
+
+def test_lookups_match_source(path, source):
+    snap = SnapshotRepository(path)
+    for lemma in ("lesion", "BRUISE", "wound"):
+        a, b = source.load_english_term(lemma), snap.load_english_term(lemma)
+        assert (b.term, b.pos, b.term_id) == (a.term, a.pos, a.term_id)
+        assert [m.description for m in b.meanings] == [m.description for m in a.meanings]
+        assert [(e.language, e.text) for e in b.meanings[0].examples] == [
+            (e.language, e.text) for e in a.meanings[0].examples
+        ]
+    assert snap.load_english_term("missing") is None
+    assert set(snap.load_english_terms(["lesion", "wound", "nope"])) == {"Lesion", "wound"}
+    assert sorted(et.term for et in snap.load_spanish_term("LESIÓN")) == ["Lesion", "injury"]
+    assert snap.list_terms("en") == ["bruise", "injury", "Lesion", "wound"]
+    assert snap.list_terms("en", after="injury", limit=1) == ["Lesion"]
+
+
+def test_writes_are_rejected(path):
+    with pytest.raises(ReadOnlyError):
+        SnapshotRepository(path).delete_entry_by_english_lemma("wound")
+
+
+def test_corrupt_snapshot_is_refused_and_reload_keeps_old(path, tmp_path):
+    repo = SnapshotRepository(path)
+    assert repo.reload() is False
+
+    bad = str(tmp_path / "bad.snapshot")
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+    data[-1] ^= 0xFF
+    with open(bad, "wb") as f:
+        f.write(data)
+    with pytest.raises(SnapshotError):
+        repo.reload(bad)
+    assert repo.load_english_term("wound") is not None
+
+    et = EnglishTerm(term="fever", pos=PartOfSpeech.NOUN)
+    Meaning(description="High temperature", english_term=et)
+    write_snapshot([et], path)
+    assert repo.reload() is True
+    assert repo.load_english_term("wound") is None
+    assert repo.load_english_term("fever").meanings[0].description == "High temperature"
+    assert not [f for f in os.listdir(tmp_path) if f.startswith(".snapshot-")]
+
+
+def test_reload_interval_picks_up_new_file(path):
+    repo = SnapshotRepository(path, reload_interval=1e-9)
+    assert repo.load_english_term("fever") is None
+    et = EnglishTerm(term="fever", pos=PartOfSpeech.NOUN)
+    write_snapshot([et], path)
+    assert repo.load_english_term("fever").term == "fever"
@@ -0,0 +1,53 @@
+from services.suggest import PrefixIndex
+
+
+def _index(scan_limit=512):
+    idx = PrefixIndex(top_k=3, scan_limit=scan_limit)
+    idx.build([("en", "fever"), ("en", "fatigue"), ("en", "fracture"), ("en", "femur"),
+               ("es", "fiebre"), ("es", "lesión"), ("en", "lesion")])
+    return idx
+
+
+def _terms(results):
+    return [r["term"] for r in results]
+
+
+def test_prefix_matches_are_case_and_accent_insensitive():
+    idx = _index()
+    assert _terms(idx.suggest("LES", 10)) == ["lesion", "lesión"]
+    assert {r["language"] for r in idx.suggest("lesi")} == {"en", "es"}
+    assert idx.suggest("zz") == []
+
+
+def test_ranked_by_lookup_frequency():
+    for scan_limit in (512, 0):
+        idx = _index(scan_limit)
+        assert _terms(idx.suggest("f", 3)) == ["femur", "fever", "fiebre"]
+        idx.record_hit("en", "fracture")
+        idx.record_hit("en", "fracture")
+        idx.record_hit("en", "fatigue")
+        assert _terms(idx.suggest("f", 3)) == ["fracture", "fatigue", "femur"]
+
+
+def test_incremental_add_and_remove_update_cached_prefixes():
+    idx = _index(scan_limit=0)
+    assert _terms(idx.suggest("fe", 3)) == ["femur", "fever"]
+    idx.add("en", "fe")
+    idx.record_hit("en", "fever")
+    assert _terms(idx.suggest("fe", 3)) == ["fever", "fe", "femur"]
+    idx.remove("en", "FEVER")
+    assert _terms(idx.suggest("fe", 3)) == ["fe", "femur"]
+    assert len(idx) == 7
+
+
+def test_buffered_writes_are_merged_before_a_scan():
+    idx = _index()
+    idx.add("en", "fetus")
+    idx.remove("en", "femur")
+    idx.add("en", "femur")
+    idx.remove("en", "fetus")
+    idx.add("es", "fémur")
+    assert len(idx) == 8
+    assert idx._entries == sorted(idx._entries) and len(idx._entries) == 7
+    assert _terms(idx.suggest("fem", 3)) == ["femur", "fémur"]
+    assert len(idx._entries) == 8 and not idx._added and not idx._removed
@@ -0,0 +1,70 @@
+import unicodedata
+
+from db.memory_repository import InMemoryRepository
+from services.service import DictionaryService
+from services.variants import VariantIndex, variants
+
+
+def _index():
+    idx = VariantIndex()
+    idx.build([("en", "lesion"), ("en", "fever"), ("en", "cough"), ("en", "diagnosis"),
+               ("en", "bronchus"), ("en", "allergy"), ("en", "heart attack"),
+               ("en", "tooth"), ("es", "tos")])
+    return idx
+
+
+def test_inflection_rules():
+    assert {"lesions"} <= variants("lesion")
+    assert {"coughs", "coughing", "coughed"} <= variants("cough")
+    assert {"allergies"} <= variants("allergy")
+    assert {"diagnoses"} <= variants("diagnosis")
+    assert {"bronchi"} <= variants("bronchus")
+    assert {"bruising", "bruised"} <= variants("bruise")
+    assert {"stabbing"} <= variants("stab")
+    assert {"heart attacks"} <= variants("Heart  Attack")
+    assert "lesia" not in variants("lesion")
+
+
+def test_variants_resolve_to_the_canonical_lemma():
+    idx = _index()
+    for query in ("lesions", "Fevers", "coughing", " Lesion ", "LESIÓN",
+                  unicodedata.normalize("NFD", "lesión"), "diagnoses", "bronchi",
+                  "allergies", "heart  attacks", "teeth"):
+        assert idx.resolve(query) is not None, query
+    assert idx.resolve("coughing") == "cough"
+    assert idx.resolve("Heart Attacks") == "heart attack"
+    assert idx.resolve("tos") is None
+    assert idx.resolve("fevered patient") is None
+
+
+def test_lemmas_beat_variants_and_collisions_survive_removal():
+    idx = _index()
+    idx.add("en", "coughs")
+    assert idx.resolve("coughs") == "coughs"
+    idx.add("en", "dos")
+    idx.add("en", "dose")
+    assert idx.resolve("doses") == "dos"
+    idx.remove("en", "DOS")
+    assert idx.resolve("doses") == "dose"
+    idx.remove("en", "dose")
+    assert idx.resolve("doses") is None
+    idx.remove("en", "coughs")
+    assert idx.resolve("coughs") == "cough"
+
+
+def test_service_lookups_resolve_variants():
+    svc = DictionaryService(InMemoryRepository())
+    svc.add_full_entry("lesion", "noun", [
+        {"description": "An abnormal area of tissue.", "spanish_terms": [{"term": "lesión", "gender": "f"}]},
+    ])
+    assert svc.lookup_english("Lesions ").term == "lesion"
+    assert svc.lookup_english_encoded("lesions").term == "lesion"
+    found, missing = svc.lookup_many(["lesions", "coughs"])
+    assert found["lesions"].term == "lesion" and missing == ["coughs"]
+
+    svc.add_full_entry("cough", "noun", [
+        {"description": "A sudden expulsion of air.", "spanish_terms": [{"term": "tos", "gender": "f"}]},
+    ])
+    assert svc.lookup_english("coughing").term == "cough"
+    svc.delete_entry("cough")
+    assert svc.lookup_english("coughing") is None
@@ -0,0 +1,114 @@
+import json
+import threading
+
+import pytest
+
+from db.memory_repository import InMemoryRepository
+from db.sqlite_repository import SqliteRepository
+from services.service import DictionaryService
+from services import write_behind
+from services.write_behind import QueueFull, WriteBehindQueue
+
+
+def _add(lemma, term="fiebre"):
+    return {
+        "lemma": lemma, "pos": "noun", "meaning_desc": f"About {lemma}.",
+        "spanish_term": term, "gender": "feminine",
+    }
+
+
+class CountingService(DictionaryService):
+    def __init__(self, repo, gate=None):
+        super().__init__(repo)
+        self.batches = []
+        self.gate = gate
+
+    def save_entries(self, entries):
+        if self.gate:
+            self.gate.wait()
+        entries = list(entries)
+        self.batches.append([et.term for et in entries])
+        super().save_entries(entries)
+
+
+def test_queued_adds_commit_in_batches(tmp_path):
+    service = CountingService(SqliteRepository(str(tmp_path / "wb.sqlite3")), threading.Event())
+    writes = WriteBehindQueue(service, batch_size=25, linger=0.2)
+    acks = [writes.submit(_add(f"term{i:03}")) for i in range(60)]
+    assert {a["status"] for a in acks} == {"queued"}
+    assert writes.status(acks[0]["id"])["status"] == "queued"
+    assert service.lookup_english("term000") is None
+
+    service.gate.set()
+    assert writes.flush(timeout=5)
+    assert [len(b) for b in service.batches] == [25, 25, 10]
+    assert writes.status(acks[-1]["id"]) == {"id": acks[-1]["id"], "status": "committed", "lemma": "term059"}
+    assert service.lookup_english("term042").meanings[0].spanish_terms[0].term == "fiebre"
+    assert writes.stats()["committed"] == 60 and writes.stats()["batches"] == 3
+    writes.close()
+
+
+def test_invalid_adds_are_rejected_before_queueing():
+    writes = WriteBehindQueue(DictionaryService(InMemoryRepository()))
+    with pytest.raises(ValueError):
+        writes.submit({"lemma": "fever"})
+    with pytest.raises(ValueError):
+        writes.submit(dict(_add("fever"), pos="planet"))
+    assert writes.stats()["submitted"] == 0
+    writes.close()
+
+
+def test_full_queue_refuses_adds():
+    service = CountingService(InMemoryRepository(), threading.Event())
+    writes = WriteBehindQueue(service, max_size=3)
+    for i in range(3):
+        writes.submit(_add(f"term{i}"))
+    with pytest.raises(QueueFull):
+        writes.submit(_add("term3"))
+    assert writes.stats()["rejected"] == 1
+    service.gate.set()
+    writes.close()
+    assert writes.stats()["committed"] == 3
+    with pytest.raises(QueueFull):
+        writes.submit(_add("term4"))
+
+
+def test_spill_file_replays_uncommitted_adds(tmp_path):
+    spill = tmp_path / "adds.jsonl"
+    stalled = CountingService(InMemoryRepository(), threading.Event())
+    writes = WriteBehindQueue(stalled, spill_path=str(spill))
+    first = writes.submit(_add("fever"))
+    second = writes.submit(_add("cough", "tos"))
+    journal = spill.read_text()
+    assert [json.loads(line)["id"] for line in journal.splitlines()] == [first["id"], second["id"]]
+    stalled.gate.set()
+    writes.close()
+    assert spill.read_text() == ""
+
+    # A crash after the first add committed leaves its "done" record and a
+    # torn final line behind.
+    done = json.dumps({"op": "done", "ids": [first["id"]]})
+    spill.write_text(journal + done + "\n" + '{"op": "add", "id"')
+    service = DictionaryService(InMemoryRepository())
+    recovered = WriteBehindQueue(service, spill_path=str(spill))
+    assert recovered.flush(timeout=5)
+    assert recovered.status(second["id"])["status"] == "committed"
+    assert recovered.status(first["id"]) is None
+    assert service.lookup_english("cough").meanings[0].spanish_terms[0].term == "tos"
+    assert service.lookup_english("fever") is None
+    assert spill.read_text() == ""
+    recovered.close()
+
+
+def test_failed_compaction_keeps_the_journal(tmp_path, monkeypatch):
+    spill = tmp_path / "adds.jsonl"
+    journal = json.dumps({"op": "add", "id": "a1", "payload": _add("fever")}) + "\n"
+    spill.write_text(journal)
+
+    def crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(write_behind.os, "replace", crash)
+    with pytest.raises(OSError):
+        WriteBehindQueue(DictionaryService(InMemoryRepository()), spill_path=str(spill))
+    assert spill.read_text() == journal
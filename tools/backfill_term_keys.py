@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import argparse
+
+from db.factory import create_repository
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Fill spanish_term.term_key for rows written before migration 001."
+    )
+    parser.add_argument("--backend", choices=["mysql", "sqlite"], help="defaults to $DICTIONARY_BACKEND or mysql")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    repo = create_repository(args.backend)
+    print(f"updated {repo.backfill_spanish_term_keys(args.batch_size)} rows")
+
+
+if __name__ == "__main__":
+    main()
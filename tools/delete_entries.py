@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from db.factory import create_repository
+from db.sql_repository import DELETE_CHUNK_SIZE
+
+
+def read_lemmas(path: str):
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8-sig")
+    with f:
+        for line in f:
+            lemma = line.strip()
+            if lemma and not lemma.startswith("#"):
+                yield lemma
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Delete the English entries listed in a file, one lemma per line."
+    )
+    parser.add_argument("path", help="file of lemmas, or - for stdin")
+    parser.add_argument("--backend", choices=["mysql", "sqlite"], help="defaults to $DICTIONARY_BACKEND or mysql")
+    parser.add_argument("--chunk-size", type=int, default=DELETE_CHUNK_SIZE, help="lemmas per transaction")
+    args = parser.parse_args(argv)
+
+    lemmas = list(read_lemmas(args.path))
+    repo = create_repository(args.backend)
+    started = time.perf_counter()
+    deleted, orphans = repo.delete_entries_by_english_lemmas(lemmas, chunk_size=args.chunk_size)
+    print(
+        f"deleted {len(deleted)}/{len(lemmas)} entries and {len(orphans)} orphaned "
+        f"Spanish terms in {time.perf_counter() - started:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
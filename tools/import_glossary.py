@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from db.factory import BACKENDS, create_repository
+from services.importer import BulkImporter, ImportReport, read_records
+from services.service import DictionaryService
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Bulk import a JSONL or CSV glossary into the dictionary."
+    )
+    parser.add_argument("path", help="glossary file (.jsonl or .csv)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="override the file extension")
+    parser.add_argument("--backend", choices=BACKENDS, help="defaults to $DICTIONARY_BACKEND or mysql")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rows per transaction")
+    parser.add_argument("--max-errors", type=int, default=20, help="row errors to print")
+    args = parser.parse_args(argv)
+
+    def progress(report: ImportReport) -> None:
+        print(
+            f"\r{report.rows} rows read, {report.imported} imported, "
+            f"{report.failed} failed ({report.rows_per_second:,.0f} rows/s)",
+            end="", file=sys.stderr, flush=True,
+        )
+
+    service = DictionaryService(create_repository(args.backend))
+    importer = BulkImporter(service, chunk_size=args.chunk_size, on_progress=progress)
+    report = importer.run(read_records(args.path, args.format))
+    print(file=sys.stderr)
+
+    for line_no, message in report.errors[: args.max_errors]:
+        print(f"line {line_no}: {message}")
+    if report.failed > args.max_errors:
+        print(f"... {report.failed - args.max_errors} more errors")
+    print(
+        f"imported {report.imported}/{report.rows} rows in {report.seconds:.2f}s "
+        f"({report.rows_per_second:,.0f} rows/s)"
+    )
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
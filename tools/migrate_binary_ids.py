@@ -0,0 +1,220 @@
+"""Convert a MySQL dictionary from CHAR(36) to BINARY(16) ids while it serves traffic.
+
+Works like an online schema change, one shadow table per table:
+
+1. ``copy``: create ``_bin_<table>`` with BINARY(16) id columns, add
+   triggers that mirror every insert, update and delete into it (including
+   the rows InnoDB would cascade-delete, since cascades do not fire
+   triggers), then copy existing rows in primary-key batches.
+2. ``cutover``: swap all six tables in one atomic ``RENAME TABLE``, drop the
+   triggers and the old tables' foreign keys, and recreate the foreign keys
+   on the new tables.
+3. ``cleanup``: drop the ``_old_<table>`` copies once you are satisfied.
+
+Until cut-over nothing changes for the application. At cut-over every
+process using the database, readers as well as writers, must be restarted
+with ``MYSQL_BINARY_IDS=1`` (or ``auto``): ``MysqlRepository`` decodes either
+id format, but a process still binding CHAR(36) ids finds each term with
+none of its meanings (and caches that), and its inserts are rejected.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from db.mysql_repository import MysqlRepository
+
+# table -> (id columns, other columns, primary key)
+TABLES: Dict[str, Tuple[Sequence[str], Sequence[str], Sequence[str]]] = {
+    "english_term": (("id",), ("lemma", "pos"), ("id",)),
+    "spanish_term": (("id",), ("term", "term_key", "gender"), ("id",)),
+    "meaning": (("id",), ("description",), ("id",)),
+    "example": (("id", "meaning_id"), ("language", "text"), ("id",)),
+    "meaning_english": (("meaning_id", "english_term_id"), (), ("meaning_id", "english_term_id")),
+    "meaning_spanish": (("meaning_id", "spanish_term_id"), (), ("meaning_id", "spanish_term_id")),
+}
+
+# Rows InnoDB removes through ON DELETE CASCADE: parent -> [(child, column)].
+CASCADES = {
+    "meaning": [("example", "meaning_id"), ("meaning_english", "meaning_id"),
+                ("meaning_spanish", "meaning_id")],
+    "english_term": [("meaning_english", "english_term_id")],
+    "spanish_term": [("meaning_spanish", "spanish_term_id")],
+}
+
+FOREIGN_KEYS = [
+    ("example", "fk_example_meaning", "meaning_id", "meaning"),
+    ("meaning_english", "fk_me_m", "meaning_id", "meaning"),
+    ("meaning_english", "fk_me_et", "english_term_id", "english_term"),
+    ("meaning_spanish", "fk_ms_m", "meaning_id", "meaning"),
+    ("meaning_spanish", "fk_ms_st", "spanish_term_id", "spanish_term"),
+]
+
+
+@contextmanager
+def _transaction(repo: MysqlRepository) -> Iterator:
+    """A cursor on one pooled connection, committed if the block succeeds."""
+    with repo.pool.connection() as cn:
+        cur = cn.cursor()
+        try:
+            yield cur
+            cn.commit()
+        finally:
+            cur.close()
+
+
+def _columns(table: str) -> List[str]:
+    ids, others, _ = TABLES[table]
+    return list(ids) + list(others)
+
+
+def _converted(table: str, row: str) -> str:
+    ids = TABLES[table][0]
+    return ", ".join(
+        f"UUID_TO_BIN({row}.{c})" if c in ids else f"{row}.{c}" for c in _columns(table)
+    )
+
+
+def _delete_shadow(table: str, row: str) -> str:
+    pk = TABLES[table][2]
+    where = " AND ".join(f"{c} = UUID_TO_BIN({row}.{c})" for c in pk)
+    return f"DELETE FROM _bin_{table} WHERE {where};"
+
+
+def shadow_ddl(table: str) -> List[str]:
+    ids = TABLES[table][0]
+    return [
+        f"DROP TABLE IF EXISTS _bin_{table}",
+        f"CREATE TABLE _bin_{table} LIKE {table}",
+        f"ALTER TABLE _bin_{table} "
+        + ", ".join(f"MODIFY {c} BINARY(16) NOT NULL" for c in ids),
+    ]
+
+
+def trigger_ddl(table: str) -> List[str]:
+    cols = ", ".join(_columns(table))
+    upsert = f"REPLACE INTO _bin_{table} ({cols}) VALUES ({_converted(table, 'NEW')});"
+    cascades = "".join(
+        f" DELETE FROM _bin_{child} WHERE {column} = UUID_TO_BIN(OLD.id);"
+        for child, column in CASCADES.get(table, ())
+    )
+    return [
+        f"DROP TRIGGER IF EXISTS _bin_{table}_ins",
+        f"DROP TRIGGER IF EXISTS _bin_{table}_upd",
+        f"DROP TRIGGER IF EXISTS _bin_{table}_del",
+        f"CREATE TRIGGER _bin_{table}_ins AFTER INSERT ON {table} FOR EACH ROW {upsert}",
+        f"CREATE TRIGGER _bin_{table}_upd AFTER UPDATE ON {table} FOR EACH ROW "
+        f"BEGIN {_delete_shadow(table, 'OLD')} {upsert} END",
+        f"CREATE TRIGGER _bin_{table}_del AFTER DELETE ON {table} FOR EACH ROW "
+        f"BEGIN{cascades} {_delete_shadow(table, 'OLD')} END",
+    ]
+
+
+def copy_table(repo: MysqlRepository, table: str, batch_size: int, pause: float) -> int:
+    """Backfill ``_bin_<table>`` in primary-key order, one short transaction per batch.
+
+    ``INSERT IGNORE`` leaves rows the triggers already wrote untouched, and
+    ``INSERT ... SELECT`` locks each source batch, so a concurrent update
+    either lands before the copy or is mirrored after it.
+    """
+    pk = TABLES[table][2]
+    key = ", ".join(pk)
+    row_key = f"({key})"
+    cols = ", ".join(_columns(table))
+    copied, last = 0, None
+    while True:
+        with _transaction(repo) as cur:
+            where = f"WHERE {row_key} > ({', '.join(['%s'] * len(pk))})" if last else ""
+            cur.execute(
+                f"SELECT {key} FROM {table} {where} ORDER BY {key} LIMIT %s",
+                tuple(last or ()) + (batch_size,),
+            )
+            keys = cur.fetchall()
+            if not keys:
+                return copied
+            bounds = ", ".join(["%s"] * len(pk))
+            cur.execute(
+                f"INSERT IGNORE INTO _bin_{table} ({cols}) "
+                f"SELECT {_converted(table, table)} FROM {table} "
+                f"WHERE {row_key} >= ({bounds}) AND {row_key} <= ({bounds})",
+                tuple(keys[0]) + tuple(keys[-1]),
+            )
+        copied += len(keys)
+        last = keys[-1]
+        if len(keys) < batch_size:
+            return copied
+        time.sleep(pause)
+
+
+def run_copy(repo: MysqlRepository, batch_size: int, pause: float) -> None:
+    with _transaction(repo) as cur:
+        cur.execute(
+            "SELECT DATA_TYPE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'english_term' AND COLUMN_NAME = 'id'"
+        )
+        (data_type,) = cur.fetchone()
+        if data_type.lower() == "binary":
+            raise SystemExit("english_term.id is already BINARY(16); nothing to do")
+        for table in TABLES:
+            for stmt in shadow_ddl(table) + trigger_ddl(table):
+                cur.execute(stmt)
+    for table in TABLES:
+        started = time.perf_counter()
+        n = copy_table(repo, table, batch_size, pause)
+        print(f"copied {n} rows of {table} in {time.perf_counter() - started:.1f}s")
+
+
+def run_cutover(repo: MysqlRepository) -> None:
+    with _transaction(repo) as cur:
+        cur.execute(
+            "RENAME TABLE "
+            + ", ".join(f"{t} TO _old_{t}, _bin_{t} TO {t}" for t in TABLES)
+        )
+        for table in TABLES:
+            for suffix in ("ins", "upd", "del"):
+                cur.execute(f"DROP TRIGGER IF EXISTS _bin_{table}_{suffix}")
+        # Constraint names are unique per schema: free them on the old tables.
+        for table, name, _, _ in FOREIGN_KEYS:
+            cur.execute(f"ALTER TABLE _old_{table} DROP FOREIGN KEY {name}")
+        # The rows were validated by the old constraints; skip re-checking them.
+        # The setting is per session, and this connection goes back to the pool.
+        cur.execute("SET foreign_key_checks = 0")
+        try:
+            for table, name, column, parent in FOREIGN_KEYS:
+                cur.execute(
+                    f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+                    f"REFERENCES {parent}(id) ON DELETE CASCADE"
+                )
+        finally:
+            cur.execute("SET foreign_key_checks = 1")
+    print("cut over to BINARY(16) ids; restart every process with MYSQL_BINARY_IDS=1")
+
+
+def run_cleanup(repo: MysqlRepository) -> None:
+    with _transaction(repo) as cur:
+        cur.execute("DROP TABLE IF EXISTS " + ", ".join(f"_old_{t}" for t in TABLES))
+    print("dropped the CHAR(36) tables")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert CHAR(36) ids to BINARY(16) online, in batches."
+    )
+    parser.add_argument("phase", choices=["copy", "cutover", "cleanup", "all"])
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per copy transaction")
+    parser.add_argument("--pause", type=float, default=0.05, help="seconds between batches")
+    args = parser.parse_args(argv)
+
+    repo = MysqlRepository(binary_ids=False)
+    if args.phase in ("copy", "all"):
+        run_copy(repo, args.batch_size, args.pause)
+    if args.phase in ("cutover", "all"):
+        run_cutover(repo)
+    if args.phase in ("cleanup", "all"):
+        run_cleanup(repo)
+
+
+if __name__ == "__main__":
+    main()
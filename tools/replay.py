@@ -0,0 +1,308 @@
+"""Replay recorded API traffic, or synthesize it, and report per-endpoint load.
+
+    # record: run the server with TRAFFIC_LOG=traffic.jsonl
+    python -m tools.replay traffic.jsonl --url http://127.0.0.1:8000 --concurrency 16
+    python -m tools.replay traffic.jsonl --speedup 4
+    python -m tools.replay --synthetic 20000 --scale 10000 --rate 2000
+
+Without ``--url`` the requests go to an in-process ``create_app()`` through
+Flask's test client. One client is created per worker thread. The app
+uses ``--backend``, which is first filled with ``--scale`` entries from
+``benchmarks.generator``. Synthetic traffic always loads them. A log
+replay loads them only when ``--scale`` is given.
+
+Scheduling:
+
+- **Closed loop** (default): ``--concurrency`` workers each send the next
+  request as soon as their previous one completes.
+- **Open loop** ``--rate R``: requests start R per second whether or not
+  earlier ones have finished.
+- **Open loop** ``--speedup F``: requests keep the spacing of the recorded
+  ``ts`` values, divided by F.
+
+Open-loop latency is measured from each request's scheduled start. A
+saturated server therefore shows its queueing delay instead of slowing
+the load down.
+
+``--synthetic N`` generates N requests when no log is available. Lemmas
+are drawn from a Zipf-distributed hot set over the generated dictionary.
+The mix is mostly lookups, with batch lookups, suggestions, searches,
+misses and adds. Against ``--url`` the server must already hold that
+dictionary, e.g. loaded from the same generator and seed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from benchmarks.stats import percentile
+from benchmarks.generator import DictionaryGenerator
+from db.instrumentation import Histogram
+
+SYNTHETIC_MIX = (
+    ("lookup", 70), ("batch", 5), ("suggest", 10), ("search", 5), ("miss", 5), ("add", 5),
+)
+
+
+def read_log(path: str) -> Iterator[Dict[str, Any]]:
+    """Requests from a ``TrafficRecorder`` log, ``at`` relative to the first."""
+    first = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            ts = record.get("ts")
+            if ts is not None and first is None:
+                first = ts
+            yield {
+                "method": record.get("method", "GET"),
+                "path": record["path"],
+                "query": record.get("query", ""),
+                "body": record.get("body"),
+                "at": ts - first if ts is not None else None,
+            }
+
+
+def synthesize(n: int, gen: DictionaryGenerator, seed: int = 7) -> Iterator[Dict[str, Any]]:
+    """``n`` requests over ``gen``'s dictionary with a Zipf hot set."""
+    rng = random.Random(seed)
+    hot = gen.sampler(seed)
+    kinds = [kind for kind, _ in SYNTHETIC_MIX]
+    weights = [weight for _, weight in SYNTHETIC_MIX]
+    added = 0
+    for _ in range(n):
+        kind = rng.choices(kinds, weights)[0]
+        lemma = gen.lemma(hot())
+        if kind == "lookup":
+            yield _get("/api/v1/lookup", english=lemma)
+        elif kind == "batch":
+            lemmas = [gen.lemma(hot()) for _ in range(rng.randint(2, 20))]
+            yield {"method": "POST", "path": "/api/v1/lookup/batch", "query": "",
+                   "body": {"english": lemmas}, "at": None}
+        elif kind == "suggest":
+            yield _get("/api/v1/suggest", prefix=lemma[:rng.randint(2, 5)])
+        elif kind == "search":
+            yield _get("/api/v1/search", q=lemma.split()[0])
+        elif kind == "miss":
+            yield _get("/api/v1/lookup", english=f"{lemma}x{rng.randint(0, 999)}")
+        else:
+            # New entries past the preloaded ones, so adds do real writes.
+            yield {"method": "POST", "path": "/api/v1/add", "query": "",
+                   "body": gen.payload(gen.n_terms + added), "at": None}
+            added += 1
+
+
+def _get(path: str, **params: str) -> Dict[str, Any]:
+    query = urllib.parse.urlencode(params)
+    return {"method": "GET", "path": path, "query": query, "body": None, "at": None}
+
+
+class HttpTarget:
+    def __init__(self, url: str, headers: Dict[str, str], timeout: float = 30.0) -> None:
+        self.url = url.rstrip("/")
+        self.headers = headers
+        self.timeout = timeout
+
+    def send(self, req: Dict[str, Any]) -> int:
+        url = self.url + req["path"] + (f"?{req['query']}" if req["query"] else "")
+        data, headers = None, dict(self.headers)
+        if req["body"] is not None:
+            data = json.dumps(req["body"]).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        request = urllib.request.Request(url, data=data, method=req["method"], headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+                resp.read()
+                return resp.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+
+class InProcessTarget:
+    def __init__(self, app, headers: Dict[str, str]) -> None:
+        self.app = app
+        self.headers = headers
+        self._local = threading.local()
+
+    def send(self, req: Dict[str, Any]) -> int:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        resp = client.open(
+            req["path"], method=req["method"], query_string=req["query"],
+            json=req["body"], headers=self.headers,
+        )
+        return resp.status_code
+
+
+class Report:
+    """Latency, status and error counts per ``METHOD path``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+        self.seconds = 0.0
+
+    def add(self, req: Dict[str, Any], status: Optional[int], seconds: float) -> None:
+        key = f"{req['method']} {req['path']}"
+        with self._lock:
+            ep = self.endpoints.get(key)
+            if ep is None:
+                ep = self.endpoints[key] = {
+                    "samples": [], "histogram": Histogram(), "statuses": {}, "errors": 0,
+                }
+            ep["samples"].append(seconds * 1000)
+            ep["histogram"].observe(seconds)
+            label = str(status) if status is not None else "exception"
+            ep["statuses"][label] = ep["statuses"].get(label, 0) + 1
+            if status is None or status >= 500:
+                ep["errors"] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        for key, ep in sorted(self.endpoints.items()):
+            samples, count = ep["samples"], len(ep["samples"])
+            buckets, _, _ = ep["histogram"].snapshot()
+            out[key] = {
+                "count": count,
+                "throughput": round(count / self.seconds, 1) if self.seconds else None,
+                "error_rate": round(ep["errors"] / count, 4),
+                "statuses": dict(sorted(ep["statuses"].items())),
+                "p50_ms": round(percentile(samples, 50), 3),
+                "p95_ms": round(percentile(samples, 95), 3),
+                "p99_ms": round(percentile(samples, 99), 3),
+                "max_ms": round(max(samples), 3),
+                "histogram": {("+Inf" if b == float("inf") else str(b)): n for b, n in buckets},
+            }
+        return out
+
+
+def _timed_send(target, req: Dict[str, Any], report: Report, scheduled: float) -> None:
+    try:
+        status = target.send(req)
+    except Exception:
+        status = None
+    report.add(req, status, time.perf_counter() - scheduled)
+
+
+def replay(
+    requests: Iterable[Dict[str, Any]],
+    target,
+    concurrency: int = 8,
+    rate: Optional[float] = None,
+    speedup: Optional[float] = None,
+) -> Report:
+    """Send ``requests`` to ``target`` closed-loop, or open-loop when
+    ``rate`` or ``speedup`` is given."""
+    report = Report()
+    started = time.perf_counter()
+    if rate or speedup:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for i, req in enumerate(requests):
+                if rate:
+                    offset = i / rate
+                else:
+                    offset = (req["at"] or 0.0) / speedup
+                scheduled = started + offset
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(_timed_send, target, req, report, scheduled)
+    else:
+        source = iter(requests)
+        lock = threading.Lock()
+
+        def worker() -> None:
+            while True:
+                with lock:
+                    req = next(source, None)
+                if req is None:
+                    return
+                _timed_send(target, req, report, time.perf_counter())
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _in_process_app(args, gen: Optional[DictionaryGenerator]):
+    from api.app import create_app
+    from db.factory import create_repository
+    from services.service import DictionaryService
+
+    options = {"path": args.sqlite_path} if args.backend == "sqlite" and args.sqlite_path else {}
+    repo = create_repository(args.backend, **options)
+    if gen is not None:
+        service = DictionaryService(repo)
+        for start in range(0, gen.n_terms, 1000):
+            service.add_entries(gen.entries(start, min(start + 1000, gen.n_terms)))
+    return create_app({"REPOSITORY": repo, "ADMIN_TOKEN": args.admin_token})
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay or synthesize API traffic and report latency.")
+    parser.add_argument("log", nargs="?", help="JSONL traffic log written with TRAFFIC_LOG")
+    parser.add_argument("--synthetic", type=int, help="generate this many requests instead of a log")
+    parser.add_argument("--url", help="base URL of a running server (default: in-process app)")
+    parser.add_argument("--backend", default="memory", help="repository for the in-process app")
+    parser.add_argument("--sqlite-path", help="database file when --backend sqlite")
+    parser.add_argument("--scale", type=int, help="generated dictionary size (default 10000 for --synthetic)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, help="open loop: requests per second")
+    parser.add_argument("--speedup", type=float, help="open loop: replay log timing this much faster")
+    parser.add_argument("--admin-token", help="sent as a bearer token (needed for admin routes)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="write the JSON report here")
+    args = parser.parse_args(argv)
+    if bool(args.log) == bool(args.synthetic):
+        parser.error("pass either a traffic log or --synthetic N")
+    if args.rate and args.speedup:
+        parser.error("--rate and --speedup are mutually exclusive")
+
+    scale = args.scale or (10_000 if args.synthetic else 0)
+    gen = DictionaryGenerator(scale, seed=args.seed) if scale else None
+    if args.synthetic:
+        requests = synthesize(args.synthetic, gen, args.seed)
+    else:
+        requests = read_log(args.log)
+
+    headers = {"Authorization": f"Bearer {args.admin_token}"} if args.admin_token else {}
+    if args.url:
+        target = HttpTarget(args.url, headers)
+    else:
+        target = InProcessTarget(_in_process_app(args, gen), headers)
+
+    report = replay(requests, target, args.concurrency, args.rate, args.speedup)
+    summary = report.summary()
+    total = sum(ep["count"] for ep in summary.values())
+    for key, ep in summary.items():
+        print(
+            f"{key:<32} {ep['count']:>8} req {ep['throughput'] or 0:>9,.1f}/s "
+            f"err={ep['error_rate']:6.2%} p50={ep['p50_ms']:8.3f}ms "
+            f"p95={ep['p95_ms']:8.3f}ms p99={ep['p99_ms']:8.3f}ms max={ep['max_ms']:8.3f}ms"
+        )
+    print(f"{total} requests in {report.seconds:.2f}s ({total / report.seconds:,.1f}/s)")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"seconds": round(report.seconds, 4), "endpoints": summary}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())